@@ -0,0 +1,60 @@
+''' Benchmark the hands/sec of the batch new limit holdem engine against the single game
+'''
+import time
+import argparse
+
+import numpy as np
+
+from rlcard.games.newlimitholdem import Game, BatchGame
+
+
+def play_single(args):
+    game = Game()
+    game.np_random = np.random.RandomState(args.seed)
+    start = time.perf_counter()
+    for _ in range(args.num_hands):
+        game.init_game()
+        while not game.is_over():
+            game.step(game.np_random.choice(game.get_legal_actions()))
+        game.get_payoffs()
+    return args.num_hands, time.perf_counter() - start
+
+
+def play_batch(args):
+    game = BatchGame(args.batch_size)
+    game.np_random = np.random.RandomState(args.seed)
+    num_hands = 0
+    start = time.perf_counter()
+    while num_hands < args.num_hands:
+        game.init_game()
+        while not game.is_over().all():
+            legal = game.get_legal_actions()
+            game.step((game.np_random.rand(*legal.shape) * legal).argmax(axis=1))
+        game.get_payoffs()
+        num_hands += args.batch_size
+    return num_hands, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Batch game benchmark in RLCard")
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_hands',
+        type=int,
+        default=100000,
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=4096,
+    )
+
+    args = parser.parse_args()
+
+    for name, play in [('single', play_single), ('batch', play_batch)]:
+        num_hands, elapsed = play(args)
+        print('{:>6}: {} hands in {:.2f}s, {:.0f} hands/sec'.format(name, num_hands, elapsed, num_hands / elapsed))
@@ -0,0 +1,65 @@
+''' Benchmark DQN evaluation hands/sec in limit holdem: one state at a time vs the batch environment
+'''
+import time
+import argparse
+
+import numpy as np
+
+import rlcard
+from rlcard.agents import MYDQNAgentV3
+from rlcard.envs.batch_limitholdem import BatchLimitholdemEnv
+from rlcard.games.limitholdem.evaluator import build_tables
+
+
+def play_single(agent, args):
+    env = rlcard.make('limit-holdem', config={'seed': args.seed})
+    start = time.perf_counter()
+    for _ in range(args.num_hands):
+        state, _ = env.reset()
+        while not env.is_over():
+            action, _ = agent.eval_step(state)
+            state, _ = env.step2(action, list(state['legal_actions'].keys()))
+        env.get_payoffs()
+    return args.num_hands, time.perf_counter() - start
+
+
+def play_batch(agent, args):
+    env = BatchLimitholdemEnv(args.batch_size, seed=args.seed)
+    num_hands = 0
+    start = time.perf_counter()
+    while num_hands < args.num_hands:
+        state, _ = env.reset()
+        while not env.is_over().all():
+            state, _ = env.step(agent.eval_step_batch(state))
+        env.get_payoffs()
+        num_hands += args.batch_size
+    return num_hands, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Batch limit holdem benchmark in RLCard")
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_hands',
+        type=int,
+        default=2000,
+    )
+    parser.add_argument(
+        '--batch_size',
+        type=int,
+        default=1024,
+    )
+
+    args = parser.parse_args()
+
+    # Keep the one-off showdown table build out of the timings
+    build_tables()
+    np.random.seed(args.seed)
+    agent = MYDQNAgentV3(env=rlcard.make('limit-holdem'))
+    for name, play in [('single', play_single), ('batch', play_batch)]:
+        num_hands, elapsed = play(agent, args)
+        print('{:>6}: {} hands in {:.2f}s, {:.0f} hands/sec'.format(name, num_hands, elapsed, num_hands / elapsed))
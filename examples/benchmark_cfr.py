@@ -0,0 +1,77 @@
+''' Benchmark chance sampling CFRAgent against the full-tree VectorizedCFRAgent
+'''
+import time
+import argparse
+
+import numpy as np
+
+import rlcard
+from rlcard.agents import CFRAgent, VectorizedCFRAgent
+
+
+def run(agent, num_iterations):
+    start = time.perf_counter()
+    for _ in range(num_iterations):
+        agent.train()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("CFR benchmark in RLCard")
+    parser.add_argument(
+        '--env',
+        type=str,
+        default='leduc-holdem',
+        choices=['leduc-holdem', 'new-limit-holdem'],
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_iterations',
+        type=int,
+        default=100,
+    )
+    parser.add_argument(
+        '--variant',
+        type=str,
+        default='cfr+',
+        choices=['cfr', 'cfr+', 'linear'],
+    )
+    parser.add_argument(
+        '--num_workers',
+        type=int,
+        default=4,
+    )
+
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    env = rlcard.make(args.env, config={'seed': args.seed, 'allow_step_back': True})
+
+    vectorized = VectorizedCFRAgent(env, variant=args.variant)
+    start = time.perf_counter()
+    vectorized.build_tree()
+    print('Tree built in {:.2f}s with {} infosets'.format(time.perf_counter() - start, len(vectorized.table)))
+    deals = vectorized.num_cards * (vectorized.num_cards - 1) * vectorized.boards_per_deal * len(vectorized.roots)
+
+    # CFRAgent samples one deal per iteration, the vectorized agent sweeps all of them
+    elapsed = run(CFRAgent(env), args.num_iterations)
+    print('{:>10}: {:.1f} iterations/sec, {:.1f} deals/sec'.format(
+        'CFRAgent', args.num_iterations / elapsed, args.num_iterations / elapsed))
+    # train_parallel plays num_workers deals per worker and iteration
+    agent = CFRAgent(env)
+    num_deals = 4 * args.num_workers
+    start = time.perf_counter()
+    for _ in range(args.num_iterations // num_deals + 1):
+        agent.train_parallel(num_deals, num_workers=args.num_workers)
+    elapsed = time.perf_counter() - start
+    agent.close_workers()
+    print('{:>10}: {:.1f} deals/sec with {} workers'.format(
+        'parallel', (args.num_iterations // num_deals + 1) * num_deals / elapsed, args.num_workers))
+    elapsed = run(vectorized, args.num_iterations)
+    print('{:>10}: {:.1f} iterations/sec, {:.0f} deals/sec, exploitability {:.4f}'.format(
+        args.variant, args.num_iterations / elapsed, args.num_iterations * deals / elapsed,
+        vectorized.get_exploitability()))
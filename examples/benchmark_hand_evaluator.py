@@ -0,0 +1,74 @@
+''' Benchmark the showdown evaluation of limit hold'em hands
+'''
+import time
+import argparse
+
+import numpy as np
+
+from rlcard.games.limitholdem import evaluator
+from rlcard.games.limitholdem.utils import Hand, compare_hands
+from rlcard.games.limitholdem.cards import CARD_STRINGS
+
+
+def deal_hands(args):
+    ''' Deal num_hands showdowns of num_players hands sharing five public cards
+    '''
+    np_random = np.random.RandomState(args.seed)
+    showdowns = []
+    for _ in range(args.num_hands):
+        cards = [int(card) for card in np_random.permutation(52)[:5 + 2 * args.num_players]]
+        showdowns.append([cards[5 + 2 * i:7 + 2 * i] + cards[:5] for i in range(args.num_players)])
+    return showdowns
+
+
+def timed(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return time.perf_counter() - start
+
+
+def evaluate_with_hand(cards):
+    hand = Hand(cards)
+    hand.evaluateHand()
+    return hand.category
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Hand evaluator benchmark in RLCard")
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_hands',
+        type=int,
+        default=20000,
+    )
+    parser.add_argument(
+        '--num_players',
+        type=int,
+        default=2,
+    )
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    evaluator.build_tables()
+    print('Built the lookup tables in {:.2f}s'.format(time.perf_counter() - start))
+
+    showdowns = deal_hands(args)
+    card_ids = [hand for showdown in showdowns for hand in showdown]
+    card_strings = [[CARD_STRINGS[card] for card in hand] for hand in card_ids]
+    showdown_strings = [[[CARD_STRINGS[card] for card in hand] for hand in showdown] for showdown in showdowns]
+
+    results = [
+        ('Hand.evaluateHand', timed(evaluate_with_hand, card_strings), len(card_ids)),
+        ('evaluator.evaluate_hand', timed(evaluator.evaluate_hand, card_ids), len(card_ids)),
+        ('compare_hands (hand)', timed(compare_hands, showdown_strings), len(showdowns)),
+        ('compare_hands (table, str)', timed(lambda hands: compare_hands(hands, 'table'), showdown_strings), len(showdowns)),
+        ('compare_hands (table, int)', timed(lambda hands: compare_hands(hands, 'table'), showdowns), len(showdowns)),
+    ]
+    for name, elapsed, count in results:
+        print('{:>28}: {:.0f} evaluations/sec'.format(name, count / elapsed))
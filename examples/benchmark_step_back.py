@@ -0,0 +1,77 @@
+''' Benchmark the step/step_back throughput of hold'em game tree traversal
+'''
+import time
+import argparse
+
+import numpy as np
+
+from rlcard.games.limitholdem import Game as LimitHoldemGame
+from rlcard.games.newlimitholdem import Game as NewLimitHoldemGame
+from rlcard.games.nolimitholdem import Game as NolimitHoldemGame
+
+GAMES = {
+    'new-limit-holdem': NewLimitHoldemGame,
+    'limit-holdem': LimitHoldemGame,
+    'no-limit-holdem': NolimitHoldemGame,
+}
+
+
+def traverse(game, depth):
+    ''' Visit every node below the current state up to depth steps and return the number of nodes
+    '''
+    game.get_state(game.get_player_id())
+    if game.is_over():
+        game.get_payoffs()
+        return 1
+    if depth == 0:
+        return 1
+    nodes = 1
+    for action in game.get_legal_actions():
+        game.step(action)
+        nodes += traverse(game, depth - 1)
+        game.step_back()
+    return nodes
+
+
+def benchmark(mode, args):
+    game = GAMES[args.env](allow_step_back=True)
+    game.step_back_mode = mode
+    game.np_random = np.random.RandomState(args.seed)
+    nodes = 0
+    start = time.perf_counter()
+    for _ in range(args.num_games):
+        game.init_game()
+        nodes += traverse(game, args.max_depth)
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("step_back benchmark in RLCard")
+    parser.add_argument(
+        '--env',
+        type=str,
+        default='new-limit-holdem',
+        choices=list(GAMES),
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_games',
+        type=int,
+        default=500,
+    )
+    parser.add_argument(
+        '--max_depth',
+        type=int,
+        default=8,
+    )
+
+    args = parser.parse_args()
+
+    for mode in ['snapshot', 'undo']:
+        nodes, elapsed = benchmark(mode, args)
+        print('{:>8}: {} nodes in {:.2f}s, {:.0f} nodes/sec'.format(mode, nodes, elapsed, nodes / elapsed))
@@ -0,0 +1,66 @@
+''' Benchmark the random play steps/sec of one environment against VecEnv workers
+'''
+import time
+import argparse
+
+import numpy as np
+
+import rlcard
+from rlcard.envs.vec import VecEnv
+
+
+def play_single(args):
+    env = rlcard.make(args.env, config={'seed': args.seed})
+    np_random = np.random.RandomState(args.seed)
+    state, _ = env.reset()
+    start = time.perf_counter()
+    for _ in range(args.num_steps):
+        legal_actions = list(state['legal_actions'].keys())
+        state, _ = env.step2(np_random.choice(legal_actions), legal_actions)
+        if env.is_over():
+            env.get_payoffs()
+            state, _ = env.reset()
+    return args.num_steps, time.perf_counter() - start
+
+
+def play_vec(args):
+    np_random = np.random.RandomState(args.seed)
+    with VecEnv(args.env, args.num_envs, config={'seed': args.seed}) as env:
+        states, _ = env.reset()
+        num_steps = 0
+        start = time.perf_counter()
+        while num_steps < args.num_steps:
+            legal = states['legal_actions']
+            states, _, _, _ = env.step((np_random.rand(*legal.shape) * legal).argmax(axis=1))
+            num_steps += args.num_envs
+        return num_steps, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("VecEnv benchmark in RLCard")
+    parser.add_argument(
+        '--env',
+        type=str,
+        default='limit-holdem',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+    )
+    parser.add_argument(
+        '--num_steps',
+        type=int,
+        default=20000,
+    )
+    parser.add_argument(
+        '--num_envs',
+        type=int,
+        default=8,
+    )
+
+    args = parser.parse_args()
+
+    for name, play in [('single', play_single), ('vec', play_vec)]:
+        num_steps, elapsed = play(args)
+        print('{:>6}: {} steps in {:.2f}s, {:.0f} steps/sec'.format(name, num_steps, elapsed, num_steps / elapsed))
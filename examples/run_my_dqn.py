@@ -14,6 +14,7 @@ from rlcard.agents import (
 from rlcard.utils import (
     set_seed,
     tournament,
+    parallel_tournament,
     Logger,
     plot_curve,
     plot_curve2,
@@ -93,10 +94,18 @@ def train(args):
             agent.train()
 
             if episode % args.evaluate_every == 0:
-                reward, winrate = tournament(
-                    eval_env,
-                    args.num_eval_games
-                )
+                if args.num_eval_workers > 1:
+                    reward, winrate, _ = parallel_tournament(
+                        eval_env,
+                        args.num_eval_games,
+                        num_workers=args.num_eval_workers,
+                        seed=args.seed + episode,
+                    )
+                else:
+                    reward, winrate = tournament(
+                        eval_env,
+                        args.num_eval_games
+                    )
 
 
                 loss, epsilon = agent.get_avg_loss()
@@ -143,6 +152,11 @@ if __name__ == '__main__':
         type=int,
         default=3000,
     )
+    parser.add_argument(
+        '--num_eval_workers',
+        type=int,
+        default=1,
+    )
     parser.add_argument(
         '--evaluate_every',
         type=int,
@@ -42,6 +42,7 @@ def train(args):
             args.log_dir,
             'pi_model',
         ),
+        num_workers=args.num_workers,
     )
 
 
@@ -99,6 +100,12 @@ if __name__ == '__main__':
         type=int,
         default=20,
     )
+    parser.add_argument(
+        '--num_workers',
+        type=int,
+        default=0,
+        help='Processes the policy evaluation sweeps are spread over, 0 to run them in this process',
+    )
 
     args = parser.parse_args()
     train(args)
@@ -74,7 +74,7 @@ def train(args):
             agent.learn_env()
             
             # now begin training
-        agent.value_iteration_algo()
+        agent.value_iteration_algo(args.vi_method)
         for episode in range(args.num_eval_games):
             if episode % args.evaluate_every == 0:
                 logger.log_performance(
@@ -118,6 +118,12 @@ if __name__ == '__main__':
         type=str,
         default='experiments/new_limit_holdem_vi_result/',
     )
+    parser.add_argument(
+        '--vi_method',
+        type=str,
+        default='jacobi',
+        choices=['jacobi', 'gauss-seidel', 'prioritized'],
+    )
  
     args = parser.parse_args()
 
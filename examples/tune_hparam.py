@@ -57,18 +57,22 @@ def train(args, alpha, gamma):
     ])
 
     with Logger(args.log_dir) as logger:
-        for episode in range(args.num_episodes):
-            agent.train()
+        # Train in batches between the evaluations, after episode 0 and then every
+        # evaluate_every episodes, in a worker pool if num_workers > 0
+        trained = 0
+        for episode in range(0, args.num_episodes, args.evaluate_every):
+            agent.train_batch(episode + 1 - trained, num_workers=args.num_workers, merge_every=args.merge_every)
+            trained = episode + 1
             print('\rIteration {}'.format(episode), end='')
-            if episode % args.evaluate_every == 0:
-                agent.save()
-                logger.log_performance(
-                    episode,
-                    tournament(
-                        eval_env,
-                        args.num_eval_games
-                    )[0]
-                )
+            agent.save()
+            logger.log_performance(
+                episode,
+                tournament(
+                    eval_env,
+                    args.num_eval_games
+                )[0]
+            )
+        agent.train_batch(args.num_episodes - trained, num_workers=args.num_workers, merge_every=args.merge_every)
 
         csv_path, fig_path = logger.csv_path, logger.fig_path
 
@@ -90,6 +94,8 @@ if __name__ == '__main__':
     parser.add_argument('--num_episodes', type=int, default=2800)
     parser.add_argument('--num_eval_games', type=int, default=2000)
     parser.add_argument('--evaluate_every', type=int, default=400)
+    parser.add_argument('--num_workers', type=int, default=0)
+    parser.add_argument('--merge_every', type=int, default=100)
     parser.add_argument('--log_dir', type=str, default='experiments/new_limit_holdem_ql_result/')
 
     args = parser.parse_args()
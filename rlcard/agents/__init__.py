@@ -10,6 +10,7 @@ if 'torch' in installed_packages:
     from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
 
 from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.vectorized_cfr_agent import VectorizedCFRAgent
 from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
 from rlcard.agents.human_agents.nolimit_holdem_human_agent import HumanAgent as NolimitholdemHumanAgent
 from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as LeducholdemHumanAgent
@@ -22,6 +23,7 @@ from rlcard.agents.threshold_agent3 import ThresholdAgent3
 from rlcard.agents.sarsa_agent import SARSAAgent
 from rlcard.agents.ql_agent import QLAgent
 from rlcard.agents.pi_agent import PIAgent
+from rlcard.agents.policy_eval_agent import PolicyEvalAgent
 from rlcard.agents.double_dqn_agent import DoubleDQNAgent
 from rlcard.agents.bluff_agent import BluffAgent
 from rlcard.agents.dueling_double_dqn_agent import DDDQNAgent
@@ -5,34 +5,92 @@ import os
 import pickle
 
 from rlcard.utils.utils import *
+from rlcard.utils.infoset_table import InfosetTable
+from rlcard.utils.policy_file import save_policy
+
+SAMPLINGS = ('chance', 'external', 'outcome')
+
+def state_key(state):
+    ''' The state_str of a state, the bytes of its obs or of the card and action tensors of limit-holdem
+    '''
+    if 'obs' in state:
+        return state['obs'].tostring()
+    return state['card_tensor'].tostring() + state['action_tensor'].tostring()
 
 class CFRAgent():
-    ''' Implement CFR (chance sampling) algorithm
+    ''' Implement CFR (chance sampling) algorithm, and external and outcome sampling MCCFR
     '''
 
-    def __init__(self, env, model_path='./cfr_model'):
+    def __init__(self, env, model_path='./cfr_model', sampling='chance', epsilon=0.6):
         ''' Initilize Agent
 
         Args:
             env (Env): Env class
+            model_path (str): The directory of the saved model
+            sampling (str): 'chance' to walk all the actions of a sampled deal, 'external' to
+                also sample the actions of the other players, 'outcome' to sample a single
+                play of the game
+            epsilon (float): The exploration of the updated player with outcome sampling
         '''
+        if sampling not in SAMPLINGS:
+            raise ValueError('Unknown CFR sampling: {}'.format(sampling))
         self.use_raw = False
         self.env = env
         self.model_path = model_path
+        self.sampling = sampling
+        self.epsilon = epsilon
 
-        # A policy is a dict state_str -> action probabilities
-        self.policy = collections.defaultdict(list)
-        self.average_policy = collections.defaultdict(np.array)
+        # Regret and average policy deltas kept aside instead of applied, see collect_deltas
+        self.pending = None
 
-        # Regret is a dict state_str -> action regrets
-        self.regrets = collections.defaultdict(np.array)
+        # The processes of train_parallel and the iteration their tables are in step with
+        self.workers = []
+        self.synced_iteration = None
+
+        # The regrets, current policy and average policy of every infoset are rows of
+        # dense arrays indexed by the infoset id of the state_str
+        self.table = self.new_table()
 
         self.iteration = 0
 
+    def new_table(self, capacity=1024):
+        ''' Make an empty infoset table with the fields of CFR
+        '''
+        return InfosetTable(self.env.num_actions, self.table_fields(), capacity)
+
+    def table_fields(self):
+        return {
+            'regrets': 0.0,
+            'average_policy': 0.0,
+            'policy': 1.0 / self.env.num_actions,
+        }
+
+    @property
+    def policy(self):
+        ''' The current policy as a dict state_str -> action probabilities
+        '''
+        return self.table.as_dict('policy')
+
+    @property
+    def average_policy(self):
+        ''' The unnormalized average policy as a dict state_str -> action weights
+        '''
+        return self.table.as_dict('average_policy')
+
+    @property
+    def regrets(self):
+        ''' The cumulative regrets as a dict state_str -> action regrets
+        '''
+        return self.table.as_dict('regrets')
+
     def train(self):
         ''' Do one iteration of CFR
         '''
         self.iteration += 1
+        if self.sampling != 'chance':
+            self.train_sampled()
+            return
+
         # Firstly, traverse tree to compute counterfactual regret for each player
         # The regrets are recorded in traversal
         for player_id in range(self.env.num_players):
@@ -43,6 +101,250 @@ class CFRAgent():
         # Update policy
         self.update_policy()
 
+    def train_sampled(self):
+        ''' Do one MCCFR traversal per player on a sampled deal
+
+        Only the visited infosets are touched, the current policy of an infoset is
+        computed from its regrets when it is visited.
+        '''
+        for player_id in range(self.env.num_players):
+            self.env.reset()
+            if self.sampling == 'external':
+                self.traverse_external(player_id)
+            else:
+                self.traverse_outcome(player_id, np.ones(self.env.num_players), 1.0)
+
+    def train_parallel(self, num_traversals, num_workers=None, seed=None):
+        ''' Do one iteration made of num_traversals sampled deals split across worker processes
+
+        This is a batched variant of train: every traversal plays the deals of a train
+        iteration with its own seed, but all of them against the table at the start of the
+        iteration, and their regret and average policy deltas are added together at the end.
+        The iteration counts once for all the deals. With chance sampling and a single
+        traversal it is train on the deal of that seed. With external and outcome sampling
+        train lets the traversal of a player see the regrets the traversals of the players
+        before it just added, here they are only seen from the next iteration on.
+
+        The workers return their deltas, the master sums them into the table and sends the
+        sum back so that every worker keeps a copy of the table in step with the master.
+        The workers are started on the first call and kept until close_workers, or
+        restarted if the table was trained in another way in between. Since the seeds only
+        depend on seed, the result does not depend on the number of workers up to the
+        order of the sums.
+
+        Args:
+            num_traversals (int): The number of sampled deals
+            num_workers (int): The number of processes, the number of CPUs if None and
+                the calling process if 0
+            seed (int): The seed the traversal seeds are derived from, random if None
+        '''
+        import multiprocessing as mp
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = min(num_workers, num_traversals)
+        seeds = np.random.SeedSequence(seed).generate_state(num_traversals).tolist()
+
+        self.iteration += 1
+        if num_workers == 0:
+            deltas = self.collect_deltas(seeds)
+        else:
+            self.start_workers(num_workers)
+            shares = np.array_split(np.array(seeds, dtype=np.int64), num_workers)
+            for (_, remote), share in zip(self.workers, shares):
+                remote.send(('run', (self.iteration, share.tolist())))
+            deltas = self.merge_deltas(_receive_all([remote for _, remote in self.workers]))
+            for _, remote in self.workers:
+                remote.send(('apply', deltas))
+        self.apply_deltas(deltas)
+        if self.sampling == 'chance':
+            self.update_policy()
+        self.synced_iteration = self.iteration
+
+    def start_workers(self, num_workers):
+        ''' Fork the worker processes of train_parallel with a copy of the table
+
+        Nothing is done if num_workers workers in step with the table are running.
+        '''
+        import multiprocessing as mp
+        if len(self.workers) == num_workers and self.synced_iteration == self.iteration - 1:
+            return
+        self.close_workers()
+        workers = []
+        for _ in range(num_workers):
+            remote, worker_remote = mp.Pipe()
+            process = mp.Process(target=_cfr_worker, args=(worker_remote, remote, self), daemon=True)
+            process.start()
+            worker_remote.close()
+            workers.append((process, remote))
+        self.workers = workers
+
+    def close_workers(self):
+        ''' Stop the worker processes of train_parallel
+        '''
+        for process, remote in self.workers:
+            try:
+                remote.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass
+            remote.close()
+            process.join()
+        self.workers = []
+
+    def collect_deltas(self, seeds):
+        ''' Run one train iteration per seed at the current iteration without changing the table
+
+        Args:
+            seeds (list): The seed of the deals of each iteration
+
+        Returns:
+            (dict): state_str -> (regret delta, average policy delta) rows
+        '''
+        self.pending = {}
+        # The deals are seeded, the RNGs of the caller and the env are put back afterwards
+        random_state = np.random.get_state()
+        env_random, game_random = self.env.np_random, self.env.game.np_random
+        try:
+            for seed in seeds:
+                np.random.seed(seed)
+                self.env.seed(seed)
+                if self.sampling == 'chance':
+                    for player_id in range(self.env.num_players):
+                        self.env.reset()
+                        self.traverse_tree(np.ones(self.env.num_players), player_id)
+                else:
+                    self.train_sampled()
+            return {self.table.keys[infoset_id]: rows for infoset_id, rows in self.pending.items()}
+        finally:
+            self.pending = None
+            np.random.set_state(random_state)
+            self.env.np_random, self.env.game.np_random = env_random, game_random
+
+    @staticmethod
+    def merge_deltas(results):
+        ''' Sum the deltas returned by several collect_deltas calls
+        '''
+        merged = {}
+        for deltas in results:
+            for obs, (regret_delta, policy_delta) in deltas.items():
+                if obs not in merged:
+                    merged[obs] = (regret_delta.copy(), policy_delta.copy())
+                    continue
+                rows = merged[obs]
+                rows[0][:] += regret_delta
+                rows[1][:] += policy_delta
+        return merged
+
+    def apply_deltas(self, deltas):
+        ''' Add the deltas returned by collect_deltas to the table
+        '''
+        for obs, (regret_delta, policy_delta) in deltas.items():
+            infoset_id = self.table.get_id(obs)
+            self.table.arrays['regrets'][infoset_id] += regret_delta
+            self.table.arrays['average_policy'][infoset_id] += policy_delta
+
+    def accumulate(self, infoset_id, field, legal_actions, values):
+        ''' Add values to the legal actions of a row of the regrets or the average policy
+        '''
+        if self.pending is None:
+            self.table.arrays[field][infoset_id, legal_actions] += values
+            return
+        if infoset_id not in self.pending:
+            self.pending[infoset_id] = (np.zeros(self.env.num_actions), np.zeros(self.env.num_actions))
+        row = self.pending[infoset_id][0 if field == 'regrets' else 1]
+        row[legal_actions] += values
+
+    def current_probs(self, infoset_id, legal_actions):
+        ''' Regret matching on one infoset, restricted to the legal actions
+        '''
+        probs = self.regret_matching(self.table.arrays['regrets'][infoset_id][None])[0]
+        self.table.arrays['policy'][infoset_id] = probs
+        return remove_illegal(probs, legal_actions)
+
+    def traverse_external(self, player_id):
+        ''' External sampling: walk all the actions of player_id, sample the others
+
+        Args:
+            player_id: The player to update the regrets
+
+        Returns:
+            (float): The sampled utility of player_id
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        infoset_id = self.table.get_id(obs)
+        action_probs = self.current_probs(infoset_id, legal_actions)
+
+        if current_player != player_id:
+            self.accumulate(infoset_id, 'average_policy', legal_actions, self.iteration * action_probs[legal_actions])
+            action = np.random.choice(len(action_probs), p=action_probs)
+            self.step_env(action, legal_actions)
+            utility = self.traverse_external(player_id)
+            self.env.step_back()
+            return utility
+
+        action_utilities = np.zeros(len(legal_actions))
+        for i, action in enumerate(legal_actions):
+            self.step_env(action, legal_actions)
+            action_utilities[i] = self.traverse_external(player_id)
+            self.env.step_back()
+        utility = action_probs[legal_actions] @ action_utilities
+        self.accumulate(infoset_id, 'regrets', legal_actions, action_utilities - utility)
+        return utility
+
+    def traverse_outcome(self, player_id, probs, sample_prob):
+        ''' Outcome sampling: sample one action at every node, exploring with epsilon for player_id
+
+        Args:
+            player_id: The player to update the regrets
+            probs: The reach probability of the current node for each player
+            sample_prob: The probability of sampling the current node
+
+        Returns:
+            (float): The importance weighted utility estimate of player_id
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        infoset_id = self.table.get_id(obs)
+        action_probs = self.current_probs(infoset_id, legal_actions)
+
+        sample_probs = action_probs
+        if current_player == player_id:
+            sample_probs = (1 - self.epsilon) * action_probs
+            sample_probs[legal_actions] += self.epsilon / len(legal_actions)
+        action = np.random.choice(len(sample_probs), p=sample_probs)
+
+        new_probs = probs.copy()
+        new_probs[current_player] *= action_probs[action]
+        self.step_env(action, legal_actions)
+        utility = self.traverse_outcome(player_id, new_probs, sample_prob * sample_probs[action])
+        self.env.step_back()
+
+        action_utilities = np.zeros(self.env.num_actions)
+        action_utilities[action] = utility / sample_probs[action]
+        state_utility = action_probs @ action_utilities
+
+        if current_player == player_id:
+            counterfactual_prob = np.prod(probs[:current_player]) * np.prod(probs[current_player + 1:]) / sample_prob
+            self.accumulate(infoset_id, 'regrets', legal_actions,
+                            counterfactual_prob * (action_utilities[legal_actions] - state_utility))
+        else:
+            self.accumulate(infoset_id, 'average_policy', legal_actions,
+                            self.iteration * probs[current_player] / sample_prob * action_probs[legal_actions])
+        return state_utility
+
+    def step_env(self, action, legal_actions):
+        ''' Step the env, recording the round of the action for the envs that encode it
+        '''
+        if hasattr(self.env.game, 'round_counter'):
+            return self.env.step2(action, legal_actions)
+        return self.env.step(action)
+
     def traverse_tree(self, probs, player_id):
         ''' Traverse the game tree, update the regrets
 
@@ -58,23 +360,21 @@ class CFRAgent():
 
         current_player = self.env.get_player_id()
 
-        action_utilities = {}
-        state_utility = np.zeros(self.env.num_players)
         obs, legal_actions = self.get_state(current_player)
-        action_probs = self.action_probs(obs, legal_actions, self.policy)
+        infoset_id = self.table.get_id(obs)
+        action_probs = remove_illegal(self.table.arrays['policy'][infoset_id], legal_actions)
+        action_utilities = np.zeros((len(legal_actions), self.env.num_players))
 
-        for action in legal_actions:
-            action_prob = action_probs[action]
+        for i, action in enumerate(legal_actions):
             new_probs = probs.copy()
-            new_probs[current_player] *= action_prob
+            new_probs[current_player] *= action_probs[action]
 
             # Keep traversing the child state
-            self.env.step(action)
-            utility = self.traverse_tree(new_probs, player_id)
+            self.step_env(action, legal_actions)
+            action_utilities[i] = self.traverse_tree(new_probs, player_id)
             self.env.step_back()
 
-            state_utility += action_prob * utility
-            action_utilities[action] = utility
+        state_utility = action_probs[legal_actions] @ action_utilities
 
         if not current_player == player_id:
             return state_utility
@@ -83,65 +383,50 @@ class CFRAgent():
         player_prob = probs[current_player]
         counterfactual_prob = (np.prod(probs[:current_player]) *
                                 np.prod(probs[current_player + 1:]))
-        player_state_utility = state_utility[current_player]
-
-        if obs not in self.regrets:
-            self.regrets[obs] = np.zeros(self.env.num_actions)
-        if obs not in self.average_policy:
-            self.average_policy[obs] = np.zeros(self.env.num_actions)
-        for action in legal_actions:
-            action_prob = action_probs[action]
-            regret = counterfactual_prob * (action_utilities[action][current_player]
-                    - player_state_utility)
-            self.regrets[obs][action] += regret
-            self.average_policy[obs][action] += self.iteration * player_prob * action_prob
+
+        regrets = counterfactual_prob * (action_utilities[:, current_player] - state_utility[current_player])
+        self.accumulate(infoset_id, 'regrets', legal_actions, regrets)
+        self.accumulate(infoset_id, 'average_policy', legal_actions,
+                        self.iteration * player_prob * action_probs[legal_actions])
         return state_utility
 
     def update_policy(self):
         ''' Update policy based on the current regrets
         '''
-        for obs in self.regrets:
-            self.policy[obs] = self.regret_matching(obs)
+        self.table['policy'][:] = self.regret_matching(self.table['regrets'])
 
-    def regret_matching(self, obs):
-        ''' Apply regret matching
+    def regret_matching(self, regrets):
+        ''' Apply regret matching to the regrets of many infosets at once
 
         Args:
-            obs (string): The state_str
-        '''
-        regret = self.regrets[obs]
-        positive_regret_sum = sum([r for r in regret if r > 0])
+            regrets (numpy.array): (N, num_actions) regrets
 
-        action_probs = np.zeros(self.env.num_actions)
-        if positive_regret_sum > 0:
-            for action in range(self.env.num_actions):
-                action_probs[action] = max(0.0, regret[action] / positive_regret_sum)
-        else:
-            for action in range(self.env.num_actions):
-                action_probs[action] = 1.0 / self.env.num_actions
-        return action_probs
+        Returns:
+            (numpy.array): (N, num_actions) action probabilities, uniform where no regret is positive
+        '''
+        positive_regrets = np.maximum(regrets, 0)
+        positive_regret_sum = positive_regrets.sum(axis=1, keepdims=True)
+        uniform = np.full_like(positive_regrets, 1.0 / self.env.num_actions)
+        return np.divide(positive_regrets, positive_regret_sum, out=uniform, where=positive_regret_sum > 0)
 
-    def action_probs(self, obs, legal_actions, policy):
+    def action_probs(self, obs, legal_actions, field):
         ''' Obtain the action probabilities of the current state
 
         Args:
             obs (str): state_str
             legal_actions (list): List of leagel actions
-            player_id (int): The current player
-            policy (dict): The used policy
+            field (str): The used policy, 'policy' or 'average_policy'
 
         Returns:
-            (tuple) that contains:
-                action_probs(numpy.array): The action probabilities
-                legal_actions (list): Indices of legal actions
+            action_probs(numpy.array): The action probabilities, uniform over the legal
+                actions for unknown states
         '''
-        if obs not in policy.keys():
-            action_probs = np.array([1.0/self.env.num_actions for _ in range(self.env.num_actions)])
-            self.policy[obs] = action_probs
+        infoset_id = self.table.find(obs)
+        if infoset_id < 0:
+            action_probs = np.full(self.env.num_actions, 1.0 / self.env.num_actions)
         else:
-            action_probs = policy[obs]
-        action_probs = remove_illegal(action_probs, legal_actions)
-        return action_probs
+            action_probs = self.table.arrays[field][infoset_id]
+        return remove_illegal(action_probs, legal_actions)
 
     def eval_step(self, state):
         ''' Given a state, predict action based on average policy
@@ -153,7 +438,7 @@ class CFRAgent():
             action (int): Predicted action
             info (dict): A dictionary containing information
         '''
-        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()), self.average_policy)
+        probs = self.action_probs(state_key(state), list(state['legal_actions'].keys()), 'average_policy')
         action = np.random.choice(len(probs), p=probs)
 
         info = {}
@@ -173,7 +458,7 @@ class CFRAgent():
                 legal_actions (list): Indices of legal actions
         '''
         state = self.env.get_state(player_id)
-        return state['obs'].tostring(), list(state['legal_actions'].keys())
+        return state_key(state), list(state['legal_actions'].keys())
 
     def save(self):
         ''' Save model
@@ -181,41 +466,70 @@ class CFRAgent():
         if not os.path.exists(self.model_path):
             os.makedirs(self.model_path)
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'wb')
-        pickle.dump(self.policy, policy_file)
-        policy_file.close()
-
-        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'wb')
-        pickle.dump(self.average_policy, average_policy_file)
-        average_policy_file.close()
+        self.table.save(os.path.join(self.model_path, 'infosets.npz'))
 
-        regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'wb')
-        pickle.dump(self.regrets, regrets_file)
-        regrets_file.close()
+        # The normalized average policy in the compact format, for evaluation only
+        average_policy = self.table['average_policy']
+        totals = average_policy.sum(axis=1, keepdims=True)
+        average_policy = np.divide(average_policy, totals, out=np.zeros_like(average_policy), where=totals > 0)
+        save_policy(os.path.join(self.model_path, 'average_policy'), dict(zip(self.table.keys, average_policy)))
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'wb')
         pickle.dump(self.iteration, iteration_file)
         iteration_file.close()
 
     def load(self):
-        ''' Load model
+        ''' Load model, either the infoset table or the dict pickles of older models
         '''
         if not os.path.exists(self.model_path):
             return
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'rb')
-        self.policy = pickle.load(policy_file)
-        policy_file.close()
-
-        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'rb')
-        self.average_policy = pickle.load(average_policy_file)
-        average_policy_file.close()
-
-        regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'rb')
-        self.regrets = pickle.load(regrets_file)
-        regrets_file.close()
+        table_path = os.path.join(self.model_path, 'infosets.npz')
+        if os.path.exists(table_path):
+            self.table = InfosetTable.load(table_path, self.table_fields())
+        else:
+            dicts = {}
+            for name in self.table_fields():
+                with open(os.path.join(self.model_path, name + '.pkl'), 'rb') as dict_file:
+                    dicts[name] = pickle.load(dict_file)
+            self.table = self.new_table()
+            for name, values in dicts.items():
+                for obs, row in values.items():
+                    if len(row) == self.env.num_actions:
+                        self.table.arrays[name][self.table.get_id(obs)] = row
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'rb')
         self.iteration = pickle.load(iteration_file)
         iteration_file.close()
 
+def _receive_all(remotes):
+    ''' Read the answer of every worker before raising the error of one of them
+    '''
+    answers = [remote.recv() for remote in remotes]
+    for status, result in answers:
+        if status == 'error':
+            raise RuntimeError('CFR worker failed:\n' + result)
+    return [result for _, result in answers]
+
+def _cfr_worker(remote, parent_remote, agent):
+    parent_remote.close()
+    agent.workers = []
+    while True:
+        cmd, data = remote.recv()
+        if cmd == 'close':
+            break
+        try:
+            if cmd == 'run':
+                agent.iteration, seeds = data
+                remote.send(('ok', agent.collect_deltas(seeds)))
+            elif cmd == 'apply':
+                agent.apply_deltas(data)
+                if agent.sampling == 'chance':
+                    agent.update_policy()
+        except Exception:
+            import traceback
+            if cmd == 'run':
+                remote.send(('error', traceback.format_exc()))
+            else:
+                raise
+    remote.close()
@@ -1,4 +1,5 @@
 from rlcard.utils.utils import print_card
+from rlcard.games.limitholdem.cards import card_strings
 
 
 class HumanAgent(object):
@@ -65,9 +66,9 @@ def _print_state(state, action_record):
         print('>> Player', pair[0], 'chooses', pair[1])
 
     print('\n=============== Community Card ===============')
-    print_card(state['public_cards'])
+    print_card(card_strings(state['public_cards']))
     print('===============   Your Hand    ===============')
-    print_card(state['hand'])
+    print_card(card_strings(state['hand']))
     print('===============     Chips      ===============')
     print('Yours:   ', end='')
     for _ in range(state['my_chips']):
@@ -1,4 +1,5 @@
 from rlcard.utils.utils import print_card
+from rlcard.games.limitholdem.cards import card_strings
 
 
 class HumanAgent(object):
@@ -58,10 +59,10 @@ def _print_state(state, action_record):
         print('>> Player', pair[0], 'chooses', pair[1])
 
     print('\n=============== Community Card ===============')
-    print_card(state['public_cards'])
+    print_card(card_strings(state['public_cards']))
 
     print('=============  Player',state["current_player"],'- Hand   =============')
-    print_card(state['hand'])
+    print_card(card_strings(state['hand']))
 
     print('===============     Chips      ===============')
     print('In Pot:',state["pot"])
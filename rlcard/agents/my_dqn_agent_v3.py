@@ -333,6 +333,49 @@ class MYDQNAgentV3(object):
 
         return action, info
 
+    def eval_step_batch(self, state):
+        '''
+        Evaluating step for a batch of states with one forward pass
+        Args:
+            state: batched states of BatchLimitholdemEnv
+        Returns:
+            actions (numpy.array): the legal action with the highest Q value for each state
+        '''
+        qvals = self.batch_qvals(self.tgt, state)
+        return np.argmax(qvals, axis=1)
+
+    def step_batch(self, state):
+        '''
+        Epsilon greedy step of the model for a batch of states with one forward pass
+        Args:
+            state: batched states of BatchLimitholdemEnv
+        Returns:
+            actions (numpy.array): the action id for each state
+        '''
+        qvals = self.batch_qvals(self.model, state)
+        legal_actions = state['legal_actions']
+        random_actions = np.argmax(np.random.rand(*legal_actions.shape) * legal_actions, axis=1)
+        explore = np.random.rand(len(qvals)) < self.epsilon
+        return np.where(explore, random_actions, np.argmax(qvals, axis=1))
+
+    def batch_qvals(self, model, state):
+        '''
+        Q values of a batch of states with the illegal actions set to -inf
+        Args:
+            model: the model or the target model
+            state: batched states with 'card_tensor' (B, 6, 4, 13), 'action_tensor' (B, 24, 3, 4)
+                and 'legal_actions' (B, num_actions) booleans
+        Returns:
+            qvals (numpy.array): (B, num_actions) Q values
+        '''
+        batch_size = len(state['legal_actions'])
+        obs1 = torch.from_numpy(state['card_tensor']).float().view(batch_size, -1)
+        obs2 = torch.from_numpy(state['action_tensor']).float().view(batch_size, -1)
+        with torch.no_grad():
+            qvals = model(obs1, obs2).numpy()
+        qvals[~state['legal_actions']] = -np.inf
+        return qvals
+
 
     def step(self, state):
         '''step = eval.step
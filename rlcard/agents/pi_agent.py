@@ -7,23 +7,29 @@ import os
 import pickle
 
 from rlcard.utils.utils import *
+from rlcard.utils.transposition import TranspositionCache
+from rlcard.utils.policy_file import save_policy, load_policy, is_policy_file
 
 
 class PIAgent:
     ''' Implement policy - iteration algorithm
     '''
 
-    def __init__(self, env, model_path='./pi_model', g=1):
+    def __init__(self, env, model_path='./pi_model', g=1, num_workers=0, cache_size=0):
         ''' Initialize Agent
 dp
          Args:
          env (Env): Env class
          converge se 4 iterations
+         num_workers (int): The number of processes evaluate_policy spreads the deals over, 0 to
+         evaluate them in this process
+         cache_size (int): The size of the transposition cache of subtree values, 0 for no cache
         '''
 
         self.public_card_prob = None  # prob of having this set of public cards
         self.hand_card_prob = None    # prob of having this set of hand cards
         self.gamma = g                # gamma value
+        self.num_workers = num_workers
         self.agent_id = 0             # starting possition of agent
         self.rank_list = ['A', 'T', 'J', 'Q', 'K']
         self.use_raw = False
@@ -38,6 +44,11 @@ dp
         self.rank = None
         self.public_ranks = None
 
+        # Optional transposition cache of subtree values, with the version of every policy
+        # entry so that the cache can tell which subtrees were computed with the current policy
+        self.cache = TranspositionCache(cache_size) if cache_size else None
+        self.versions = {}
+
     def train(self, episodes=None):
         ''' Find optimal policy
         '''
@@ -59,48 +70,12 @@ dp
     def remake_policy(self):
         ''' Take the policy that has key: tuple(obs, opponent_card, public_cards) and for every obs compute
         average policy for all possible opponent cards in key: obs
-        We take the first key then we find a match and store it to send to policy sum
+        The keys are grouped by obs in one pass and weighted by the probability of their cards
         '''
         new_policy = collections.defaultdict(list)
-        old_policy = self.policy
-
-        for key1 in old_policy:
-            if isinstance(key1, tuple):
-                obs1 = key1[0]
-                if obs1 in new_policy:
-                    continue
-                same_obs_values = []
-                probs = np.array([])
-                for key2 in old_policy:
-                    if isinstance(key2, tuple):
-                        obs2 = key2[0]
-                        if obs1 == obs2:
-                            same_obs_values.append(old_policy[key2])
-                            probs = np.append(probs, key2[1])
-                if same_obs_values:
-                    new_policy = self._policy_sum(new_policy, same_obs_values, obs1, probs)
-                else:
-                    print('10')
-
+        new_policy.update(marginalize_policy(self.policy, weight=lambda key: key[1]))
         self.policy = new_policy
 
-
-    @staticmethod
-    def _policy_sum(policy, same_obs_values, obs, probs=None):
-        ''' Gets the average mean policy when given different policies
-        args:
-        policy: contains the local policy
-        same_obs_values: list of np arrays containing probs for every action
-        obs: key for policy
-        '''
-        if probs is None:
-            average_values = np.mean(same_obs_values, axis=0)
-            policy[obs] = average_values
-        else:
-            average_values = np.average(same_obs_values, axis=0, weights=probs)
-            policy[obs] = average_values
-        return policy
-
     def compare_policys(self, p1, p2):
         ''' Compare the policies given
         If they have different number of keys they are different
@@ -128,40 +103,98 @@ dp
                 self.agent_id = id
                 break
 
-    def evaluate_policy(self):
+    def evaluate_policy(self, num_workers=None):
         '''We traverse the tree for every possible combination of cards(agent card, public cards and opponent card)
         and also every starting possition so we can explore all the state space
         We the total Value of our iteration with current policy so we can know if it is working
+
+        Args:
+            num_workers (int): The number of processes, self.num_workers if None
         '''
         self.find_agent()
-        suit = 'S'
+        if num_workers is None:
+            num_workers = self.num_workers
+        if num_workers > 0:
+            return self.evaluate_policy_parallel(num_workers)
         Vtotal = 0
         for rank1 in self.rank_list:
             for rank2 in self.rank_list:
                 for rank3 in self.rank_list:
                     for rank4 in self.rank_list:
-                        self.env.reset(self.agent_id, self.agent_id, Card(suit, rank1), Card(suit, rank2),
-                                       Card(suit, rank3), Card(suit, rank4))
-                        self.rank = rank4
-                        self.public_ranks = (rank2, rank3)
-                        self.get_public_card_probs(rank1, rank2, rank3, rank4)
-                        Vtotal += self.traverse_tree()
+                        Vtotal += self.evaluate_deal(self.agent_id, rank1, rank2, rank3, rank4)
         player = (self.agent_id + 1) % self.env.num_players
         for rank1 in self.rank_list:
             for rank2 in self.rank_list:
                 for rank3 in self.rank_list:
                     for rank4 in self.rank_list:
-                        self.env.reset(player, self.agent_id, Card(suit, rank1), Card(suit, rank2),
-                                       Card(suit, rank3), Card(suit, rank4))
-                        self.rank = rank4
-                        self.public_ranks = (rank2, rank3)
-                        self.get_public_card_probs(rank1, rank2, rank3, rank4)
-                        Vtotal += self.traverse_tree()
+                        Vtotal += self.evaluate_deal(player, rank1, rank2, rank3, rank4)
         print('Total value: %d' % Vtotal)
         return Vtotal
 
+    def evaluate_deal(self, starter, rank1, rank2, rank3, rank4):
+        ''' Traverse the tree of one combination of cards and update the policy
+        Args: starter: the player that starts
+              rank1: rank of our card
+              rank2, rank3: ranks of the public cards
+              rank4: rank of the opponent card
+        '''
+        suit = 'S'
+        self.env.reset(starter, self.agent_id, Card(suit, rank1), Card(suit, rank2),
+                       Card(suit, rank3), Card(suit, rank4))
+        self.rank = rank4
+        self.public_ranks = (rank2, rank3)
+        self.get_public_card_probs(rank1, rank2, rank3, rank4)
+        return self.traverse_tree()
+
+    def deal_groups(self):
+        ''' Split the combinations of cards of evaluate_policy into groups that update disjoint policy keys
+        Every key holds the opponent rank, and the obs of our card and the first public card
+        share their bits, so deals only share keys with the same opponent card and the same
+        pair of our card and first public card. The deals keep their order of evaluate_policy
+        in each group.
+        '''
+        groups = collections.OrderedDict()
+        player = (self.agent_id + 1) % self.env.num_players
+        for starter in (self.agent_id, player):
+            for rank1 in self.rank_list:
+                for rank2 in self.rank_list:
+                    for rank3 in self.rank_list:
+                        for rank4 in self.rank_list:
+                            group = (rank4, frozenset((rank1, rank2)))
+                            groups.setdefault(group, []).append((starter, rank1, rank2, rank3, rank4))
+        return list(groups.values())
+
+    def evaluate_policy_parallel(self, num_workers):
+        ''' Evaluate the groups of deal_groups in a process pool against the current policy
+        Each worker evaluates a group like evaluate_policy does, with its own copy of the env and
+        a seed of its own for the random initial policies, and sends back the policy entries it
+        changed and the value of the group. The result does not depend on the number of workers.
+        '''
+        import multiprocessing as mp
+        groups = self.deal_groups()
+        seeds = np.random.SeedSequence(np.random.randint(2 ** 31)).generate_state(len(groups)).tolist()
+        with mp.Pool(min(num_workers, len(groups)), initializer=_init_pi_worker, initargs=(self,)) as pool:
+            results = pool.map(_evaluate_pi_group, zip(seeds, groups), chunksize=1)
+        Vtotal = 0
+        for updates, value in results:
+            if self.cache is not None:
+                for key, probs in updates.items():
+                    if key in self.policy and not np.array_equal(self.policy[key], probs):
+                        self.versions[key] = self.versions.get(key, 0) + 1
+            self.policy.update(updates)
+            Vtotal += value
+        print('Total value: %d' % Vtotal)
+        return Vtotal
 
     def traverse_tree(self):
+        ''' Traverse the game tree, looking the subtree value up in the transposition cache if there is one
+        '''
+        if self.cache is None or self.env.is_over():
+            return self._traverse_tree()
+        key = (self.agent_id, self.env.game.get_transposition_key())
+        return self.cache.traverse(key, self._traverse_tree, self.versions)
+
+    def _traverse_tree(self):
         ''' We traverse the game tree for a specific set of hand card, opponent card and public cards
         If end game return the chips won or lost(reward)
         If opponent turn get the probs for every move and play every action (except those with prob = 0):
@@ -243,6 +276,8 @@ dp
 
         if obs in self.policy.keys():
             #print(self.policy[obs])
+            if self.cache is not None and not np.array_equal(self.policy[obs], new_policy):
+                self.versions[obs] = self.versions.get(obs, 0) + 1
             self.policy[obs] = new_policy
             #print(self.policy[obs])
         else:
@@ -280,15 +315,24 @@ dp
             action_probs = np.array([0 for action in range(self.env.num_actions)])
             action_probs[best_action] = 1
             self.policy[obs1] = action_probs
+            self._depend(obs1)
         elif obs not in policy.keys():
             action_probs = policy[obs1].copy()
+            self._depend(obs1)
         else:
             print('1')
             action_probs = policy[obs].copy()
+            self._depend(obs)
         action_probs = remove_illegal(action_probs, legal_actions)
         return action_probs
 
 
+    def _depend(self, key):
+        ''' Record a read of a policy entry for the transposition cache
+        '''
+        if self.cache is not None:
+            self.cache.depend(key, self.versions.get(key, 0))
+
     def eval_step(self, state):
         ''' Given a state, predict action based on average policy
 
@@ -387,18 +431,45 @@ dp
         if not os.path.exists(self.model_path):
             os.makedirs(self.model_path)
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'), 'wb')
-        pickle.dump(self.policy, policy_file)
-        policy_file.close()
+        save_policy(os.path.join(self.model_path, 'policy'), self.policy)
 
-    def load(self):
-        ''' Load model
+    def load(self, lazy=False):
+        ''' Load model, either the policy files or the pickles of older models
+
+        Args:
+            lazy (boolean): True to memory-map the policy files instead of reading them,
+                the entries the agent changes are then kept in memory
         '''
 
         if not os.path.exists(self.model_path):
             return
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'), 'rb')
-        self.policy = pickle.load(policy_file)
-        policy_file.close()
-
+        self.policy = self._load_table('policy', lazy)
+
+    def _load_table(self, name, lazy):
+        path = os.path.join(self.model_path, name)
+        if is_policy_file(path):
+            table = load_policy(path, lazy)
+            return table if lazy else collections.defaultdict(list, table)
+        table_file = open(path + '.pkl', 'rb')
+        table = pickle.load(table_file)
+        table_file.close()
+        return table
+
+_pi_worker_agent = None
+
+def _init_pi_worker(agent):
+    global _pi_worker_agent
+    _pi_worker_agent = agent
+
+def _evaluate_pi_group(args):
+    seed, deals = args
+    agent = _pi_worker_agent
+    np.random.seed(seed)
+    agent.env.seed(seed)
+    policy = agent.policy.copy()
+    value = sum(agent.evaluate_deal(*deal) for deal in deals)
+    # Every changed entry is a new array, the others are the ones of the master
+    updates = {key: probs for key, probs in agent.policy.items() if policy.get(key) is not probs}
+    agent.policy = policy
+    return updates, value
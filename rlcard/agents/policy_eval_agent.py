@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+from rlcard.agents.cfr_agent import state_key
+from rlcard.utils.utils import remove_illegal
+from rlcard.utils.policy_file import PolicyFile
+
+
+class PolicyEvalAgent(object):
+    ''' An evaluation-only agent that plays a policy file saved by a tabular agent
+
+    The file is memory-mapped read-only, so opening it does not depend on the size of the
+    policy and the processes that evaluate the same file share one copy of it. Pickling
+    the agent, e.g. to send it to tournament workers, maps the file again on the other side.
+    '''
+
+    def __init__(self, path, greedy=False):
+        ''' Initialize the agent
+
+        Args:
+            path (str): The directory of the policy file
+            greedy (boolean): True to play the most likely action, False to sample it
+        '''
+        self.use_raw = False
+        self.greedy = greedy
+        self.policy = PolicyFile(path)
+        self.num_actions = self.policy.num_actions
+
+    @classmethod
+    def from_cfr(cls, model_path):
+        ''' Play the average policy saved by CFRAgent.save, sampling like CFRAgent.eval_step
+        '''
+        return cls(os.path.join(model_path, 'average_policy'))
+
+    @classmethod
+    def from_pi(cls, model_path):
+        ''' Play the policy saved by PIAgent.save, greedily like PIAgent.eval_step
+        '''
+        return cls(os.path.join(model_path, 'policy'), greedy=True)
+
+    def action_probs(self, state):
+        ''' The action probabilities of a state, uniform over the legal actions for unknown states
+
+        Args:
+            state (dict): An dictionary that represents the current state
+
+        Returns:
+            (numpy.array): The action probabilities
+        '''
+        legal_actions = list(state['legal_actions'].keys())
+        row = self.policy.find(state_key(state))
+        if row < 0:
+            probs = np.zeros(self.num_actions)
+        else:
+            probs = np.array(self.policy.rows[row], dtype=np.float64)
+        return remove_illegal(probs, legal_actions)
+
+    def eval_step(self, state):
+        ''' Given a state, predict action based on the policy file
+
+        Args:
+            state (numpy.array): State representation
+
+        Returns:
+            action (int): Predicted action
+            info (dict): A dictionary containing information
+        '''
+        probs = self.action_probs(state)
+        if self.greedy:
+            action = np.argmax(probs)
+        else:
+            action = np.random.choice(len(probs), p=probs)
+
+        legal_actions = list(state['legal_actions'].keys())
+        info = {}
+        info['probs'] = {state['raw_legal_actions'][i]: float(probs[legal_actions[i]]) for i in range(len(legal_actions))}
+
+        return action, info
+
+    def step(self, state):
+        ''' step = eval.step
+        '''
+        return self.eval_step(state)[0]
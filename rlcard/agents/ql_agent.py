@@ -1,20 +1,22 @@
-import collections
 from scipy.special import softmax
 import os
 import pickle
 
 from rlcard.utils.utils import *
+from rlcard.utils.infoset_table import InfosetTable
+from rlcard.utils.policy_file import save_policy, load_policy, is_policy_file
 
 
 class QLAgent:
     ''' Implement Q-learning algorithm
     '''
 
-    def __init__(self, env, model_path='./ql_model', a=0.1, g=1, e=0.99):
+    def __init__(self, env, model_path='./ql_model', a=0.1, g=1, e=0.99, capacity=1024):
         ''' Initialize Agent
 dp
          Args:
          env (Env): Env class
+         capacity (int): The number of states the Q-table allocates up front, it doubles when full
         '''
         self.epsilon = 1
         self.gamma = g
@@ -27,14 +29,33 @@ dp
         self.epsilon_min = 0.01
         self.v = 0
 
-        # A policy is a dict state_str -> action probabilities
-        self.policy = collections.defaultdict(list)
-
-        # Regret is a dict state_str -> action regrets
-        self.qualities = collections.defaultdict(list)
+        # The Q-table is a dense (num_states, num_actions) float32 array indexed by the
+        # infoset id of the state_str, illegal actions stay at -inf
+        self.table = self.new_table(capacity)
 
         self.iteration = 0
 
+    def new_table(self, capacity=1024):
+        ''' Make an empty Q-table
+        '''
+        return InfosetTable(self.env.num_actions, self.table_fields(), capacity, dtype=np.float32)
+
+    def table_fields(self):
+        return {'qualities': -np.inf}
+
+    @property
+    def qualities(self):
+        ''' The Q-table as a dict state_str -> action qualities
+        '''
+        return self.table.as_dict('qualities')
+
+    @property
+    def policy(self):
+        ''' The softmax policy of the Q-table as a dict state_str -> action probabilities
+        '''
+        probs = softmax(self.table['qualities'].astype(np.float64), axis=1)
+        return dict(zip(self.table.keys, probs))
+
     def train(self):
         ''' Do one iteration of QLA
         '''
@@ -45,6 +66,66 @@ dp
         self._decay_epsilon()
         self.v = v
 
+    def train_batch(self, num_episodes, num_workers=0, merge_every=100):
+        ''' Play many episodes against the Q-table
+
+        Without workers the episodes are played one after the other like train does, with
+        the env and agents looked up once. With workers, every worker plays up to merge_every
+        episodes on its own copy of the Q-table and sends back the rows it changed. Each row is
+        then set to the average of the rows of the workers that changed it, and the workers
+        start the next round from the merged table.
+
+        Args:
+            num_episodes (int): The number of episodes
+            num_workers (int): The number of processes, 0 to play in this process
+            merge_every (int): The number of episodes a worker plays between two merges
+        '''
+        if not num_workers:
+            self.find_agent()
+            for _ in range(num_episodes):
+                self.iteration += 1
+                self.env.reset()
+                self.v = self.traverse_tree()
+                self._decay_epsilon()
+            return
+
+        import multiprocessing as mp
+        with mp.Pool(num_workers, initializer=_init_ql_worker, initargs=(self,)) as pool:
+            while num_episodes > 0:
+                counts = []
+                while num_episodes > 0 and len(counts) < num_workers:
+                    counts.append(min(merge_every, num_episodes))
+                    num_episodes -= counts[-1]
+                seeds = np.random.SeedSequence(np.random.randint(2 ** 31)).generate_state(len(counts)).tolist()
+                results = pool.map(_train_ql_worker, [(seed, count, self.epsilon, self.table)
+                                                      for seed, count in zip(seeds, counts)], chunksize=1)
+                self.merge_tables([(ids, keys, rows) for ids, keys, rows, _ in results])
+                self.v = results[-1][3]
+                self.iteration += sum(counts)
+                # Each worker decayed its epsilon once per episode it played
+                for _ in range(max(counts)):
+                    self._decay_epsilon()
+
+    def merge_tables(self, updates):
+        ''' Merge the rows changed by the workers of train_batch into the Q-table
+
+        Args:
+            updates (list): For each worker the ids of the rows it changed, the keys of the
+                states it added and the rows of both
+        '''
+        for _, keys, _ in updates:
+            for key in keys:
+                self.table.get_id(key)
+        qualities = self.table['qualities']
+        totals = np.zeros(qualities.shape)
+        counts = np.zeros(len(qualities))
+        for ids, keys, rows in updates:
+            ids = np.concatenate([ids, [self.table.index[key] for key in keys]]).astype(np.int64)
+            totals[ids] += rows
+            counts[ids] += 1
+        merged = np.flatnonzero(counts)
+        qualities[merged] = totals[merged] / counts[merged, np.newaxis]
+
     def find_agent(self):
         ''' Find if the agent starts first or second
         '''
@@ -93,7 +174,7 @@ dp
             quality = {}
             obs, legal_actions = self.get_state(current_player)
             # if first time we encounter state initialize qualities or get the previous policy
-            self.action_probs(obs, legal_actions, self.policy, self.qualities)
+            self.action_probs(obs, legal_actions)
 
             for action in legal_actions:
                 # Keep traversing the child state
@@ -116,34 +197,23 @@ dp
 
         return qstate * self.gamma
 
-    def action_probs(self, obs, legal_actions, policy, action_values):
+    def action_probs(self, obs, legal_actions):
         ''' Obtain the action probabilities(policy) of the current state
         or create a new policy
 
         Args:
             obs (str): state_str
             legal_actions (list): List of legal actions
-            player_id (int): The current player
-            policy (dict): The used policy
-            action_values (dict): The action_values of policy
 
         Returns:
-            (tuple) that contains:
-                action_probs(numpy.array): The action probabilities
-                legal_actions (list): Indices of legal actions
+            action_probs(numpy.array): The action probabilities
         '''
-
-        # if new state initialize qualities and policy
-        if obs not in policy.keys() and obs not in self.qualities.keys():
-            tactions = np.array([-np.inf for action in range(self.env.num_actions)])
-            for action in range(self.env.num_actions):
-                if action in legal_actions:
-                    tactions[action] = 0
-            self.qualities[obs] = tactions
-            action_probs = softmax(tactions)
-            self.policy[obs] = action_probs
-        else:
-            action_probs = policy[obs].copy()
+        # if new state add its row to the Q-table, the legal actions start at 0
+        infoset_id = self.table.find(obs)
+        if infoset_id < 0:
+            infoset_id = self.table.get_id(obs)
+            self.table.arrays['qualities'][infoset_id, legal_actions] = 0
+        action_probs = softmax(self.table.arrays['qualities'][infoset_id].astype(np.float64))
         action_probs = remove_illegal(action_probs, legal_actions)
         return action_probs
 
@@ -153,14 +223,11 @@ dp
                     obs (str): state_str
                     next_state_values (list): The new qualities of the current iteration
          '''
-        # update the quality function
-        qf = self.qualities[obs]
-        for i in next_state_values:
-            qf[i] += self.alpha * (next_state_values[i] - qf[i])
-
-        # update action values
-        self.qualities[obs] = qf
-        self.policy[obs] = softmax(qf)
+        # update the row of the Q-table in place, the policy is its softmax
+        qf = self.table.arrays['qualities'][self.table.get_id(obs)]
+        actions = list(next_state_values)
+        values = np.array(list(next_state_values.values()), dtype=qf.dtype)
+        qf[actions] += self.alpha * (values - qf[actions])
 
     def eval_step(self, state):
         ''' Given a state, predict action based on average policy
@@ -173,8 +240,7 @@ dp
             info (dict): A dictionary containing information
         '''
 
-        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()), self.policy,
-                                  self.qualities)
+        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()))
         # action = np.random.choice(len(probs), p=probs)
         action = np.argmax(probs)
 
@@ -217,33 +283,60 @@ dp
         if not os.path.exists(self.model_path):
             os.makedirs(self.model_path)
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'wb')
-        pickle.dump(self.policy, policy_file)
-        policy_file.close()
-
-        values_file = open(os.path.join(self.model_path, 'qualities.pkl'),'wb')
-        pickle.dump(self.qualities, values_file)
-        values_file.close()
+        # The Q-table is the checkpoint, the policy file is its softmax for evaluation only
+        self.table.save(os.path.join(self.model_path, 'qualities.npz'))
+        save_policy(os.path.join(self.model_path, 'policy'), self.policy)
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'wb')
         pickle.dump(self.iteration, iteration_file)
         iteration_file.close()
 
     def load(self):
-        ''' Load model
+        ''' Load model, either the Q-table or the policy files and pickles of older models
         '''
 
         if not os.path.exists(self.model_path):
             return
 
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'rb')
-        self.policy = pickle.load(policy_file)
-        policy_file.close()
-
-        values_file = open(os.path.join(self.model_path, 'qualities.pkl'),'rb')
-        self.qualities = pickle.load(values_file)
-        values_file.close()
+        table_path = os.path.join(self.model_path, 'qualities.npz')
+        if os.path.exists(table_path):
+            self.table = InfosetTable.load(table_path, self.table_fields(), dtype=np.float32)
+        else:
+            qualities = self._load_table('qualities')
+            self.table = self.new_table(len(qualities))
+            for obs, row in qualities.items():
+                self.table.arrays['qualities'][self.table.get_id(obs)] = row
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'rb')
         self.iteration = pickle.load(iteration_file)
-        iteration_file.close()
\ No newline at end of file
+        iteration_file.close()
+
+    def _load_table(self, name):
+        path = os.path.join(self.model_path, name)
+        if is_policy_file(path):
+            return load_policy(path, lazy=False)
+        table_file = open(path + '.pkl', 'rb')
+        table = pickle.load(table_file)
+        table_file.close()
+        return table
+
+
+def _init_ql_worker(agent):
+    global _ql_worker_agent
+    _ql_worker_agent = agent
+
+def _train_ql_worker(args):
+    seed, num_episodes, epsilon, table = args
+    agent = _ql_worker_agent
+    np.random.seed(seed)
+    agent.env.seed(seed)
+    agent.table = table
+    agent.epsilon = epsilon
+    start = table['qualities'].copy()
+    agent.train_batch(num_episodes)
+    # The rows that existed keep their ids, the new states are appended after them
+    qualities = table['qualities']
+    ids = np.flatnonzero(np.any(qualities[:len(start)] != start, axis=1))
+    keys = table.keys[len(start):]
+    rows = np.concatenate([qualities[ids], qualities[len(start):]])
+    return ids, keys, rows, agent.v
@@ -1,11 +1,15 @@
 import pprint as pp
 import numpy as np
 import collections
+import heapq
+import time
 from scipy.special import softmax
+from scipy import sparse
 import os
 import pickle
 
 from rlcard.utils.utils import *
+from rlcard.games.limitholdem.cards import card_to_id
 '''
 P is the state space that we need for implementing value iteration
 P["state1","raise"] for example captures what happens if at state1 I take action: raise.
@@ -59,6 +63,174 @@ V = {
 
 '''
 
+class StateEncoder:
+    ''' Intern the raw observations of the agent into dense integer state ids
+
+    The key of an observation is a flat tuple of small ints: who was first, the card
+    ids of the hand and of the public cards, the chips, a bit mask of the legal actions
+    and the raise counters. It tells apart the same observations as str(raw_obs).
+    '''
+
+    def __init__(self, actions):
+        ''' Initialize the encoder
+
+        Args:
+            actions (list): The raw actions of the env, in the order of their ids
+        '''
+        self.action_bits = {action: 1 << i for i, action in enumerate(actions)}
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def encode(self, raw_obs):
+        ''' The canonical key of a raw observation
+
+        Returns:
+            (tuple): The key
+        '''
+        hand = [card if isinstance(card, int) else card_to_id(card) for card in raw_obs['hand']]
+        public_cards = [card if isinstance(card, int) else card_to_id(card) for card in raw_obs['public_cards']]
+        legal_mask = 0
+        for action in raw_obs['legal_actions']:
+            legal_mask |= self.action_bits[action]
+        return (raw_obs['first'], len(hand), *hand, len(public_cards), *public_cards, *raw_obs['all_chips'],
+                raw_obs['my_chips'], legal_mask, *raw_obs.get('raise_nums', ()))
+
+    def intern(self, raw_obs):
+        ''' The id of a raw observation, given a new id if it was never seen
+        '''
+        key = self.encode(raw_obs)
+        state_id = self.ids.get(key)
+        if state_id is None:
+            state_id = self.ids[key] = len(self.ids)
+        return state_id
+
+    def find(self, raw_obs):
+        ''' The id of a raw observation, or -1 if it was never seen
+        '''
+        return self.ids.get(self.encode(raw_obs), -1)
+
+class TransitionModel:
+    ''' The learned model P of the value iteration agent, with a reverse index of its edges
+
+    P keeps the layout described above. Every edge state -> next state is also listed
+    under its next state, so that the reward of a terminal state is updated on the edges
+    that lead to it instead of on the whole of P.
+    '''
+
+    def __init__(self):
+        self.P = collections.defaultdict(dict)
+        self.predecessors = collections.defaultdict(list)   # next state -> [(state, action)] edges
+
+    def __len__(self):
+        return len(self.P)
+
+    def add_state(self, obs, legal_actions):
+        ''' Add a state, or the legal actions of a known state that are not listed yet
+        '''
+        actions = self.P[obs]
+        for action in legal_actions:
+            if action not in actions:
+                actions[action] = [{}, 0]   # so far zero times
+
+    def update_reward(self, next_state, q):
+        ''' Average the reward of every edge that leads to next_state with q
+
+        A state must give same reward in value iteration whenever it shows up
+        '''
+        for state, action in self.predecessors[next_state]:
+            edge = self.P[state][action][0][next_state]
+            edge[1] = (edge[1] + q) / 2     # q_new = (q_old + q) / 2
+
+    def record(self, obs, action, next_state, q, terminal):
+        ''' Count taking action in obs and ending up in next_state
+
+        Only the probabilities of the edges of (obs, action) are normalized again.
+        '''
+        next_states, ctr = self.P[obs][action]
+        ctr += 1    # took action when in state obs one more time
+        self.P[obs][action][1] = ctr
+        edge = next_states.get(next_state)
+        if edge is None:
+            # prob of next state, reward for this state, times visited this state
+            next_states[next_state] = [0, q if terminal else 0, 1]
+            self.predecessors[next_state].append((obs, action))
+        else:   # I have visited again next state, after current state obs
+            edge[2] += 1
+
+        for edge in next_states.values():   # times visited next state/sum of all visits
+            edge[0] = edge[2] / ctr
+
+    def compile(self, num_actions):
+        ''' Compile P into a sparse matrix for the Bellman backups
+
+        Row s * num_actions + a of the matrix holds the probabilities of the next states
+        of taking action a in state s, and the same entry of the rewards holds the expected
+        reward of the action. The actions that were never listed for a state have an
+        empty row, so their value is 0 like in the Q table.
+
+        Args:
+            num_actions (int): The number of actions
+
+        Returns:
+            (CompiledModel): The states with their integer ids, the matrix and the rewards
+        '''
+        states = list(self.P)
+        index = {state: i for i, state in enumerate(states)}
+        rows, columns, probs = [], [], []
+        rewards = np.zeros(len(states) * num_actions)
+        for i, state in enumerate(states):
+            for action, (next_states, _) in self.P[state].items():
+                row = i * num_actions + action
+                for next_state, (prob, reward, _) in next_states.items():
+                    rows.append(row)
+                    columns.append(index[next_state])
+                    probs.append(prob)
+                    rewards[row] += prob * reward
+        matrix = sparse.csr_matrix((probs, (rows, columns)), shape=(len(states) * num_actions, len(states)))
+        return CompiledModel(states, index, matrix, rewards, num_actions)
+
+class CompiledModel:
+    ''' P compiled by TransitionModel.compile
+    '''
+
+    def __init__(self, states, index, matrix, rewards, num_actions):
+        self.states = states
+        self.index = index
+        self.matrix = matrix
+        self.rewards = rewards
+        self.num_actions = num_actions
+
+    def backup(self, V, gamma):
+        ''' The Q values of every state and action given the state values
+
+        Returns:
+            (numpy.array): A (num_states, num_actions) array
+        '''
+        return (self.rewards + gamma * (self.matrix @ V)).reshape(-1, self.num_actions)
+
+    def backup_state(self, i, V, gamma):
+        ''' The Q values of the actions of one state given the state values
+        '''
+        A = self.num_actions
+        start, end = self.matrix.indptr[i * A], self.matrix.indptr[(i + 1) * A]
+        products = self.matrix.data[start:end] * V[self.matrix.indices[start:end]]
+        sums = np.zeros(A)
+        counts = np.diff(self.matrix.indptr[i * A:(i + 1) * A + 1])
+        np.add.at(sums, np.repeat(np.arange(A), counts), products)
+        return self.rewards[i * A:(i + 1) * A] + gamma * sums
+
+    def predecessors(self):
+        ''' The states with an edge into each state
+
+        Returns:
+            (list): For every state id, the array of the ids of the states that lead to it
+        '''
+        incoming = self.matrix.tocsc()
+        return [np.unique(incoming.indices[incoming.indptr[j]:incoming.indptr[j + 1]] // self.num_actions)
+                for j in range(len(self.states))]
+
 class ValueIterAgent:
     ''' An agent that will play according to value iteration algorithm,
         in order to find optimal policy
@@ -78,39 +250,114 @@ class ValueIterAgent:
         self.gamma = gamma
         self.agent_id = 0
         self.model_path = model_path
-        self.P = collections.defaultdict(dict)              # state space
+        self.encoder = StateEncoder(env.actions)
+        self.model = TransitionModel()
+        self.P = self.model.P                               # state space
         self.V = collections.defaultdict(float)    # value function for each state (expected return of the best action for each state)
         self.Q = collections.defaultdict(list)     # Q table
     
 
-    def value_iteration_algo(self):
+    def value_iteration_algo(self, method='jacobi'):
+        ''' Find the values of the learned model
+
+        The model is compiled into a sparse matrix once, so that a sweep of Bellman
+        backups is a sparse mat-vec.
+
+        Args:
+            method (str): 'jacobi' to back up every state from the values of the previous
+                sweep, 'gauss-seidel' to use the new values within a sweep, 'prioritized'
+                to back up the states with the largest Bellman error first
+
+        Returns:
+            (dict): The method, number of states, iterations, sweeps (backups per state),
+                backups and seconds it took
+        '''
+        start = time.perf_counter()
+        compiled = self.model.compile(self.env.num_actions)
+        num_states = len(compiled.states)
+        V = np.zeros(num_states)
+        actions = np.zeros(num_states, dtype=int)
+        if method == 'jacobi':
+            iteration = 0
+            while True:
+                Q = compiled.backup(V, self.gamma)
+                q_vals = np.max(Q, axis=1)    # maximum expected reward for each state as calculated in Q table
+                if num_states == 0 or np.max(np.abs(q_vals - V)) < self.conv_limit:
+                    break   # found convergence must stop
+                # Since i have not converged, i set new V(s)
+                actions = np.argmax(Q, axis=1)
+                V = q_vals
+                iteration += 1
+            backups = (iteration + 1) * num_states
+        elif method == 'gauss-seidel':
+            iteration, backups = self._gauss_seidel(compiled, V)
+        elif method == 'prioritized':
+            iteration, backups = self._prioritized_sweeping(compiled, V)
+        else:
+            raise ValueError('Unknown value iteration method: {}'.format(method))
+        if method != 'jacobi':
+            Q = compiled.backup(V, self.gamma)
+            actions = np.argmax(Q, axis=1)
+
+        for i, state in enumerate(compiled.states):
+            self.V[state] = [V[i], actions[i]]
+            self.Q[state] = list(Q[i])
+        stats = {
+            'method': method,
+            'states': num_states,
+            'iterations': iteration,
+            'sweeps': backups / max(1, num_states),
+            'backups': backups,
+            'time': time.perf_counter() - start,
+        }
+        print('\nState space has {} different states'.format(len(self.V)))
+        print('Value iteration converged after {} iterations'.format(iteration))
+        print('{} backups in {:.3f}s'.format(backups, stats['time']))
+        return stats
+
+    def _gauss_seidel(self, compiled, V, block_size=32):
+        # The states are added before the states that follow them, so sweeping them
+        # backwards uses the new values of the later states. The backups are done by
+        # blocks of states so that each one is still a sparse mat-vec.
+        A = compiled.num_actions
+        blocks = []
+        for end in range(len(V), 0, -block_size):
+            ids = np.arange(max(0, end - block_size), end)
+            rows = (ids[:, None] * A + np.arange(A)).ravel()
+            blocks.append((ids, compiled.matrix[rows], compiled.rewards[rows]))
         iteration = 0
-        for state in self.P:
-                self.V[state] = [0,0]
         while True:
-            for state in self.P:
-                self.Q[state] = [0,0,0,0]
-            for state in self.P:
-                for action in self.P[state]:
-                    for item in self.P[state][action][0].items(): # for every next state after current state obs taking certain action 
-                        prob_next_st, rew_next_st, ctr = item[1]    
-                        nxt_st = item[0]
-                        self.Q[state][action] += prob_next_st * (rew_next_st + self.gamma * self.V[nxt_st][0])
-            ll = list(self.Q.values())  # list of lists with Q values of each action per state
-            q_vals = np.max(ll, axis = 1)    #maximum expected reward for each state as calculated in Q table
-            v_vals = [item[0] for item in list(self.V.values())]    # list of rewards in V 
-            if np.max(np.abs(np.subtract(q_vals,v_vals))) < self.conv_limit:
-                # converged
-                print('\nState space has {} different states'.format(len(self.V)))
-                print('Value iteration converged after {} iterations'.format(iteration))
-                break   # found convergence must stop
-            # Since i have not converged, i set new V(s)
-            q_vals_ind = np.argmax(ll, axis = 1)    # index of action which provides the maximum expected reward for each state as calculated in Q table
-            for i, st in enumerate(self.Q):         # Setting V value for each state
-                self.V[st][1] = q_vals_ind[i]       # action that provides maximum expected reward when at state st
-                self.V[st][0] = q_vals[i]           # maximum expected reward when at state st
+            delta = 0
+            for ids, matrix, rewards in blocks:
+                values = np.max((rewards + self.gamma * (matrix @ V)).reshape(-1, A), axis=1)
+                delta = max(delta, np.max(np.abs(values - V[ids])))
+                V[ids] = values
             iteration += 1
-
+            if delta < self.conv_limit:
+                # The last sweep only confirmed the convergence
+                return iteration - 1, iteration * len(V)
+
+    def _prioritized_sweeping(self, compiled, V):
+        predecessors = compiled.predecessors()
+        errors = np.abs(np.max(compiled.backup(V, self.gamma), axis=1) - V)
+        queue = [(-error, i) for i, error in enumerate(errors) if error >= self.conv_limit]
+        heapq.heapify(queue)
+        backups = len(V)
+        while queue:
+            error, i = heapq.heappop(queue)
+            if -error != errors[i]:
+                continue    # a newer entry of the state is in the queue
+            V[i] = np.max(compiled.backup_state(i, V, self.gamma))
+            errors[i] = 0
+            backups += 1
+            for j in predecessors[i]:
+                error = abs(np.max(compiled.backup_state(j, V, self.gamma)) - V[j])
+                backups += 1
+                if error != errors[j]:
+                    errors[j] = error
+                    if error >= self.conv_limit:
+                        heapq.heappush(queue, (-error, j))
+        return int(np.ceil(backups / max(1, len(V)))), backups
 
     def learn_env(self):
         ''' Play games to learn the enviroment
@@ -165,27 +412,12 @@ class ValueIterAgent:
                     else:
                         self.update_P(next_state, legal_actions)    # to record the last state into dicts
                     
-                    # iterate in P to set reward of next state
-                    # a state must give same reward in value iteration whenever it shows up
-                    # for state in self.P:
-                    #     for act in state:
-                    for state in self.P:
-                        for act in self.P[state]:
-                            if next_state in self.P[state][act][0].keys():
-                                self.P[state][act][0][next_state][1] = (self.P[state][act][0][next_state][1] + q) / 2     # q_new = (q_old + q) / 2
+                    # set reward of next state on the edges that lead to it
+                    self.model.update_reward(next_state, q)
 
                 self.env.step_back()
-                
-                self.P[obs][action][1] +=1  #took action when in state obs one more time
-                if next_state not in self.P[obs][action][0].keys() and terminal:   #next state first time recorded for current state and it is terminal
-                    self.P[obs][action][0][next_state] = [0, q, 1] #prob of next state, reward for this state, times visited this state 
-                elif next_state not in self.P[obs][action][0].keys() and not terminal:
-                    self.P[obs][action][0][next_state] = [0, 0, 1]
-                else:   # I have visited again next state, after current state obs
-                    self.P[obs][action][0][next_state][2] += 1 
-                
-                for i in self.P[obs][action][0]:    #calculate again probabilities of each recorded next state when in current state obs and taken certain action
-                    self.P[obs][action][0][i][0] = self.P[obs][action][0][i][2] / self.P[obs][action][1]    #times visited next state/sum of all visits
+
+                self.model.record(obs, action, next_state, q, terminal)
 
             return q, obs, False
 
@@ -216,7 +448,7 @@ class ValueIterAgent:
             probs (list): The list of action probabilities
         '''
 
-        obs, legal_actions = str(state['raw_obs']), list(state['legal_actions'].keys())
+        obs, legal_actions = self.encoder.find(state['raw_obs']), list(state['legal_actions'].keys())
         if obs not in self.V:
             # self.random_choices += 1
             return self.step(state), {}
@@ -252,18 +484,9 @@ class ValueIterAgent:
         For State Space P:
             1) add new state and actions for it, or
             2) update list of legal actions for existing state (add actions that are not already in the list)
-                    
+
         '''
-        # if existing state
-        if obs in self.P.keys():
-            for action in legal_actions:            # check all listed actions that can be done in this state
-                if action not in self.P[obs].keys():    # if any not listed in P so far add it
-                    # initialize now will change later
-                    #self.P[obs][action] = [[0,0,0,0]]   # {next_st: [prob_next_st, rew_next_st, num_visited_next_st]}
-                    self.P[obs][action] =[{},0] # so far zero times 
-        else:
-            for action in legal_actions:
-                self.P[obs][action] =[{},0] # so far zero times 
+        self.model.add_state(obs, legal_actions)
 
     
     def get_state(self, player_id):
@@ -274,11 +497,11 @@ class ValueIterAgent:
 
         Returns:
             (tuple) that contains:
-                state (str): The state str
+                state (int): The interned id of the raw observation
                 legal_actions (list): Indices of legal actions
         '''
         state = self.env.get_state(player_id)
         # return state['obs'].tostring(), list(state['legal_actions'].keys())
-        return str(state['raw_obs']), list(state['legal_actions'].keys())
+        return self.encoder.intern(state['raw_obs']), list(state['legal_actions'].keys())
 
 
@@ -0,0 +1,358 @@
+import math
+import itertools
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.games.leducholdem.dealer import LeducholdemDealer
+from rlcard.games.newlimitholdem.dealer import NewLimitHoldemDealer
+
+VARIANTS = ('cfr', 'cfr+', 'linear')
+
+
+class LeducCards(object):
+    ''' Card access of LeducholdemGame: one hand card each and one public card
+    '''
+    num_public = 1
+
+    @staticmethod
+    def deck(game):
+        return LeducholdemDealer(np.random.RandomState(0)).deck
+
+    @staticmethod
+    def get_cards(game):
+        return [player.hand for player in game.players], game.public_card
+
+    @staticmethod
+    def set_cards(game, hands, public_cards):
+        for player, hand in zip(game.players, hands):
+            player.hand = hand
+        game.public_card = public_cards
+
+    @staticmethod
+    def board(public_cards):
+        return public_cards[0] if public_cards else None
+
+
+class NewLimitCards(object):
+    ''' Card access of NewLimitHoldemGame: one hand card each and two public cards
+    '''
+    num_public = 2
+
+    @staticmethod
+    def deck(game):
+        return NewLimitHoldemDealer(np.random.RandomState(0), game.card_encoding).deck
+
+    @staticmethod
+    def get_cards(game):
+        return [player.hand for player in game.players], game.public_cards
+
+    @staticmethod
+    def set_cards(game, hands, public_cards):
+        for player, hand in zip(game.players, hands):
+            player.hand = hand
+        game.public_cards = public_cards
+
+    @staticmethod
+    def board(public_cards):
+        return list(public_cards)
+
+
+CARD_ACCESS = {
+    'leduc-holdem': LeducCards,
+    'new-limit-holdem': NewLimitCards,
+}
+
+
+class VectorizedCFRAgent(CFRAgent):
+    ''' Full-tree CFR, CFR+ and linear CFR for leduc-holdem and new-limit-holdem
+
+    The betting of these games does not depend on the cards, so the betting tree is
+    walked once with step/step_back and every node keeps the infoset ids of all the
+    hand cards (and boards after the public cards), the terminal payoffs and the
+    showdown outcomes of all deals. An iteration then sweeps the tree with arrays over
+    the hand cards and boards instead of sampling a deal. The infosets are the
+    state_str of CFRAgent, so eval_step, save and load work as for CFRAgent.
+    '''
+
+    def __init__(self, env, model_path='./vectorized_cfr_model', variant='cfr'):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class of leduc-holdem or new-limit-holdem with allow_step_back
+            model_path (str): The directory of the saved model
+            variant (str): 'cfr', 'cfr+' (regrets floored at zero, alternating updates and
+                linear averaging) or 'linear' (regrets and average policy weighted by the iteration)
+        '''
+        if env.name not in CARD_ACCESS:
+            raise ValueError('VectorizedCFRAgent supports {}, not {}'.format(list(CARD_ACCESS), env.name))
+        if variant not in VARIANTS:
+            raise ValueError('Unknown CFR variant: {}'.format(variant))
+        super().__init__(env, model_path)
+        self.variant = variant
+        self.cards = CARD_ACCESS[env.name]
+        self.roots = None
+
+    def train(self):
+        ''' Do one iteration of CFR over all the deals
+        '''
+        if self.roots is None:
+            self.build_tree()
+        self.iteration += 1
+        weight = 1.0 if self.variant == 'cfr' else float(self.iteration)
+
+        for player_id in range(self.env.num_players):
+            regret_deltas = np.zeros_like(self.table['regrets'])
+            policy_deltas = np.zeros_like(self.table['average_policy'])
+            for root in self.roots:
+                reaches = [np.ones(self.num_cards) for _ in range(self.env.num_players)]
+                self.traverse(root, reaches, player_id, (regret_deltas, policy_deltas))
+
+            if self.variant == 'cfr+':
+                np.maximum(self.table['regrets'] + regret_deltas, 0, out=self.table['regrets'])
+            else:
+                self.table['regrets'][:] += weight * regret_deltas
+            self.table['average_policy'][:] += weight * policy_deltas
+
+            # CFR+ lets the second player respond to the updated policy of the first
+            if self.variant == 'cfr+':
+                self.update_policy()
+
+        if self.variant != 'cfr+':
+            self.update_policy()
+
+    def get_expected_payoffs(self, field='average_policy'):
+        ''' Compute the exact expected payoffs when both players follow a policy
+
+        Args:
+            field (str): 'policy' or 'average_policy'
+
+        Returns:
+            (numpy.array): The expected payoff of each player
+        '''
+        if self.roots is None:
+            self.build_tree()
+        payoffs = np.zeros(self.env.num_players)
+        for player_id in range(self.env.num_players):
+            for root in self.roots:
+                reaches = [np.ones(self.num_cards) for _ in range(self.env.num_players)]
+                payoffs[player_id] += self.traverse(root, reaches, player_id, field=field).sum()
+        return payoffs
+
+    def get_exploitability(self, field='average_policy'):
+        ''' Compute how much best responses win against a policy on average
+
+        The best responses see the betting history, so this is an upper bound when
+        several histories share a state_str.
+
+        Args:
+            field (str): 'policy' or 'average_policy'
+
+        Returns:
+            (float): The average over the players of the best response payoff
+        '''
+        if self.roots is None:
+            self.build_tree()
+        total = 0.0
+        for player_id in range(self.env.num_players):
+            for root in self.roots:
+                reaches = [np.ones(self.num_cards) for _ in range(self.env.num_players)]
+                total += self.traverse(root, reaches, player_id, field=field, best_response=True).sum()
+        return total / self.env.num_players
+
+    def traverse(self, node, reaches, player_id, deltas=None, field='policy', best_response=False):
+        ''' Compute the counterfactual values of a player below a node
+
+        Args:
+            node (dict): The tree node
+            reaches (list): The reach probabilities of each player, (num_cards,) arrays
+                before the public cards and (num_boards, num_cards) arrays after them
+            player_id (int): The player whose values are computed
+            deltas (tuple): The regret and average policy deltas to add to, None to only evaluate
+            field (str): The policy followed, 'policy' or 'average_policy'
+            best_response (boolean): True to let player_id play a best response instead
+
+        Returns:
+            (numpy.array): The counterfactual values of each hand card (and board)
+        '''
+        kind = node['type']
+        if kind == 'fold':
+            opponent = reaches[1 - player_id]
+            values = opponent.sum(axis=-1, keepdims=True) - opponent
+            if node['shown']:
+                values = values * self.compatible
+            return node['scale'] * node['payoffs'][player_id] * values
+
+        if kind == 'showdown':
+            outcomes = self.outcomes[player_id]
+            return node['scale'] * node['stake'] * np.einsum('bhk,bk->bh', outcomes, reaches[1 - player_id])
+
+        if kind == 'chance':
+            values = self.traverse(node['child'], [reach * self.compatible for reach in reaches],
+                                   player_id, deltas, field, best_response)
+            return values.sum(axis=0)
+
+        player = node['player']
+        strategy = self.node_strategy(node, field)
+        values = []
+        for i, child in enumerate(node['children']):
+            child_reaches = list(reaches)
+            child_reaches[player] = reaches[player] * strategy[..., i]
+            values.append(self.traverse(child, child_reaches, player_id, deltas, field, best_response))
+        values = np.stack(values, axis=-1)
+
+        if player != player_id:
+            return values.sum(axis=-1)
+        if best_response:
+            return values.max(axis=-1)
+
+        value = (strategy * values).sum(axis=-1)
+        if deltas is not None:
+            regret_deltas, policy_deltas = deltas
+            regrets = (values - value[..., None]).reshape(-1, len(node['legal_actions']))
+            policies = (reaches[player][..., None] * strategy).reshape(-1, len(node['legal_actions']))
+            unique, inverse = node['unique'], node['inverse']
+            for i, action in enumerate(node['legal_actions']):
+                regret_deltas[unique, action] += np.bincount(inverse, regrets[:, i], minlength=len(unique))
+                policy_deltas[unique, action] += np.bincount(inverse, policies[:, i], minlength=len(unique))
+        return value
+
+    def node_strategy(self, node, field='policy'):
+        ''' The action probabilities of every hand card (and board) at a decision node
+
+        Returns:
+            (numpy.array): (..., len(legal_actions)) probabilities renormalized over the legal actions
+        '''
+        probs = self.table.arrays[field][node['ids']][..., node['legal_actions']]
+        total = probs.sum(axis=-1, keepdims=True)
+        uniform = np.full_like(probs, 1.0 / len(node['legal_actions']))
+        return np.divide(probs, total, out=uniform, where=total > 0)
+
+    def build_tree(self):
+        ''' Walk the betting tree of every opening and register all the infosets
+        '''
+        game = self.env.game
+        self.deck = sorted(self.cards.deck(game), key=str)
+        self.num_cards = len(self.deck)
+        self.boards = list(itertools.permutations(range(self.num_cards), self.cards.num_public))
+        self.compatible = np.array([[card not in board for card in range(self.num_cards)] for board in self.boards])
+
+        # Every opening and deal of two hand cards and a board has the same probability
+        openings = self._find_openings()
+        self.boards_per_deal = math.perm(self.num_cards - 2, self.cards.num_public)
+        self.deal_prob = 1.0 / (len(openings) * self.num_cards * (self.num_cards - 1) * self.boards_per_deal)
+        self.outcomes = None
+
+        random_state = game.np_random
+        self.roots = []
+        for seed in openings:
+            game.np_random = np.random.RandomState(seed)
+            self.env.reset()
+            game.np_random = random_state
+            self.roots.append(self._build_node())
+        self.update_policy()
+
+    def _find_openings(self):
+        ''' Find one seed for each distinct first player and blinds of the game
+        '''
+        game = self.env.game
+        random_state = game.np_random
+        openings = {}
+        for seed in range(100):
+            game.np_random = np.random.RandomState(seed)
+            self.env.reset()
+            opening = (game.game_pointer, tuple(player.in_chips for player in game.players))
+            openings.setdefault(opening, seed)
+        game.np_random = random_state
+        return sorted(openings.values())
+
+    def _build_node(self):
+        game = self.env.game
+        if self.env.is_over():
+            if any(player.status == 'folded' for player in game.players):
+                # Before the public cards the values are summed over the boards up front
+                shown = self._public_shown()
+                scale = self.deal_prob * (1 if shown else self.boards_per_deal)
+                return {'type': 'fold', 'shown': shown, 'scale': scale, 'payoffs': np.array(self.env.get_payoffs())}
+            return {'type': 'showdown', 'scale': self.deal_prob, 'stake': self._showdown_stake()}
+
+        player = self.env.get_player_id()
+        legal_actions = list(self.env.get_state(player)['legal_actions'].keys())
+        node = {'type': 'decision', 'player': player, 'legal_actions': legal_actions, 'children': []}
+        node['ids'] = self._infoset_ids(player)
+        flat = node['ids'].ravel()
+        node['unique'], node['inverse'] = np.unique(flat, return_inverse=True)
+
+        shown = self._public_shown()
+        for action in legal_actions:
+            self.env.step(action)
+            child = self._build_node()
+            if not shown and self._public_shown():
+                child = {'type': 'chance', 'child': child}
+            node['children'].append(child)
+            self.env.step_back()
+        return node
+
+    def _public_shown(self):
+        _, public_cards = self.cards.get_cards(self.env.game)
+        return bool(public_cards)
+
+    def _infoset_ids(self, player):
+        ''' Register the state_str of the player for every hand card (and board)
+
+        Returns:
+            (numpy.array): (num_cards,) ids before the public cards, (num_boards, num_cards) after
+        '''
+        game = self.env.game
+        hands, public_cards = self.cards.get_cards(game)
+        single = not isinstance(hands[player], list)
+        deal = lambda card: self.deck[card] if single else [self.deck[card]]
+
+        def infoset_id(card):
+            new_hands = list(hands)
+            new_hands[player] = deal(card)
+            self.cards.set_cards(game, new_hands, public)
+            return self.table.get_id(self.env.get_state(player)['obs'].tostring())
+
+        if not public_cards:
+            public = public_cards
+            ids = np.array([infoset_id(card) for card in range(self.num_cards)])
+        else:
+            ids = np.zeros((len(self.boards), self.num_cards), dtype=int)
+            for b, board in enumerate(self.boards):
+                public = self.cards.board([self.deck[card] for card in board])
+                for card in range(self.num_cards):
+                    if self.compatible[b, card]:
+                        ids[b, card] = infoset_id(card)
+            # The hand cards on the board are never reached, give them any id of the board
+            ids[~self.compatible] = ids[self.compatible][0]
+        self.cards.set_cards(game, hands, public_cards)
+        return ids
+
+    def _showdown_stake(self):
+        ''' The payoff of player 0 when winning at this showdown node, computing the
+        outcomes of all the deals at the first showdown
+        '''
+        game = self.env.game
+        hands, public_cards = self.cards.get_cards(game)
+        single = not isinstance(hands[0], list)
+        deal = lambda card: self.deck[card] if single else [self.deck[card]]
+
+        def payoff(first, second, board):
+            public = self.cards.board([self.deck[card] for card in board])
+            self.cards.set_cards(game, [deal(first), deal(second)], public)
+            return self.env.get_payoffs()[0]
+
+        if self.outcomes is None:
+            outcomes = np.zeros((len(self.boards), self.num_cards, self.num_cards))
+            for b, board in enumerate(self.boards):
+                for first, second in itertools.combinations(range(self.num_cards), 2):
+                    if first not in board and second not in board:
+                        outcomes[b, first, second] = np.sign(payoff(first, second, board))
+            # Swapping the hand cards swaps the winner
+            outcomes -= outcomes.transpose(0, 2, 1)
+            # Values of player 0 by (board, own card, opponent card) and the same for player 1
+            self.outcomes = [outcomes, -outcomes.transpose(0, 2, 1)]
+        b, first, second = np.argwhere(self.outcomes[0] > 0)[0]
+        stake = payoff(first, second, self.boards[b])
+        self.cards.set_cards(game, hands, public_cards)
+        return stake
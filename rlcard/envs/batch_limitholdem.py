@@ -0,0 +1,148 @@
+import json
+import os
+import numpy as np
+
+import rlcard
+from rlcard.games.limitholdem.batch_game import BatchLimitHoldemGame, ACTIONS
+from rlcard.games.limitholdem.cards import CARD_STRINGS
+
+# Card tensor plane of each public card: flop, turn and river
+PUBLIC_CARD_PLANES = [1, 1, 1, 2, 3]
+
+# Rows of the action tensor for each betting round
+ACTIONS_PER_ROUND = 6
+
+
+class BatchLimitholdemEnv:
+    ''' Batched counterpart of LimitholdemEnv
+
+    Plays B games of BatchLimitHoldemGame and keeps their observations in preallocated
+    arrays: a (B, 2, 6, 4, 13) card tensor per player and a (B, 24, 3, 4) action tensor
+    per game, encoded as LimitholdemEnv._extract_state with actions recorded as step2 does.
+    '''
+
+    def __init__(self, batch_size, seed=None):
+        ''' Initialize the batched Limitholdem environment
+
+        Args:
+            batch_size (int): The number of games played at once
+            seed (int): A local random seed
+        '''
+        self.name = 'limit-holdem'
+        self.batch_size = batch_size
+        self.game = BatchLimitHoldemGame(batch_size)
+        self.actions = ACTIONS
+        self.num_players = self.game.get_num_players()
+        self.num_actions = self.game.get_num_actions()
+        self.seed(seed)
+
+        with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
+            card2index = json.load(file)
+        indexes = np.array([card2index[card] for card in CARD_STRINGS])
+        self.card_suits = indexes // 13
+        self.card_ranks = indexes % 13
+
+        self.card_tensors = np.zeros((batch_size, self.num_players, 6, 4, 13), dtype=np.float32)
+        self.action_tensor = np.zeros((batch_size, 24, 3, 4), dtype=np.float32)
+        self.cont_actions = np.zeros(batch_size, dtype=int)
+        self.num_shown = np.zeros(batch_size, dtype=int)
+        self._batch = np.arange(batch_size)
+
+    def seed(self, seed=None):
+        self.game.np_random = np.random.RandomState(seed)
+        return seed
+
+    def reset(self, **kwargs):
+        ''' Start a new game in every row
+
+        Args:
+            kwargs: The optional cards and blinds of BatchLimitHoldemGame.init_game
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The states of the current players
+                (numpy.array): The ids of the current players
+        '''
+        player_id = self.game.init_game(**kwargs)
+        self.card_tensors[:] = 0
+        self.action_tensor[:] = 0
+        self.cont_actions[:] = 0
+        self.num_shown[:] = 0
+        for player in range(self.num_players):
+            for i in range(2):
+                self._set_cards(self.game.hands[:, player, i], self._batch, [player], [0, 5])
+        return self.get_state(), player_id
+
+    def step(self, actions):
+        ''' Take one action in every game that is not over
+
+        Args:
+            actions (numpy.array): (B,) legal action ids, ignored for the finished games
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The next states of the current players
+                (numpy.array): The ids of the next players
+        '''
+        actions = np.asarray(actions)
+        rows = np.nonzero(~self.game.is_over())[0]
+        legal = self.game.get_legal_actions()[rows]
+        round_counter = self.game.round_counter[rows].copy()
+        pointer = self.game.game_pointer[rows]
+
+        player_id = self.game.step(actions)
+
+        # Record the action and the legal actions of the player in the row of this action
+        index = round_counter * ACTIONS_PER_ROUND + self.cont_actions[rows]
+        self.action_tensor[rows, index, pointer, actions[rows]] = 1
+        self.action_tensor[rows, index, 2] = legal
+        self.cont_actions[rows] = np.where(self.game.round_counter[rows] != round_counter, 0, self.cont_actions[rows] + 1)
+
+        # Show the public cards that were dealt by this step
+        for i in range(5):
+            dealt = rows[(self.num_shown[rows] <= i) & (self.game.num_public_cards[rows] > i)]
+            if len(dealt) > 0:
+                self._set_cards(self.game.board[dealt, i], dealt, range(self.num_players), [PUBLIC_CARD_PLANES[i], 4, 5])
+        self.num_shown[rows] = self.game.num_public_cards[rows]
+
+        return self.get_state(), player_id
+
+    def _set_cards(self, card_ids, rows, players, planes):
+        ''' Set one card per row in the card tensors of the players
+        '''
+        suits = self.card_suits[card_ids]
+        ranks = self.card_ranks[card_ids]
+        for player in players:
+            for plane in planes:
+                self.card_tensors[rows, player, plane, suits, ranks] = 1
+
+    def get_state(self):
+        ''' Get the observations of the current players
+
+        Returns:
+            (dict): 'card_tensor' (B, 6, 4, 13) and 'action_tensor' (B, 24, 3, 4) copies of the
+                observations and 'legal_actions' (B, 4) booleans
+        '''
+        return {
+            'card_tensor': self.card_tensors[self._batch, self.game.game_pointer],
+            'action_tensor': self.action_tensor.copy(),
+            'legal_actions': self.game.get_legal_actions(),
+        }
+
+    def is_over(self):
+        ''' Check which games are over
+
+        Returns:
+            (numpy.array): (B,) booleans, True if the game is over
+        '''
+        return self.game.is_over()
+
+    def get_payoffs(self):
+        ''' Get the payoffs of the games
+
+        Returns:
+            (numpy.array): (B, 2) payoffs of each player
+        '''
+        return self.game.get_payoffs()
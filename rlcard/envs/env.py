@@ -59,7 +59,12 @@ class Env(object):
                 (numpy.array): The begining state of the game
                 (int): The begining player
         '''
-        state, player_id = self.game.init_game(starter, agent, hcard, pcard1, pcard2, opcard)
+        setup = (starter, agent, hcard, pcard1, pcard2, opcard)
+        if any(arg is not None for arg in setup):
+            state, player_id = self.game.init_game(*setup)
+        else:
+            # Games without a preset deal only take no arguments
+            state, player_id = self.game.init_game()
         self.action_recorder = []
         return self._extract_state(state), player_id
 
@@ -125,6 +130,9 @@ class Env(object):
 
         if not self.game.step_back():
             return False
+        # Forget the undone action, limit-holdem encodes the recorded actions in its state
+        if self.action_recorder:
+            self.action_recorder.pop()
 
         player_id = self.get_player_id()
         state = self.get_state(player_id)
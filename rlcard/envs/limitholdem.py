@@ -6,9 +6,13 @@ from collections import OrderedDict
 import rlcard
 from rlcard.envs import Env
 from rlcard.games.limitholdem import Game
+from rlcard.games.limitholdem.cards import CARD_STRINGS, card_index
 
 DEFAULT_GAME_CONFIG = {
         'game_num_players': 2,
+        'game_step_back_mode': 'undo',
+        'game_card_encoding': 'str',
+        'game_hand_evaluator': 'hand',
         }
 
 class LimitholdemEnv(Env):
@@ -36,6 +40,12 @@ class LimitholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # Card lookup of _extract_state, indexed by card id with the 'int' card encoding
+        if self.game.card_encoding == 'int':
+            self.card_lookup = [self.card2index.get(card) for card in CARD_STRINGS]
+        else:
+            self.card_lookup = self.card2index
+
     def _get_legal_actions(self):
         ''' Get all legal actions
 
@@ -66,7 +76,7 @@ class LimitholdemEnv(Env):
         cards = public_cards + hand
 
         for card in hand:
-            idx = self.card2index[card]
+            idx = self.card_lookup[card]
             suit = int(idx / 13)
             rank = idx % 13
             card_tensor[0][suit][rank] = 1
@@ -81,14 +91,14 @@ class LimitholdemEnv(Env):
                     z = 2
                 elif i == 5:
                     z = 3
-                idx = self.card2index[card]
+                idx = self.card_lookup[card]
                 suit = int(idx / 13)
                 rank = idx % 13
                 card_tensor[z][suit][rank] = 1
                 card_tensor[4][suit][rank] = 1
 
         for card in cards:
-            idx = self.card2index[card]
+            idx = self.card_lookup[card]
             suit = int(idx / 13)
             rank = idx % 13
             card_tensor[5][suit][rank] = 1
@@ -306,8 +316,8 @@ class LimitholdemEnv(Env):
         '''
         state = {}
         state['chips'] = [self.game.players[i].in_chips for i in range(self.num_players)]
-        state['public_card'] = [c.get_index() for c in self.game.public_cards] if self.game.public_cards else None
-        state['hand_cards'] = [[c.get_index() for c in self.game.players[i].hand] for i in range(self.num_players)]
+        state['public_card'] = [card_index(c) for c in self.game.public_cards] if self.game.public_cards else None
+        state['hand_cards'] = [[card_index(c) for c in self.game.players[i].hand] for i in range(self.num_players)]
         state['current_player'] = self.game.game_pointer
         state['legal_actions'] = self.game.get_legal_actions()
         return state
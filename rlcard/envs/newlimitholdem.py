@@ -6,9 +6,13 @@ from collections import OrderedDict
 import rlcard
 from rlcard.envs import Env
 from rlcard.games.newlimitholdem import Game
+from rlcard.games.limitholdem.cards import CARD_STRINGS, card_index
 
 DEFAULT_GAME_CONFIG = {
         'game_num_players': 2,
+        'game_step_back_mode': 'undo',
+        'game_card_encoding': 'str',
+        'game_hand_evaluator': 'table',
         }
 
 class NewLimitholdemEnv(Env):
@@ -29,6 +33,12 @@ class NewLimitholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/newlimitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # Card lookup of _extract_state, indexed by card id with the 'int' card encoding
+        if self.game.card_encoding == 'int':
+            self.card_lookup = [self.card2index.get(card) for card in CARD_STRINGS]
+        else:
+            self.card_lookup = self.card2index
+
     def _get_legal_actions(self):
         ''' Get all legal actions
 
@@ -56,11 +66,11 @@ class NewLimitholdemEnv(Env):
         hand = state['hand']
 
         obs = np.zeros(32)
-        idx = [self.card2index[card] for card in hand]
+        idx = [self.card_lookup[card] for card in hand]
         obs[idx] = 1
         idx2 = []
         for j, card in enumerate(public_cards):
-            idx2 = [(self.card2index[card] + 5*j)]
+            idx2 = [(self.card_lookup[card] + 5*j)]
             obs[idx2] = 1
         obs[state['my_chips'] + 15] = 1
         obs[sum(state['all_chips']) - state['my_chips'] + 21] = 1
@@ -114,8 +124,8 @@ class NewLimitholdemEnv(Env):
         '''
         state = {}
         state['chips'] = [self.game.players[i].in_chips for i in range(self.num_players)]
-        state['public_card'] = [c.get_index() for c in self.game.public_cards] if self.game.public_cards else None
-        state['hand_cards'] = [[c.get_index() for c in self.game.players[i].hand] for i in range(self.num_players)]
+        state['public_card'] = [card_index(c) for c in self.game.public_cards] if self.game.public_cards else None
+        state['hand_cards'] = [[card_index(c) for c in self.game.players[i].hand] for i in range(self.num_players)]
         state['current_player'] = self.game.game_pointer
         state['legal_actions'] = self.game.get_legal_actions()
         return state
@@ -149,4 +159,4 @@ class NewLimitholdemEnv(Env):
         '''Get the card of player
         '''
         card = self.game.op_hand(player_id)
-        return card.rank
+        return card_index(card)[1]
@@ -7,11 +7,15 @@ import rlcard
 from rlcard.envs import Env
 from rlcard.games.nolimitholdem import Game
 from rlcard.games.nolimitholdem.round import Action
+from rlcard.games.limitholdem.cards import CARD_STRINGS, card_index
 
 DEFAULT_GAME_CONFIG = {
         'game_num_players': 2,
         'chips_for_each': 100,
         'dealer_id': None,
+        'game_step_back_mode': 'undo',
+        'game_card_encoding': 'str',
+        'game_hand_evaluator': 'hand',
         }
 
 class NolimitholdemEnv(Env):
@@ -34,6 +38,12 @@ class NolimitholdemEnv(Env):
         with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # Card lookup of _extract_state, indexed by card id with the 'int' card encoding
+        if self.game.card_encoding == 'int':
+            self.card_lookup = [self.card2index.get(card) for card in CARD_STRINGS]
+        else:
+            self.card_lookup = self.card2index
+
     def _get_legal_actions(self):
         ''' Get all leagal actions
 
@@ -63,7 +73,7 @@ class NolimitholdemEnv(Env):
         my_chips = state['my_chips']
         all_chips = state['all_chips']
         cards = public_cards + hand
-        idx = [self.card2index[card] for card in cards]
+        idx = [self.card_lookup[card] for card in cards]
         obs = np.zeros(54)
         obs[idx] = 1
         obs[52] = float(my_chips)
@@ -110,8 +120,8 @@ class NolimitholdemEnv(Env):
         '''
         state = {}
         state['chips'] = [self.game.players[i].in_chips for i in range(self.num_players)]
-        state['public_card'] = [c.get_index() for c in self.game.public_cards] if self.game.public_cards else None
-        state['hand_cards'] = [[c.get_index() for c in self.game.players[i].hand] for i in range(self.num_players)]
+        state['public_card'] = [card_index(c) for c in self.game.public_cards] if self.game.public_cards else None
+        state['hand_cards'] = [[card_index(c) for c in self.game.players[i].hand] for i in range(self.num_players)]
         state['current_player'] = self.game.game_pointer
         state['legal_actions'] = self.game.get_legal_actions()
         return state
@@ -0,0 +1,201 @@
+import traceback
+import multiprocessing as mp
+import numpy as np
+
+from rlcard.envs.registration import make
+
+
+def _worker(remote, parent_remote, env_id, config, index, buffers, obs_specs):
+    ''' Run one environment and answer the commands of VecEnv
+
+    The observations of the current player are written to row `index` of the shared
+    buffers, everything else is sent back through the pipe.
+    '''
+    parent_remote.close()
+    obs = {key: np.frombuffer(buffers[key], dtype=dtype).reshape((-1,) + shape)
+           for key, (shape, dtype) in obs_specs.items()}
+    try:
+        env = make(env_id, config)
+        # step2 keeps the round of every action for the envs that encode it
+        use_step2 = hasattr(env.game, 'round_counter')
+    except Exception:
+        remote.send(('error', traceback.format_exc()))
+        remote.close()
+        return
+
+    def write(state):
+        for key in obs:
+            obs[key][index] = state[key]
+        legal = np.zeros(env.num_actions, dtype=bool)
+        legal[list(state['legal_actions'])] = True
+        return legal
+
+    state = None
+    while True:
+        try:
+            cmd, data = remote.recv()
+        except EOFError:
+            break
+        try:
+            if cmd == 'reset':
+                state, player_id = env.reset()
+                remote.send(('ok', (player_id, write(state))))
+            elif cmd == 'step':
+                action, raw_action = data
+                if use_step2:
+                    state, player_id = env.step2(action, list(state['legal_actions'].keys()), raw_action)
+                else:
+                    state, player_id = env.step(action, raw_action)
+                done = env.is_over()
+                payoffs = None
+                if done:
+                    payoffs = env.get_payoffs()
+                    state, player_id = env.reset()
+                remote.send(('ok', (player_id, write(state), done, payoffs)))
+            elif cmd == 'get_raw_state':
+                remote.send(('ok', state))
+            elif cmd == 'close':
+                break
+            else:
+                raise ValueError('Unknown command: {}'.format(cmd))
+        except Exception:
+            remote.send(('error', traceback.format_exc()))
+    remote.close()
+
+
+class VecEnv(object):
+    ''' Run K copies of a registered environment in worker processes
+
+    Every worker owns one environment made with rlcard.make and the seed of worker i is
+    the config seed plus i. The array observations of the current players are written
+    to shared memory and returned stacked as (K, ...) arrays, together with a (K, num_actions)
+    legal action mask, in the layout of BatchLimitholdemEnv.get_state. Games that end
+    in a step are reset by their worker right away.
+    '''
+
+    def __init__(self, env_id, num_envs, config={}, start_method=None):
+        ''' Start the workers
+
+        Args:
+            env_id (string): The name of the environment
+            num_envs (int): The number of environments K
+            config (dict): The config of the environments as in rlcard.make
+            start_method (string): The multiprocessing start method, the platform default if None
+        '''
+        self.env_id = env_id
+        self.num_envs = num_envs
+        self.closed = False
+
+        # Find the array observations and the sizes of the game in a local copy
+        probe = make(env_id, config)
+        state, _ = probe.reset()
+        self.num_players = probe.num_players
+        self.num_actions = probe.num_actions
+        self.obs_specs = {key: (value.shape, value.dtype) for key, value in state.items()
+                          if isinstance(value, np.ndarray)}
+
+        ctx = mp.get_context(start_method)
+        self._buffers = {}
+        self._obs = {}
+        for key, (shape, dtype) in self.obs_specs.items():
+            size = num_envs * int(np.prod(shape))
+            self._buffers[key] = ctx.RawArray(np.ctypeslib.as_ctypes_type(dtype), size)
+            self._obs[key] = np.frombuffer(self._buffers[key], dtype=dtype).reshape((num_envs,) + shape)
+
+        seed = config.get('seed')
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(num_envs)])
+        self.processes = []
+        for index, (remote, work_remote) in enumerate(zip(self.remotes, work_remotes)):
+            worker_config = dict(config, seed=None if seed is None else seed + index)
+            process = ctx.Process(target=_worker,
+                                  args=(work_remote, remote, env_id, worker_config, index, self._buffers, self.obs_specs),
+                                  daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+    def _send(self, cmd, data=None):
+        for i, remote in enumerate(self.remotes):
+            remote.send((cmd, data[i] if data is not None else None))
+
+    def _receive(self):
+        # Read every answer before raising so that the pipes stay in sync
+        answers = [remote.recv() for remote in self.remotes]
+        for status, result in answers:
+            if status == 'error':
+                raise RuntimeError('VecEnv worker failed:\n{}'.format(result))
+        return [result for _, result in answers]
+
+    def _get_state(self, legal_actions):
+        states = {key: obs.copy() for key, obs in self._obs.items()}
+        states['legal_actions'] = np.array(legal_actions)
+        return states
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The stacked array observations of the current players and
+                    'legal_actions' (K, num_actions) booleans
+                (numpy.array): (K,) ids of the current players
+        '''
+        self._send('reset')
+        player_ids, legal_actions = zip(*self._receive())
+        return self._get_state(legal_actions), np.array(player_ids)
+
+    def step(self, actions, raw_action=False):
+        ''' Take one action in every environment, the finished games start over
+
+        Args:
+            actions (list): K actions, one for the current player of each environment
+            raw_action (boolean): True if the actions are raw actions
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The stacked states as in reset, the first states of the new games
+                    for the environments that finished
+                (numpy.array): (K,) ids of the current players
+                (numpy.array): (K, num_players) payoffs of the finished games, zeros elsewhere
+                (numpy.array): (K,) booleans, True if the game finished in this step
+        '''
+        self._send('step', [(action, raw_action) for action in actions])
+        player_ids, legal_actions, dones, payoffs = zip(*self._receive())
+        stacked_payoffs = np.zeros((self.num_envs, self.num_players))
+        for i, payoff in enumerate(payoffs):
+            if payoff is not None:
+                stacked_payoffs[i] = payoff
+        return self._get_state(legal_actions), np.array(player_ids), stacked_payoffs, np.array(dones)
+
+    def get_raw_states(self):
+        ''' Get the full states of the current players, e.g. for the agents with use_raw
+
+        Returns:
+            (list): The K extracted states of the environments
+        '''
+        self._send('get_raw_state')
+        return self._receive()
+
+    def close(self):
+        ''' Stop the workers
+        '''
+        if self.closed:
+            return
+        for remote in self.remotes:
+            try:
+                remote.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self.processes:
+            process.join()
+        for remote in self.remotes:
+            remote.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,228 @@
+import numpy as np
+
+from rlcard.games.limitholdem.game import LimitHoldemGame
+from rlcard.games.limitholdem.evaluator import evaluate_hands
+
+# Action ids in the order of LimitholdemEnv.actions
+ACTIONS = ['call', 'raise', 'fold', 'check']
+CALL, RAISE, FOLD, CHECK = range(4)
+
+# Number of public cards shown after each betting round
+NUM_PUBLIC_CARDS = [3, 4, 5, 5]
+
+
+class BatchLimitHoldemGame:
+    """Play many two-player limit texas holdem games in lockstep with NumPy arrays
+
+    Row b of every array belongs to game b. The betting follows LimitHoldemRound with
+    the blinds, raise amount and allowed number of raises of LimitHoldemGame, and
+    cards are card ids as with the 'int' card encoding.
+    """
+
+    def __init__(self, batch_size):
+        """Initialize the batch of games
+
+        Args:
+            batch_size (int): The number of games played at once
+        """
+        self.batch_size = batch_size
+        self.np_random = np.random.RandomState()
+
+        # The rules of the single game
+        game = LimitHoldemGame()
+        self.num_players = 2
+        self.small_blind = game.small_blind
+        self.big_blind = game.big_blind
+        self.raise_amount = game.raise_amount
+        self.allowed_raise_num = game.allowed_raise_num
+
+        self.hands = None
+        self.board = None
+        self.num_public_cards = None
+        self.in_chips = None
+        self.raised = None
+        self.folded = None
+        self.game_pointer = None
+        self.round_counter = None
+        self.round_raise_amount = None
+        self.have_raised = None
+        self.not_raise_num = None
+        self.history_raise_nums = None
+        self._batch = np.arange(batch_size)
+
+    def init_game(self, hands=None, public_cards=None, small_blind=None):
+        """
+        Start a new game in every row
+
+        Args:
+            hands (numpy.array): Optional (B, 2, 2) card ids of the hand cards of each player
+            public_cards (numpy.array): Optional (B, 5) card ids of the public cards in dealing order
+            small_blind (numpy.array): Optional (B,) ids of the small blind players
+
+        Cards and blinds that are not given are drawn with np_random.
+
+        Returns:
+            (numpy.array): The ids of the current players
+        """
+        if hands is None or public_cards is None:
+            # The given cards sort after all the others, so the drawn cards never repeat them
+            keys = self.np_random.rand(self.batch_size, 52)
+            for cards in (hands, public_cards):
+                if cards is not None:
+                    keys[self._batch[:, np.newaxis], np.asarray(cards).reshape(self.batch_size, -1)] = 2
+            deck = keys.argsort(axis=1)
+        self.hands = deck[:, :4].reshape(-1, 2, 2) if hands is None else np.array(hands)
+        self.board = deck[:, 4:9].copy() if public_cards is None else np.array(public_cards)
+        self.num_public_cards = np.zeros(self.batch_size, dtype=int)
+
+        if small_blind is None:
+            small_blind = self.np_random.randint(0, self.num_players, size=self.batch_size)
+        small_blind = np.array(small_blind)
+        self.in_chips = np.zeros((self.batch_size, self.num_players), dtype=int)
+        self.in_chips[self._batch, small_blind] = self.small_blind
+        self.in_chips[self._batch, 1 - small_blind] = self.big_blind
+        self.raised = self.in_chips.copy()
+        self.folded = np.zeros((self.batch_size, self.num_players), dtype=bool)
+
+        # The player next to the big blind plays first
+        self.game_pointer = small_blind.copy()
+
+        self.round_counter = np.zeros(self.batch_size, dtype=int)
+        self.round_raise_amount = np.full(self.batch_size, self.raise_amount)
+        self.have_raised = np.zeros(self.batch_size, dtype=int)
+        self.not_raise_num = np.zeros(self.batch_size, dtype=int)
+        self.history_raise_nums = np.zeros((self.batch_size, 4), dtype=int)
+
+        return self.game_pointer.copy()
+
+    def get_public_cards(self, game):
+        """
+        Return the public cards shown in one game
+
+        Args:
+            game (int): The row of the game
+
+        Returns:
+            (list): The card ids of the public cards
+        """
+        return list(self.board[game, :self.num_public_cards[game]])
+
+    def get_legal_actions(self):
+        """
+        Return the legal actions of the current players
+
+        Returns:
+            (numpy.array): (B, 4) booleans, True where the action id is legal in the game
+        """
+        current = self.raised[self._batch, self.game_pointer]
+        highest = self.raised.max(axis=1)
+        legal = np.empty((self.batch_size, len(ACTIONS)), dtype=bool)
+        legal[:, CALL] = current < highest
+        legal[:, RAISE] = self.have_raised < self.allowed_raise_num
+        legal[:, FOLD] = True
+        legal[:, CHECK] = current >= highest
+        return legal
+
+    def step(self, actions):
+        """
+        Take one action in every game that is not over
+
+        Args:
+            actions (numpy.array): (B,) action ids, the entries of finished games are ignored
+
+        Returns:
+            (numpy.array): The ids of the next players
+        """
+        actions = np.asarray(actions)
+        active = ~self.is_over()
+        legal = self.get_legal_actions()[self._batch, np.where(active, actions, 0)]
+        if not legal[active].all():
+            game = np.nonzero(active & ~legal)[0][0]
+            raise Exception('{} is not legal action in game {}. Legal actions: {}'.format(
+                ACTIONS[actions[game]], game, [a for a, ok in zip(ACTIONS, self.get_legal_actions()[game]) if ok]))
+
+        rows = np.nonzero(active)[0]
+        actions = actions[rows]
+        pointer = self.game_pointer[rows]
+        highest = self.raised[rows].max(axis=1)
+
+        # Call and raise bring the player to the highest bet, a raise adds the raise amount on top
+        bet = (actions == CALL) | (actions == RAISE)
+        target = highest + np.where(actions == RAISE, self.round_raise_amount[rows], 0)
+        diff = np.where(bet, target - self.raised[rows, pointer], 0)
+        self.raised[rows, pointer] += diff
+        self.in_chips[rows, pointer] += diff
+
+        self.have_raised[rows] += actions == RAISE
+        self.not_raise_num[rows] = np.where(actions == RAISE, 1, self.not_raise_num[rows] + (actions != FOLD))
+        self.folded[rows, pointer] |= actions == FOLD
+
+        # With two players the other player is always next, a fold ends the game
+        self.game_pointer[rows] = 1 - pointer
+        self.history_raise_nums[rows, self.round_counter[rows]] = self.have_raised[rows]
+
+        # Finish the rounds in which every player agreed not to raise, deal the public cards
+        # and double the raise amount for the last two rounds
+        ended = rows[self.not_raise_num[rows] >= self.num_players]
+        self.num_public_cards[ended] = np.take(NUM_PUBLIC_CARDS, self.round_counter[ended])
+        self.round_raise_amount[ended[self.round_counter[ended] == 1]] = 2 * self.raise_amount
+        self.round_counter[ended] += 1
+        self.have_raised[ended] = 0
+        self.not_raise_num[ended] = 0
+        self.raised[ended] = 0
+
+        return self.game_pointer.copy()
+
+    def is_over(self):
+        """
+        Check which games are over
+
+        Returns:
+            (numpy.array): (B,) booleans, True if the game is over
+        """
+        return self.folded.any(axis=1) | (self.round_counter >= 4)
+
+    def get_payoffs(self):
+        """
+        Return the payoffs of the games, only meaningful for the games that are over
+
+        Returns:
+            (numpy.array): (B, 2) payoffs of each player in big blinds
+        """
+        cards = np.concatenate([self.hands, np.repeat(self.board[:, None, :], self.num_players, axis=1)], axis=2)
+        strengths = evaluate_hands(cards.reshape(-1, 7)).reshape(-1, self.num_players)
+        # 1 if the player wins, -1 if the player loses and 0 for a draw
+        result = np.sign(strengths - strengths[:, ::-1])
+        folded = self.folded.any(axis=1)
+        result[folded] = np.where(self.folded[folded], -1, 1)
+        won = np.where(result > 0, self.in_chips[:, ::-1], 0)
+        lost = np.where(result < 0, self.in_chips, 0)
+        return (won - lost) / self.big_blind
+
+    def get_num_players(self):
+        """
+        Return the number of players in each game
+
+        Returns:
+            (int): The number of players in the game
+        """
+        return self.num_players
+
+    @staticmethod
+    def get_num_actions():
+        """
+        Return the number of applicable actions
+
+        Returns:
+            (int): The number of actions. There are 4 actions (call, raise, check and fold)
+        """
+        return len(ACTIONS)
+
+    def get_player_id(self):
+        """
+        Return the current players' ids
+
+        Returns:
+            (numpy.array): (B,) current player ids
+        """
+        return self.game_pointer.copy()
@@ -0,0 +1,65 @@
+"""Integer card encoding for the hold'em games
+
+With the 'int' card encoding the hold'em games deal plain card ids instead of Card
+objects. A card id is suit_index * 13 + rank_index with suits and ranks ordered as in
+init_standard_deck, so the ids are the values of games/limitholdem/card2index.json.
+"""
+from rlcard.games.base import Card
+
+SUITS = 'SHDC'
+RANKS = 'A23456789TJQK'
+
+# Card id -> index string of the card, e.g. 0 -> 'SA', 51 -> 'CK'
+CARD_STRINGS = tuple(suit + rank for suit in SUITS for rank in RANKS)
+
+# Index string of the card -> card id
+CARD_IDS = {card: card_id for card_id, card in enumerate(CARD_STRINGS)}
+
+
+def card_to_id(card):
+    '''
+    Get the id of a card
+    Args:
+        card (Card or str): a Card object or an index string such as 'SA'
+    Returns:
+        (int): the card id
+    '''
+    if isinstance(card, Card):
+        card = card.get_index()
+    return CARD_IDS[card]
+
+
+def id_to_card(card_id):
+    '''
+    Get the Card object of a card id
+    Args:
+        card_id (int): the card id
+    Returns:
+        (Card): the card
+    '''
+    return Card(SUITS[card_id // 13], RANKS[card_id % 13])
+
+
+def card_index(card):
+    '''
+    Get the index string of a card in either encoding
+    Args:
+        card (Card or int): a Card object or a card id
+    Returns:
+        (str): the index string of the card, e.g. 'SA'
+    '''
+    if isinstance(card, int):
+        return CARD_STRINGS[card]
+    return card.get_index()
+
+
+def card_strings(cards):
+    '''
+    Convert the cards of a state to index strings, strings are left as they are
+    Args:
+        cards (list): card ids or index strings
+    Returns:
+        (list): index strings of the cards
+    '''
+    return [CARD_STRINGS[card] if isinstance(card, int) else card for card in cards]
+
@@ -1,10 +1,13 @@
 from rlcard.utils.utils import init_standard_deck
+from rlcard.games.limitholdem.cards import card_to_id
 
 
 class LimitHoldemDealer:
-    def __init__(self, np_random):
+    def __init__(self, np_random, card_encoding='str'):
         self.np_random = np_random
         self.deck = init_standard_deck()
+        if card_encoding == 'int':
+            self.deck = [card_to_id(card) for card in self.deck]
         self.shuffle()
         self.pot = 0
 
@@ -16,6 +19,6 @@ class LimitHoldemDealer:
         Deal one card from the deck
 
         Returns:
-            (Card): The drawn card from the deck
+            (Card or int): The drawn card from the deck, a card id with the 'int' card encoding
         """
         return self.deck.pop()
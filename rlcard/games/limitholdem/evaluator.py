@@ -0,0 +1,217 @@
+"""Lookup-table hand evaluator for texas holdem
+
+Every hand of 5 to 7 cards is mapped to one integer strength, a stronger hand has a
+greater strength and equal hands have the same strength. The strength is
+category << 20 followed by up to five 4-bit rank values (2 is 0 and A is 12) that
+break ties inside the category, with the categories numbered as in utils.Hand
+(1: high card ... 9: straight flush).
+
+Two tables are precomputed on first use:
+    RANK_TABLE: the strength of every multiset of 5 to 7 ranks ignoring suits,
+        keyed by the sum of 5 ** rank_value over the cards
+    FLUSH_TABLE: the best flush or straight flush of every 13-bit mask of ranks
+
+Evaluating a hand is then a sum over the cards and one lookup, in FLUSH_TABLE when
+five cards share a suit and in RANK_TABLE otherwise.
+"""
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from rlcard.games.limitholdem.cards import CARD_IDS
+
+HIGH_CARD, ONE_PAIR, TWO_PAIRS, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(1, 10)
+
+# Rank value of every card id, card ids order ranks as 'A23456789TJQK'
+RANK_VALUES = tuple((card_id % 13 + 12) % 13 for card_id in range(52))
+
+# Per card key: the rank digit in base 5 in the low 32 bits and one count per suit in 4-bit fields above
+SUIT_SHIFT = 32
+CARD_KEYS = tuple(5 ** RANK_VALUES[card_id] + (1 << (SUIT_SHIFT + 4 * (card_id // 13))) for card_id in range(52))
+RANK_KEY_MASK = (1 << SUIT_SHIFT) - 1
+
+# Adding 3 to a suit count sets its bit 3 exactly when the count is at least 5
+FLUSH_ADD = 0x3333
+FLUSH_TEST = 0x8888
+
+# Top rank value of each straight and the mask of its five ranks, the wheel (A2345) is 5-high
+STRAIGHTS = [(high, 0x1F << (high - 4)) for high in range(12, 3, -1)] + [(3, 0x100F)]
+
+RANK_TABLE = None
+FLUSH_TABLE = None
+
+# Array forms of the tables for evaluate_hands: the sorted keys of RANK_TABLE with their strengths
+RANK_TABLE_KEYS = None
+RANK_TABLE_STRENGTHS = None
+FLUSH_TABLE_ARRAY = None
+CARD_KEYS_ARRAY = np.array(CARD_KEYS, dtype=np.int64)
+RANK_VALUES_ARRAY = np.array(RANK_VALUES, dtype=np.int64)
+
+
+def _pack(category, rank_values):
+    '''
+    Pack a category and its tie-break rank values into a strength
+    Args:
+        category (int): the hand category
+        rank_values (list): rank values from the most to the least significant
+    Returns:
+        (int): the strength
+    '''
+    strength = category
+    for i in range(5):
+        strength = (strength << 4) | (rank_values[i] if i < len(rank_values) else 0)
+    return strength
+
+
+def _straight_high(rank_mask):
+    '''
+    Get the top rank value of the best straight in a rank mask, or -1 if there is none
+    '''
+    for high, straight_mask in STRAIGHTS:
+        if rank_mask & straight_mask == straight_mask:
+            return high
+    return -1
+
+
+def _rank_strength(counts):
+    '''
+    Get the strength of a multiset of ranks without considering flushes
+    Args:
+        counts (list): the number of cards of every rank value
+    Returns:
+        (int): the strength
+    '''
+    groups = sorted(((count, value) for value, count in enumerate(counts) if count), reverse=True)
+    values = [value for _, value in groups]
+    rank_mask = sum(1 << value for value in values)
+
+    if groups[0][0] == 4:
+        return _pack(FOUR_OF_A_KIND, [values[0], max(values[1:])])
+    if groups[0][0] == 3 and groups[1][0] >= 2:
+        # A second three of a kind plays as the pair
+        return _pack(FULL_HOUSE, [values[0], max(value for count, value in groups[1:] if count >= 2)])
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return _pack(STRAIGHT, [high])
+    if groups[0][0] == 3:
+        return _pack(THREE_OF_A_KIND, [values[0]] + sorted(values[1:], reverse=True)[:2])
+    if groups[0][0] == 2 and groups[1][0] == 2:
+        # With three pairs the lowest pair can still provide the kicker
+        return _pack(TWO_PAIRS, [values[0], values[1], max(values[2:])])
+    if groups[0][0] == 2:
+        return _pack(ONE_PAIR, [values[0]] + values[1:4])
+    return _pack(HIGH_CARD, values[:5])
+
+
+def _flush_strength(rank_mask):
+    '''
+    Get the strength of the best flush in the ranks of one suit
+    Args:
+        rank_mask (int): the 13-bit mask of the rank values of the suit
+    Returns:
+        (int): the strength, 0 if there are less than five ranks
+    '''
+    values = [value for value in range(12, -1, -1) if rank_mask >> value & 1]
+    if len(values) < 5:
+        return 0
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return _pack(STRAIGHT_FLUSH, [high])
+    return _pack(FLUSH, values[:5])
+
+
+def build_tables():
+    '''
+    Build RANK_TABLE and FLUSH_TABLE, called on the first evaluation
+    '''
+    global RANK_TABLE, FLUSH_TABLE, RANK_TABLE_KEYS, RANK_TABLE_STRENGTHS, FLUSH_TABLE_ARRAY
+    rank_table = {}
+    for num_cards in (5, 6, 7):
+        for values in combinations_with_replacement(range(13), num_cards):
+            counts = [0] * 13
+            for value in values:
+                counts[value] += 1
+            if max(counts) > 4:
+                continue
+            rank_table[sum(5 ** value for value in values)] = _rank_strength(counts)
+    FLUSH_TABLE = [_flush_strength(rank_mask) for rank_mask in range(1 << 13)]
+    keys = sorted(rank_table)
+    RANK_TABLE_KEYS = np.array(keys, dtype=np.int64)
+    RANK_TABLE_STRENGTHS = np.array([rank_table[key] for key in keys], dtype=np.int64)
+    FLUSH_TABLE_ARRAY = np.array(FLUSH_TABLE, dtype=np.int64)
+    RANK_TABLE = rank_table
+
+
+def evaluate_hand(card_ids):
+    '''
+    Get the strength of the best five cards among 5 to 7 cards
+    Args:
+        card_ids (list): the card ids, see cards.py
+    Returns:
+        (int): the strength, greater is better
+    '''
+    if RANK_TABLE is None:
+        build_tables()
+    key = 0
+    for card_id in card_ids:
+        key += CARD_KEYS[card_id]
+    flush = ((key >> SUIT_SHIFT) + FLUSH_ADD) & FLUSH_TEST
+    if flush:
+        # Seven cards with a flush are too few for a full house or four of a kind
+        suit = (flush.bit_length() - 4) // 4
+        rank_mask = 0
+        for card_id in card_ids:
+            if card_id // 13 == suit:
+                rank_mask |= 1 << RANK_VALUES[card_id]
+        return FLUSH_TABLE[rank_mask]
+    return RANK_TABLE[key & RANK_KEY_MASK]
+
+
+def evaluate_hands(card_ids):
+    '''
+    Get the strengths of many hands at once, the array version of evaluate_hand
+    Args:
+        card_ids (numpy.array): (N, num_cards) card ids with 5 to 7 cards per hand
+    Returns:
+        (numpy.array): (N,) strengths
+    '''
+    if RANK_TABLE is None:
+        build_tables()
+    card_ids = np.asarray(card_ids)
+    keys = CARD_KEYS_ARRAY[card_ids].sum(axis=1)
+    strengths = RANK_TABLE_STRENGTHS[np.searchsorted(RANK_TABLE_KEYS, keys & RANK_KEY_MASK)]
+    flush = ((keys >> SUIT_SHIFT) + FLUSH_ADD) & FLUSH_TEST
+    rows = np.nonzero(flush)[0]
+    if len(rows) > 0:
+        # Only one suit can reach five cards, flush has the single bit 4 * suit + 3 set
+        suits = (np.log2(flush[rows]).astype(np.int64) - 3) // 4
+        cards = card_ids[rows]
+        rank_bits = np.where(cards // 13 == suits[:, None], 1 << RANK_VALUES_ARRAY[cards], 0)
+        strengths[rows] = FLUSH_TABLE_ARRAY[rank_bits.sum(axis=1)]
+    return strengths
+
+
+def get_category(strength):
+    '''
+    Get the hand category of a strength, numbered as utils.Hand.category
+    '''
+    return strength >> 20
+
+
+def compare_hands(hands):
+    '''
+    Compare the hands of the players with the lookup tables
+    Args:
+        hands (list): for every player a list of card ids or index strings such as 'SA',
+            or None if the player folded
+    Returns:
+        (list): 1 for the players with the best hand and 0 for the others, as utils.compare_hands
+    '''
+    if sum(hand is not None for hand in hands) == 1:
+        # Everyone else folded, the cards need not be complete
+        return [0 if hand is None else 1 for hand in hands]
+    strengths = [-1 if hand is None else
+                 evaluate_hand([CARD_IDS[card] if isinstance(card, str) else card for card in hand])
+                 for hand in hands]
+    best = max(strengths)
+    return [1 if strength == best else 0 for strength in strengths]
@@ -5,6 +5,7 @@ from rlcard.games.limitholdem import Dealer
 from rlcard.games.limitholdem import Player, PlayerStatus
 from rlcard.games.limitholdem import Judger
 from rlcard.games.limitholdem import Round
+from rlcard.games.limitholdem.journal import record_step, undo_step
 
 
 class LimitHoldemGame:
@@ -26,6 +27,16 @@ class LimitHoldemGame:
 
         self.num_players = num_players
 
+        # How step_back restores the previous state: 'undo' journals the small per-step
+        # changes and reverses them in place, 'snapshot' deepcopies the whole game
+        self.step_back_mode = 'undo'
+
+        # How cards are dealt: 'str' uses Card objects, 'int' uses card ids (see limitholdem/cards.py)
+        self.card_encoding = 'str'
+
+        # How showdowns are evaluated: 'hand' uses utils.Hand, 'table' the lookup tables of evaluator.py
+        self.hand_evaluator = 'hand'
+
         # Save betting history
         self.history_raise_nums = [0 for _ in range(4)]
 
@@ -42,6 +53,9 @@ class LimitHoldemGame:
     def configure(self, game_config):
         """Specify some game specific parameters, such as number of players"""
         self.num_players = game_config['game_num_players']
+        self.step_back_mode = game_config['game_step_back_mode']
+        self.card_encoding = game_config['game_card_encoding']
+        self.hand_evaluator = game_config['game_hand_evaluator']
 
     def init_game(self, starter=None, agent=None, hcard=None, pcard1=None, pcard2=None, opcard=None):
         """
@@ -56,14 +70,14 @@ class LimitHoldemGame:
                 (int): Current player's id
         """
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.card_encoding)
 
         # Initialize two players to play the game
-        self.players = [Player(i, self.np_random) for i in range(self.num_players)]
+        self.players = [Player(i, self.np_random, self.card_encoding) for i in range(self.num_players)]
 
 
         # Initialize a judger class which will decide who wins in the end
-        self.judger = Judger(self.np_random)
+        self.judger = Judger(self.np_random, self.card_encoding, self.hand_evaluator)
 
         # Deal cards to each  player to prepare for the first round
         for i in range(2 * self.num_players):
@@ -116,7 +130,10 @@ class LimitHoldemGame:
                 (dict): next player's state
                 (int): next player id
         """
-        if self.allow_step_back:
+        if self.allow_step_back and self.step_back_mode == 'undo':
+            # Only journal what this step can change
+            self.history.append(record_step(self))
+        elif self.allow_step_back:
             # First snapshot the current state
             r = deepcopy(self.round)
             b = self.game_pointer
@@ -164,8 +181,11 @@ class LimitHoldemGame:
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
-                self.players, self.history_raises_nums = self.history.pop()
+            if self.step_back_mode == 'undo':
+                undo_step(self, self.history.pop())
+            else:
+                self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
+                    self.players, self.history_raise_nums = self.history.pop()
             return True
         return False
 
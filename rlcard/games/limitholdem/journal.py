@@ -0,0 +1,56 @@
+"""Undo journal shared by the hold'em games for step_back"""
+
+# Game attributes that a single step may reassign
+GAME_FIELDS = ('game_pointer', 'round_counter', 'stage')
+
+
+def record_step(game):
+    """
+    Record the part of a hold'em game that the next step can change
+
+    A betting step only reassigns counters of the game and the round, the chips
+    and status of the players and, when a round ends, draws public cards from the
+    top of the deck. These are kept as shallow copies and the deck is only
+    remembered by its size, so the cost does not depend on the number of cards.
+
+    Args:
+        game (object): A hold'em game with round, players, dealer and public_cards
+
+    Returns:
+        (tuple): The record that undo_step needs to reverse the step
+    """
+    game_state = {name: game.__dict__[name] for name in GAME_FIELDS if name in game.__dict__}
+    raise_nums = getattr(game, 'history_raise_nums', None)
+    if raise_nums is not None:
+        raise_nums = list(raise_nums)
+    round_state = game.round.__dict__.copy()
+    round_state['raised'] = list(game.round.raised)
+    player_states = [player.__dict__.copy() for player in game.players]
+    return (game_state, raise_nums, round_state, player_states,
+            game.dealer.pot, len(game.public_cards), len(game.dealer.deck))
+
+
+def undo_step(game, record):
+    """
+    Reverse one step of a hold'em game in place
+
+    Args:
+        game (object): The game that was stepped
+        record (tuple): The record returned by record_step before the step
+    """
+    game_state, raise_nums, round_state, player_states, pot, num_public_cards, deck_size = record
+
+    # Put the dealt cards back on top of the deck in the order they were drawn
+    dealt = game.public_cards[num_public_cards:]
+    del game.public_cards[num_public_cards:]
+    num_drawn = deck_size - len(game.dealer.deck)
+    if num_drawn > 0:
+        game.dealer.deck.extend(reversed(dealt[-num_drawn:]))
+    game.dealer.pot = pot
+
+    game.__dict__.update(game_state)
+    if raise_nums is not None:
+        game.history_raise_nums = raise_nums
+    game.round.__dict__.update(round_state)
+    for player, player_state in zip(game.players, player_states):
+        player.__dict__.update(player_state)
@@ -5,8 +5,10 @@ import numpy as np
 class LimitHoldemJudger:
     """The Judger class for limit texas holdem"""
 
-    def __init__(self, np_random):
+    def __init__(self, np_random, card_encoding='str', hand_evaluator='hand'):
         self.np_random = np_random
+        self.card_encoding = card_encoding
+        self.hand_evaluator = hand_evaluator
 
     def judge_game(self, players, hands):
         """
@@ -20,9 +22,14 @@ class LimitHoldemJudger:
             (list): Each entry of the list corresponds to one entry of the
         """
         # Convert the hands into card indexes
-        hands = [[card.get_index() for card in hand] if hand is not None else None for hand in hands]
+        hand_evaluator = self.hand_evaluator
+        if self.card_encoding == 'int':
+            # Card ids go to the lookup tables as they are, only strings are parsed by Hand
+            hand_evaluator = 'table'
+        else:
+            hands = [[card.get_index() for card in hand] if hand is not None else None for hand in hands]
 
-        winners = compare_hands(hands)
+        winners = compare_hands(hands, hand_evaluator)
 
         in_chips = [p.in_chips for p in players]
         each_win = self.split_pots_among_players(in_chips, winners)
@@ -1,5 +1,7 @@
 import numpy as np
 
+from rlcard.games.limitholdem import evaluator
+
 class Hand:
     def __init__(self, all_cards):
         self.all_cards = all_cards # two hand cards + five public cards
@@ -549,12 +551,14 @@ def determine_winner_four_of_a_kind(hands, all_players, potential_winner_index):
             all_players[potential_winner_index[i]] = 1
     return all_players
 
-def compare_hands(hands):
+def compare_hands(hands, backend='hand'):
     '''
     Compare all palyer's all seven cards
     Args:
         hands(list): cards of those players with same highest hand_catagory.
         e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
+        backend(str): 'hand' evaluates with the Hand class, 'table' with the lookup tables of evaluator.py,
+        which also accepts card ids
     Returns:
         [0, 1, 0]: player1 wins
         [1, 0, 0]: player0 wins
@@ -566,6 +570,8 @@ def compare_hands(hands):
     elif hands[1] == None:
         return [1, 0]
     '''
+    if backend == 'table':
+        return evaluator.compare_hands(hands)
     hand_category = [] #such as high_card, straight_flush, etc
     all_players = [0]*len(hands) #all the players in this round, 0 for losing and 1 for winning or draw
     if None in hands:
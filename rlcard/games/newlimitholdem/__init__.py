@@ -3,4 +3,5 @@ from rlcard.games.newlimitholdem.judger import NewLimitHoldemJudger as Judger
 from rlcard.games.newlimitholdem.player import NewLimitHoldemPlayer as Player
 from rlcard.games.newlimitholdem.player import PlayerStatus
 from rlcard.games.newlimitholdem.round import NewLimitHoldemRound as Round
-from rlcard.games.newlimitholdem.game import NewLimitHoldemGame as Game
\ No newline at end of file
+from rlcard.games.newlimitholdem.game import NewLimitHoldemGame as Game
+from rlcard.games.newlimitholdem.batch_game import BatchNewLimitHoldemGame as BatchGame
@@ -0,0 +1,254 @@
+import json
+import os
+import numpy as np
+
+import rlcard
+from rlcard.games.newlimitholdem.game import NewLimitHoldemGame
+from rlcard.games.newlimitholdem.showdown import DECK_STRINGS, get_showdown_table
+from rlcard.games.limitholdem.cards import CARD_IDS
+
+# Action ids in the order of NewLimitholdemEnv.actions
+ACTIONS = ['call', 'raise', 'fold', 'check']
+CALL, RAISE, FOLD, CHECK = range(4)
+
+# Card ids of the 20 card deck and the deck position of every card id (-1 outside the deck)
+DECK_IDS = np.array([CARD_IDS[card] for card in DECK_STRINGS])
+DECK_POSITIONS = np.full(52, -1)
+DECK_POSITIONS[DECK_IDS] = np.arange(len(DECK_IDS))
+
+
+class BatchNewLimitHoldemGame:
+    """Play many two-player new limit holdem games in lockstep with NumPy arrays
+
+    Row b of every array belongs to game b. The betting follows NewLimitHoldemRound
+    with the ante, raise amount and allowed number of actions of NewLimitHoldemGame,
+    and cards are card ids as with the 'int' card encoding.
+    """
+
+    def __init__(self, batch_size):
+        """Initialize the batch of games
+
+        Args:
+            batch_size (int): The number of games played at once
+        """
+        self.batch_size = batch_size
+        self.np_random = np.random.RandomState()
+
+        # The rules of the single game
+        game = NewLimitHoldemGame()
+        self.num_players = 2
+        self.ante = game.ante
+        self.raise_amount = game.raise_amount
+        self.allowed_action_num = game.allowed_action_num
+
+        # Observation index of every card id as in NewLimitholdemEnv
+        with open(os.path.join(rlcard.__path__[0], 'games/newlimitholdem/card2index.json'), 'r') as file:
+            card2index = json.load(file)
+        self.card_obs_index = np.zeros(52, dtype=int)
+        for card, index in card2index.items():
+            self.card_obs_index[CARD_IDS[card]] = index
+
+        self.hands = None
+        self.board = None
+        self.public_cards = None
+        self.in_chips = None
+        self.raised = None
+        self.folded = None
+        self.game_pointer = None
+        self.first = None
+        self.round_counter = None
+        self.have_raised = None
+        self.action_taken = None
+        self.not_raise_num = None
+        self.history_raise_nums = None
+
+    def init_game(self, hands=None, public_cards=None, game_pointer=None):
+        """
+        Start a new game in every row
+
+        Args:
+            hands (numpy.array): Optional (B, 2) card ids of the hand card of each player
+            public_cards (numpy.array): Optional (B, 2) card ids of the public cards
+            game_pointer (numpy.array): Optional (B,) ids of the players that play first
+
+        Cards and first players that are not given are drawn with np_random.
+
+        Returns:
+            (numpy.array): The ids of the current players
+        """
+        batch = np.arange(self.batch_size)
+        if hands is None or public_cards is None:
+            # The given cards sort after all the others, so the drawn cards never repeat them
+            keys = self.np_random.rand(self.batch_size, len(DECK_IDS))
+            for cards in (hands, public_cards):
+                if cards is not None:
+                    keys[batch[:, np.newaxis], DECK_POSITIONS[np.asarray(cards)]] = 2
+            deck = DECK_IDS[keys.argsort(axis=1)]
+        self.hands = deck[:, :2].copy() if hands is None else np.array(hands)
+        self.board = deck[:, 2:4].copy() if public_cards is None else np.array(public_cards)
+        self.public_cards = np.full((self.batch_size, 2), -1)
+
+        if game_pointer is None:
+            game_pointer = self.np_random.randint(0, self.num_players, size=self.batch_size)
+        self.game_pointer = np.array(game_pointer)
+        self.first = self.game_pointer.copy()
+
+        # Both players put in the ante, it also counts as raised in the first round
+        self.in_chips = np.full((self.batch_size, self.num_players), self.ante)
+        self.raised = self.in_chips.copy()
+        self.folded = np.zeros((self.batch_size, self.num_players), dtype=bool)
+
+        self.round_counter = np.zeros(self.batch_size, dtype=int)
+        self.have_raised = np.zeros(self.batch_size, dtype=int)
+        self.action_taken = np.zeros(self.batch_size, dtype=int)
+        self.not_raise_num = np.zeros(self.batch_size, dtype=int)
+        self.history_raise_nums = np.zeros((self.batch_size, 2), dtype=int)
+        self._batch = batch
+
+        return self.game_pointer.copy()
+
+    def get_legal_actions(self):
+        """
+        Return the legal actions of the current players
+
+        Returns:
+            (numpy.array): (B, 4) booleans, True where the action id is legal in the game
+        """
+        current = self.raised[self._batch, self.game_pointer]
+        other = self.raised[self._batch, 1 - self.game_pointer]
+        highest = self.raised.max(axis=1)
+        legal = np.empty((self.batch_size, len(ACTIONS)), dtype=bool)
+        legal[:, CALL] = current < highest
+        legal[:, RAISE] = self.action_taken < self.allowed_action_num
+        legal[:, FOLD] = current != other
+        legal[:, CHECK] = current >= highest
+        return legal
+
+    def step(self, actions):
+        """
+        Take one action in every game that is not over
+
+        Args:
+            actions (numpy.array): (B,) action ids, the entries of finished games are ignored
+
+        Returns:
+            (numpy.array): The ids of the next players
+        """
+        actions = np.asarray(actions)
+        active = ~self.is_over()
+        legal = self.get_legal_actions()[self._batch, np.where(active, actions, 0)]
+        if not legal[active].all():
+            game = np.nonzero(active & ~legal)[0][0]
+            raise Exception('{} is not legal action in game {}. Legal actions: {}'.format(
+                ACTIONS[actions[game]], game, [a for a, ok in zip(ACTIONS, self.get_legal_actions()[game]) if ok]))
+
+        rows = np.nonzero(active)[0]
+        actions = actions[rows]
+        pointer = self.game_pointer[rows]
+        highest = self.raised[rows].max(axis=1)
+
+        # Call and raise bring the player to the highest bet, a raise adds the raise amount on top
+        bet = (actions == CALL) | (actions == RAISE)
+        target = highest + np.where(actions == RAISE, self.raise_amount, 0)
+        diff = np.where(bet, target - self.raised[rows, pointer], 0)
+        self.raised[rows, pointer] += diff
+        self.in_chips[rows, pointer] += diff
+
+        not_fold = actions != FOLD
+        self.action_taken[rows] += not_fold
+        self.have_raised[rows] += actions == RAISE
+        self.not_raise_num[rows] = np.where(actions == RAISE, 1, self.not_raise_num[rows] + not_fold)
+        self.folded[rows, pointer] |= ~not_fold
+
+        # With two players the other player is always next, a fold ends the game
+        self.game_pointer[rows] = 1 - pointer
+        self.history_raise_nums[rows, self.round_counter[rows]] = self.have_raised[rows]
+
+        # Finish the rounds in which every player agreed not to raise
+        ended = rows[self.not_raise_num[rows] >= self.num_players]
+        first_round = ended[self.round_counter[ended] == 0]
+        self.public_cards[first_round] = self.board[first_round]
+        self.round_counter[ended] += 1
+        self.have_raised[ended] = 0
+        self.action_taken[ended] = 0
+        self.not_raise_num[ended] = 0
+        self.raised[ended] = 0
+
+        return self.game_pointer.copy()
+
+    def is_over(self):
+        """
+        Check which games are over
+
+        Returns:
+            (numpy.array): (B,) booleans, True if the game is over
+        """
+        return self.folded.any(axis=1) | (self.round_counter >= 2)
+
+    def get_payoffs(self):
+        """
+        Return the payoffs of the games, only meaningful for the games that are over
+
+        Returns:
+            (numpy.array): (B, 2) payoffs of each player
+        """
+        table = get_showdown_table()
+        positions = DECK_POSITIONS[self.board]
+        strengths = table[DECK_POSITIONS[self.hands], positions[:, :1], positions[:, 1:]]
+        # 1 if the player wins, -1 if the player loses and 0 for a draw
+        result = np.sign(strengths - strengths[:, ::-1])
+        folded = self.folded.any(axis=1)
+        result[folded] = np.where(self.folded[folded], -1, 1)
+        won = np.where(result > 0, self.in_chips[:, ::-1], 0)
+        lost = np.where(result < 0, self.in_chips, 0)
+        return (won - lost) / self.ante
+
+    def get_num_players(self):
+        """
+        Return the number of players in each game
+
+        Returns:
+            (int): The number of players in the game
+        """
+        return self.num_players
+
+    @staticmethod
+    def get_num_actions():
+        """
+        Return the number of applicable actions
+
+        Returns:
+            (int): The number of actions. There are 4 actions (call, raise, check and fold)
+        """
+        return len(ACTIONS)
+
+    def get_player_id(self):
+        """
+        Return the current players' ids
+
+        Returns:
+            (numpy.array): (B,) current player ids
+        """
+        return self.game_pointer.copy()
+
+    def get_obs(self):
+        """
+        Encode the observations of the current players as NewLimitholdemEnv._extract_state does
+
+        Returns:
+            (numpy.array): (B, 32) observations
+        """
+        rank_index = self.card_obs_index
+        batch = self._batch
+        pointer = self.game_pointer
+        obs = np.zeros((self.batch_size, 32))
+        obs[batch, rank_index[self.hands[batch, pointer]]] = 1
+        shown = self.public_cards[:, 0] >= 0
+        for j in range(2):
+            obs[batch[shown], rank_index[self.public_cards[shown, j]] + 5 * j] = 1
+        my_chips = self.in_chips[batch, pointer]
+        obs[batch, my_chips + 15] = 1
+        obs[batch, self.in_chips.sum(axis=1) - my_chips + 21] = 1
+        obs[:, 27:31] = self.get_legal_actions()
+        obs[:, 31] = self.first != pointer
+        return obs
@@ -5,6 +5,8 @@ from rlcard.games.newlimitholdem import Dealer
 from rlcard.games.newlimitholdem import Player, PlayerStatus
 from rlcard.games.newlimitholdem import Judger
 from rlcard.games.newlimitholdem import Round
+from rlcard.games.limitholdem.journal import record_step, undo_step
+from rlcard.games.limitholdem.cards import card_to_id
 
 
 class NewLimitHoldemGame:
@@ -28,6 +30,16 @@ class NewLimitHoldemGame:
 
         self.num_players = num_players
 
+        # How step_back restores the previous state: 'undo' journals the small per-step
+        # changes and reverses them in place, 'snapshot' deepcopies the whole game
+        self.step_back_mode = 'undo'
+
+        # How cards are dealt: 'str' uses Card objects, 'int' uses card ids (see limitholdem/cards.py)
+        self.card_encoding = 'str'
+
+        # How showdowns are evaluated: 'table' looks them up in showdown.py, 'hand' uses utils.Hand
+        self.hand_evaluator = 'table'
+
         # Save betting history
         self.history_raise_nums = [0 for _ in range(2)]
 
@@ -46,6 +58,9 @@ class NewLimitHoldemGame:
     def configure(self, game_config):
         """Specify some game specific parameters, such as number of players"""
         self.num_players = game_config['game_num_players']
+        self.step_back_mode = game_config['game_step_back_mode']
+        self.card_encoding = game_config['game_card_encoding']
+        self.hand_evaluator = game_config['game_hand_evaluator']
 
     def init_game(self, starter=None, agent=None, hcard=None, pcard1=None, pcard2=None, opcard=None):
         """
@@ -60,13 +75,18 @@ class NewLimitHoldemGame:
                 (int): Current player's id
         """
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.card_encoding)
 
         # Initialize two players to play the game
-        self.players = [Player(i, self.np_random) for i in range(self.num_players)]
+        self.players = [Player(i, self.np_random, self.card_encoding) for i in range(self.num_players)]
 
         # Initialize a judger class which will decide who wins in the end
-        self.judger = Judger(self.np_random)
+        self.judger = Judger(self.np_random, self.card_encoding, self.hand_evaluator)
+
+        # Given cards are Card objects, convert them to card ids for the 'int' encoding
+        if self.card_encoding == 'int':
+            hcard, pcard1, pcard2, opcard = [card if card is None else card_to_id(card)
+                                             for card in (hcard, pcard1, pcard2, opcard)]
 
         if pcard1 is not None and pcard2 is not None:
             self.pcards = []
@@ -138,7 +158,10 @@ class NewLimitHoldemGame:
                 (dict): next player's state
                 (int): next player id
         """
-        if self.allow_step_back:
+        if self.allow_step_back and self.step_back_mode == 'undo':
+            # Only journal what this step can change
+            self.history.append(record_step(self))
+        elif self.allow_step_back:
             # First snapshot the current state
             r = deepcopy(self.round)
             b = self.game_pointer
@@ -174,6 +197,8 @@ class NewLimitHoldemGame:
         return state, self.game_pointer
 
     def change_hand(self, card, player_id):
+        if self.card_encoding == 'int':
+            card = card_to_id(card)
         if not self.players[player_id].hand:
             self.players[player_id].hand.append(card)
         else:
@@ -193,8 +218,11 @@ class NewLimitHoldemGame:
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
-                self.players, self.history_raises_nums = self.history.pop()
+            if self.step_back_mode == 'undo':
+                undo_step(self, self.history.pop())
+            else:
+                self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
+                    self.players, self.history_raise_nums = self.history.pop()
             return True
         return False
 
@@ -244,6 +272,39 @@ class NewLimitHoldemGame:
 
         return state
 
+    def get_transposition_key(self):
+        """
+        Return a key of everything the rest of the game depends on
+
+        Returns:
+            (tuple): The cards, chips, statuses, pointers, round and raise counters
+        """
+        round = self.round
+        return (
+            tuple(tuple(p.hand) for p in self.players),
+            tuple(p.in_chips for p in self.players),
+            tuple(p.status for p in self.players),
+            tuple(self.public_cards),
+            self._upcoming_public_cards(),
+            self.game_pointer,
+            self.first,
+            self.round_counter,
+            tuple(self.history_raise_nums),
+            round.have_raised,
+            round.not_raise_num,
+            round.action_taken,
+            tuple(round.raised),
+            round.player_folded,
+        )
+
+    def _upcoming_public_cards(self):
+        # The public cards dealt at the end of the first round
+        if self.round_counter > 0:
+            return ()
+        if self.pcards is not None:
+            return tuple(self.pcards)
+        return tuple(self.dealer.deck[-2:])
+
     def is_over(self):
         """
         Check if the game is over
@@ -9,15 +9,17 @@ class PlayerStatus(Enum):
 
 class NewLimitHoldemPlayer:
 
-    def __init__(self, player_id, np_random):
+    def __init__(self, player_id, np_random, card_encoding='str'):
         """
         Initialize a player.
 
         Args:
             player_id (int): The id of the player
+            card_encoding (str): 'str' for Card objects or 'int' for card ids
         """
         self.np_random = np_random
         self.player_id = player_id
+        self.card_encoding = card_encoding
         self.hand = []
         self.status = PlayerStatus.ALIVE
 
@@ -35,10 +37,16 @@ class NewLimitHoldemPlayer:
         Returns:
             (dict): The state of the player
         """
+        if self.card_encoding == 'int':
+            hand = list(self.hand)
+            public_cards = list(public_cards)
+        else:
+            hand = [c.get_index() for c in self.hand]
+            public_cards = [c.get_index() for c in public_cards]
         return {
             'first': 0 if first == self.player_id else 1,
-            'hand': [c.get_index() for c in self.hand],
-            'public_cards': [c.get_index() for c in public_cards],
+            'hand': hand,
+            'public_cards': public_cards,
             'all_chips': all_chips,
             'my_chips': self.in_chips,
             'legal_actions': legal_actions
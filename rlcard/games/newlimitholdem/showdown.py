@@ -0,0 +1,110 @@
+''' Exhaustive showdown table for new limit holdem
+
+With one hand card and two public cards from the 20 card deck there are only
+20 x 20 x 20 ways to index a showdown hand. SHOWDOWN_TABLE[hand][public1][public2]
+holds the strength of every such hand as a small integer, a greater strength wins and
+equal strengths draw, in the same order as utils.compare_hands. The table is
+generated once with utils.compare_hands and cached next to this file.
+'''
+import os
+from functools import cmp_to_key
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+import rlcard
+from rlcard.games.newlimitholdem.utils import compare_hands as compare_card_strings
+from rlcard.games.limitholdem.cards import CARD_STRINGS
+
+ROOT_PATH = rlcard.__path__[0]
+TABLE_PATH = os.path.join(ROOT_PATH, 'games/newlimitholdem/showdown_table.npy')
+
+SUITS = 'SHDC'
+RANKS = 'ATJQK'
+
+# Index string of the 20 cards in the order of init_20_deck, the position is the table index
+DECK_STRINGS = tuple(suit + rank for suit in SUITS for rank in RANKS)
+
+# Card id or index string -> position of the card in the 20 card deck
+CARD_POSITIONS = {card: position for position, card in enumerate(DECK_STRINGS)}
+CARD_POSITIONS.update({CARD_STRINGS.index(card): position for position, card in enumerate(DECK_STRINGS)})
+
+SHOWDOWN_TABLE = None
+
+
+def build_showdown_table():
+    ''' Rank every multiset of three ranks with utils.compare_hands and spread the ranking
+    over all card positions
+
+    Returns:
+        (numpy.array): int8 array of shape (20, 20, 20) with the strength of each hand
+    '''
+    def compare(ranks_1, ranks_2):
+        # Any suits give the same result, the three card hands have no flushes
+        winners = compare_card_strings([[SUITS[i] + rank for i, rank in enumerate(ranks_1)],
+                                        [SUITS[i] + rank for i, rank in enumerate(ranks_2)]])
+        return winners[0] - winners[1]
+
+    ordered = sorted(combinations_with_replacement(RANKS, 3), key=cmp_to_key(compare))
+    strengths = {}
+    strength = 0
+    for i, ranks in enumerate(ordered):
+        if i > 0 and compare(ordered[i - 1], ranks) < 0:
+            strength += 1
+        strengths[ranks] = strength
+
+    table = np.zeros((20, 20, 20), dtype=np.int8)
+    for hand, public_1, public_2 in np.ndindex(table.shape):
+        ranks = sorted((DECK_STRINGS[hand][1], DECK_STRINGS[public_1][1], DECK_STRINGS[public_2][1]), key=RANKS.index)
+        table[hand, public_1, public_2] = strengths[tuple(ranks)]
+    return table
+
+
+def get_showdown_table():
+    ''' Load the showdown table, generating and caching it on disk on the first call
+
+    Returns:
+        (numpy.array): the table indexed by the card positions of the hand card and the two public cards
+    '''
+    global SHOWDOWN_TABLE
+    if SHOWDOWN_TABLE is None:
+        if os.path.isfile(TABLE_PATH):
+            SHOWDOWN_TABLE = np.load(TABLE_PATH)
+        else:
+            SHOWDOWN_TABLE = build_showdown_table()
+            try:
+                np.save(TABLE_PATH, SHOWDOWN_TABLE)
+            except OSError:
+                # A read-only install rebuilds the table in every process
+                pass
+    return SHOWDOWN_TABLE
+
+
+def get_strength(cards):
+    ''' Get the strength of one hand card and two public cards
+
+    Args:
+        cards (list): card ids or index strings, the hand card first
+
+    Returns:
+        (int): the strength, greater is better
+    '''
+    table = get_showdown_table()
+    return int(table[CARD_POSITIONS[cards[0]], CARD_POSITIONS[cards[1]], CARD_POSITIONS[cards[2]]])
+
+
+def compare_hands(hands):
+    ''' Compare the hands of the players with the showdown table
+
+    Args:
+        hands (list): for every player the hand card and the two public cards as card ids or
+            index strings, or None if the player folded
+
+    Returns:
+        (list): 1 for the players with the best hand and 0 for the others, as utils.compare_hands
+    '''
+    if sum(hand is not None for hand in hands) == 1:
+        return [0 if hand is None else 1 for hand in hands]
+    strengths = [-1 if hand is None else get_strength(hand) for hand in hands]
+    best = max(strengths)
+    return [1 if strength == best else 0 for strength in strengths]
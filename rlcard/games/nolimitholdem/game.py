@@ -4,6 +4,7 @@ import numpy as np
 from copy import deepcopy
 from rlcard.games.limitholdem import Game
 from rlcard.games.limitholdem import PlayerStatus
+from rlcard.games.limitholdem.journal import record_step, undo_step
 
 from rlcard.games.nolimitholdem import Dealer
 from rlcard.games.nolimitholdem import Player
@@ -46,6 +47,9 @@ class NolimitholdemGame(Game):
         # must have num_players length
         self.init_chips = [game_config['chips_for_each']] * game_config["game_num_players"]
         self.dealer_id = game_config['dealer_id']
+        self.step_back_mode = game_config['game_step_back_mode']
+        self.card_encoding = game_config['game_card_encoding']
+        self.hand_evaluator = game_config['game_hand_evaluator']
 
     def init_game(self):
         """
@@ -63,13 +67,14 @@ class NolimitholdemGame(Game):
             self.dealer_id = self.np_random.randint(0, self.num_players)
 
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.card_encoding)
 
         # Initialize players to play the game
-        self.players = [Player(i, self.init_chips[i], self.np_random) for i in range(self.num_players)]
+        self.players = [Player(i, self.init_chips[i], self.np_random, self.card_encoding)
+                        for i in range(self.num_players)]
 
         # Initialize a judger class which will decide who wins in the end
-        self.judger = Judger(self.np_random)
+        self.judger = Judger(self.np_random, self.card_encoding, self.hand_evaluator)
 
         # Deal cards to each  player to prepare for the first round
         for i in range(2 * self.num_players):
@@ -132,7 +137,10 @@ class NolimitholdemGame(Game):
             print(self.get_state(self.game_pointer))
             raise Exception('Action not allowed')
 
-        if self.allow_step_back:
+        if self.allow_step_back and self.step_back_mode == 'undo':
+            # Only journal what this step can change
+            self.history.append(record_step(self))
+        elif self.allow_step_back:
             # First snapshot the current state
             r = deepcopy(self.round)
             b = self.game_pointer
@@ -216,7 +224,12 @@ class NolimitholdemGame(Game):
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
+            if self.step_back_mode == 'undo':
+                undo_step(self, self.history.pop())
+            else:
+                self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
+                # The round was copied together with its own dealer, share the restored one again
+                self.round.dealer = self.dealer
             self.stage = Stage(self.round_counter)
             return True
         return False
@@ -2,15 +2,16 @@ from rlcard.games.limitholdem import Player
 
 
 class NolimitholdemPlayer(Player):
-    def __init__(self, player_id, init_chips, np_random):
+    def __init__(self, player_id, init_chips, np_random, card_encoding='str'):
         """
         Initialize a player.
 
         Args:
             player_id (int): The id of the player
             init_chips (int): The number of chips the player has initially
+            card_encoding (str): 'str' for Card objects or 'int' for card ids
         """
-        super().__init__(player_id, np_random)
+        super().__init__(player_id, np_random, card_encoding)
         self.remained_chips = init_chips
 
     def bet(self, chips):
@@ -2,4 +2,7 @@ from rlcard.utils.logger import Logger
 from rlcard.utils import seeding
 from rlcard.utils.utils import *
 from rlcard.utils.pettingzoo_utils import *
-from rlcard.utils.sum_tree import SumTree
\ No newline at end of file
+from rlcard.utils.sum_tree import SumTree
+from rlcard.utils.infoset_table import InfosetTable
+from rlcard.utils.transposition import TranspositionCache
+from rlcard.utils.policy_file import save_policy, load_policy, PolicyFile
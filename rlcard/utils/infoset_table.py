@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class InfosetTable(object):
+    ''' Registry of information sets with dense per-infoset arrays
+
+    Every key (e.g. state['obs'].tostring()) gets a dense integer id the first time it
+    is seen, and each field is a contiguous (capacity, num_actions) array whose row id
+    belongs to that infoset. The arrays grow by doubling, so the rows of a field should
+    be looked up again after new keys were added.
+    '''
+
+    def __init__(self, num_actions, fields, capacity=1024, dtype=np.float64):
+        ''' Initialize the table
+
+        Args:
+            num_actions (int): The number of actions, the width of every field
+            fields (dict): Name -> initial value of the rows of each field
+            capacity (int): The number of rows allocated up front
+            dtype (numpy.dtype): The type of the fields
+        '''
+        self.num_actions = num_actions
+        self.fill = dict(fields)
+        self.index = {}
+        self.keys = []
+        self.capacity = max(1, capacity)
+        self.arrays = {name: np.full((self.capacity, num_actions), value, dtype=dtype)
+                       for name, value in self.fill.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __getitem__(self, name):
+        ''' The rows of the registered infosets of a field
+
+        Args:
+            name (str): The field name
+
+        Returns:
+            (numpy.array): A (len(self), num_actions) view
+        '''
+        return self.arrays[name][:len(self.keys)]
+
+    def find(self, key):
+        ''' Look up the id of a key
+
+        Returns:
+            (int): The id, or -1 if the key was not registered
+        '''
+        return self.index.get(key, -1)
+
+    def get_id(self, key):
+        ''' Look up the id of a key and register it if it is new
+
+        Returns:
+            (int): The id of the key
+        '''
+        infoset_id = self.index.get(key)
+        if infoset_id is None:
+            infoset_id = len(self.keys)
+            if infoset_id == self.capacity:
+                self._grow(2 * self.capacity)
+            self.index[key] = infoset_id
+            self.keys.append(key)
+        return infoset_id
+
+    def _grow(self, capacity):
+        for name, array in self.arrays.items():
+            grown = np.full((capacity, self.num_actions), self.fill[name], dtype=array.dtype)
+            grown[:self.capacity] = array
+            self.arrays[name] = grown
+        self.capacity = capacity
+
+    def as_dict(self, name):
+        ''' Copy a field to a dict key -> row
+        '''
+        rows = self[name]
+        return {key: rows[i].copy() for i, key in enumerate(self.keys)}
+
+    def save(self, path):
+        ''' Save the keys and fields to a .npz file
+        '''
+        np.savez(path, keys=np.array(self.keys, dtype=object), **{name: self[name] for name in self.arrays})
+
+    @classmethod
+    def load(cls, path, fields, dtype=np.float64):
+        ''' Load a table saved with save
+
+        Args:
+            path (str): The .npz file
+            fields (dict): Name -> initial value of the rows of each field
+            dtype (numpy.dtype): The type of the fields
+
+        Returns:
+            (InfosetTable): The table
+        '''
+        data = np.load(path, allow_pickle=True)
+        keys = list(data['keys'])
+        num_actions = data[next(iter(fields))].shape[1]
+        table = cls(num_actions, fields, capacity=len(keys), dtype=dtype)
+        for key in keys:
+            table.get_id(key)
+        for name in fields:
+            if name in data:
+                table.arrays[name][:len(keys)] = data[name]
+        return table
@@ -0,0 +1,164 @@
+import os
+import pickle
+import hashlib
+from collections.abc import MutableMapping
+
+import numpy as np
+
+ARRAYS = ('hashes', 'keys', 'lengths', 'values')
+
+
+def _encode_key(key):
+    ''' The bytes a key is stored as: state_str keys as they are, other keys pickled
+    '''
+    if isinstance(key, bytes):
+        return b'b' + key
+    return b'p' + pickle.dumps(key, protocol=4)
+
+
+def _decode_key(data):
+    if data[:1] == b'b':
+        return data[1:]
+    return pickle.loads(data[1:])
+
+
+def _hash_key(data):
+    return np.uint64(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little'))
+
+
+def save_policy(path, policy, dtype=np.float32):
+    ''' Save a tabular policy as a directory of .npy files that can be memory-mapped
+
+    The layout is a sorted index of 64-bit key hashes, the padded key bytes and their
+    lengths to check the matches, and a (num_keys, num_actions) matrix of values, all
+    in the order of the hashes.
+
+    Args:
+        path (str): The directory
+        policy (dict): key -> action values, all of the same length. The keys are
+            state_str bytes or picklable values such as tuples of them
+        dtype (numpy.dtype): The type of the stored values
+    '''
+    if not os.path.exists(path):
+        os.makedirs(path)
+    encoded = [_encode_key(key) for key in policy]
+    hashes = np.array([_hash_key(data) for data in encoded], dtype=np.uint64)
+    order = np.argsort(hashes, kind='stable')
+
+    lengths = np.array([len(data) for data in encoded], dtype=np.int64)
+    keys = np.zeros((len(encoded), lengths.max() if len(encoded) else 0), dtype=np.uint8)
+    for i, data in enumerate(encoded):
+        keys[i, :len(data)] = np.frombuffer(data, dtype=np.uint8)
+    values = np.array(list(policy.values()), dtype=dtype)
+    if not len(encoded):
+        values = values.reshape(0, 0)
+
+    arrays = {'hashes': hashes[order], 'keys': keys[order], 'lengths': lengths[order], 'values': values[order]}
+    for name in ARRAYS:
+        np.save(os.path.join(path, name + '.npy'), arrays[name])
+
+
+def is_policy_file(path):
+    ''' Check whether a directory holds a policy saved with save_policy
+    '''
+    return all(os.path.exists(os.path.join(path, name + '.npy')) for name in ARRAYS)
+
+
+class PolicyFile(MutableMapping):
+    ''' A policy saved with save_policy, memory-mapped and looked up lazily
+
+    Opening the file only maps it, a lookup hashes the key and binary searches the
+    sorted hashes. Processes that open the same file share its pages. The file is never
+    written: assigned keys are kept in memory on top of it, so the agents that add new
+    states while they play can still use it as their policy.
+    '''
+
+    def __init__(self, path, mmap_mode='r'):
+        ''' Open a policy file
+
+        Args:
+            path (str): The directory given to save_policy
+            mmap_mode (str): The numpy mmap mode, None to read the arrays into memory
+        '''
+        self.path = path
+        self.mmap_mode = mmap_mode
+        arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode) for name in ARRAYS}
+        self.hashes = arrays['hashes']
+        self.key_bytes = arrays['keys']
+        self.key_lengths = arrays['lengths']
+        self.rows = arrays['values']
+        self.overlay = {}
+
+    def __getstate__(self):
+        # Pickled copies map the file again instead of carrying its arrays
+        return {'path': self.path, 'mmap_mode': self.mmap_mode, 'overlay': self.overlay}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['mmap_mode'])
+        self.overlay = state['overlay']
+
+    @property
+    def num_actions(self):
+        return self.rows.shape[1]
+
+    def find(self, key):
+        ''' Look up the row of a key in the file
+
+        Returns:
+            (int): The row, or -1 if the key is not in the file
+        '''
+        data = _encode_key(key)
+        target = _hash_key(data)
+        row = int(np.searchsorted(self.hashes, target))
+        while row < len(self.hashes) and self.hashes[row] == target:
+            length = self.key_lengths[row]
+            if length == len(data) and self.key_bytes[row, :length].tobytes() == data:
+                return row
+            row += 1
+        return -1
+
+    def __getitem__(self, key):
+        if key in self.overlay:
+            return self.overlay[key]
+        row = self.find(key)
+        if row < 0:
+            raise KeyError(key)
+        return np.array(self.rows[row], dtype=np.float64)
+
+    def __setitem__(self, key, value):
+        self.overlay[key] = value
+
+    def __delitem__(self, key):
+        raise TypeError('Keys cannot be removed from a policy file')
+
+    def __contains__(self, key):
+        return key in self.overlay or self.find(key) >= 0
+
+    def __len__(self):
+        return len(self.hashes) + sum(1 for key in self.overlay if self.find(key) < 0)
+
+    def __iter__(self):
+        for row in range(len(self.hashes)):
+            key = _decode_key(self.key_bytes[row, :self.key_lengths[row]].tobytes())
+            if key not in self.overlay:
+                yield key
+        yield from self.overlay
+
+    def copy(self):
+        ''' Read every entry into a dict
+        '''
+        return dict(self.items())
+
+
+def load_policy(path, lazy=True):
+    ''' Load a policy saved with save_policy
+
+    Args:
+        path (str): The directory given to save_policy
+        lazy (boolean): True to memory-map the file, False to read it into a dict
+
+    Returns:
+        (PolicyFile or dict): The policy
+    '''
+    policy = PolicyFile(path)
+    return policy if lazy else policy.copy()
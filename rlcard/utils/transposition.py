@@ -0,0 +1,111 @@
+from collections import OrderedDict
+
+
+class TranspositionCache(object):
+    ''' LRU cache of subtree values of tabular tree agents
+
+    An entry maps the key of a game state to the value of its subtree, together with
+    the version of every policy entry the subtree read. The agent bumps the version of
+    a policy entry whenever its values change, so an entry is only returned while the
+    policy of its whole subtree is the one it was computed with. Reads are collected in
+    nested frames: a subtree depends on everything its children depend on.
+    '''
+
+    def __init__(self, max_size=100000):
+        ''' Initialize the cache
+
+        Args:
+            max_size (int): The number of entries kept before the least recently used
+                ones are evicted
+        '''
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.frames = []
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        ''' The fraction of the lookups answered from the cache
+        '''
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        ''' The counters of the cache
+
+        Returns:
+            (dict): size, hits, misses, stale, evictions and hit_rate
+        '''
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+    def clear(self):
+        ''' Drop the entries and reset the counters
+        '''
+        self.__init__(self.max_size)
+
+    def depend(self, key, version):
+        ''' Record that the subtrees being computed read a policy entry
+
+        Args:
+            key: The policy key
+            version (int): The version of the entry when it was read
+        '''
+        if self.frames:
+            self.frames[-1].setdefault(key, version)
+
+    def traverse(self, key, compute, versions):
+        ''' Return the cached value of a subtree or compute and store it
+
+        Args:
+            key: The hashable key of the game state at the root of the subtree
+            compute (function): Computes the value of the subtree, reporting its policy
+                reads through depend
+            versions (dict): policy key -> current version, missing keys are version 0
+
+        Returns:
+            The value of the subtree
+        '''
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, dependencies = entry
+            if all(versions.get(policy_key, 0) == version for policy_key, version in dependencies):
+                self.hits += 1
+                self.entries.move_to_end(key)
+                self._merge(dependencies)
+                return value
+            self.stale += 1
+            del self.entries[key]
+        self.misses += 1
+
+        self.frames.append({})
+        try:
+            value = compute()
+        finally:
+            dependencies = tuple(self.frames.pop().items())
+        self._merge(dependencies)
+
+        self.entries[key] = (value, dependencies)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def _merge(self, dependencies):
+        # Keep the oldest version a parent read so that it goes stale with any change
+        if self.frames:
+            frame = self.frames[-1]
+            for policy_key, version in dependencies:
+                frame.setdefault(policy_key, version)
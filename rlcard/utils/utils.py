@@ -254,6 +254,64 @@ def remove_illegal(action_probs, legal_actions):
         probs /= sum(probs)
     return probs
 
+def marginalize_policy(policy, group=None, weight=None):
+    ''' Average the action probabilities of the keys of a policy that share a group
+
+    The keys are grouped in one pass and every group is reduced at once with
+    weighted sums over a stacked matrix of the policy rows.
+
+    Args:
+        policy (dict): key -> action probabilities, all of the same length
+        group (function): key -> the key of its group, or None to drop the key.
+            The first item of tuple keys if None, other keys are dropped
+        weight (function): key -> the weight of its row, the rows are averaged
+            with equal weights if None
+
+    Returns:
+        (dict): group key -> average action probabilities, in the order the groups
+            are first seen
+    '''
+    if group is None:
+        group = lambda key: key[0] if isinstance(key, tuple) else None
+    group_ids = {}
+    rows, ids, weights = [], [], []
+    for key, values in policy.items():
+        group_key = group(key)
+        if group_key is None:
+            continue
+        ids.append(group_ids.setdefault(group_key, len(group_ids)))
+        rows.append(values)
+        weights.append(1.0 if weight is None else weight(key))
+    if not rows:
+        return {}
+
+    rows = np.asarray(rows, dtype=np.float64)
+    ids = np.asarray(ids)
+    weights = np.asarray(weights, dtype=np.float64)
+    sums = np.zeros((len(group_ids), rows.shape[1]))
+    np.add.at(sums, ids, rows * weights[:, None])
+    averages = sums / np.bincount(ids, weights=weights, minlength=len(group_ids))[:, None]
+    return {group_key: averages[i] for group_key, i in group_ids.items()}
+
+def _tournament_payoffs(env, num):
+    ''' Play at least num games and collect the payoffs of every game
+
+    Args:
+        env (Env class): The environment to be evaluated.
+        num (int): The number of games to play.
+
+    Returns:
+        (list): The payoffs of each game, one list per game
+    '''
+    games = []
+    while len(games) < num:
+        _, _payoffs = env.run(is_training=False)
+        if isinstance(_payoffs, list):
+            games.extend(_payoffs)
+        else:
+            games.append(_payoffs)
+    return games
+
 def tournament(env, num):
     ''' Evaluate he performance of the agents in the environment
 
@@ -266,29 +324,232 @@ def tournament(env, num):
     '''
     payoffs = [0 for _ in range(env.num_players)]
     winrate = [0 for _ in range(env.num_players)]
-    counter = 0
-    while counter < num:
-        _, _payoffs = env.run(is_training=False)
-        if isinstance(_payoffs, list):
-            for _p in _payoffs:
-                for i, _ in enumerate(payoffs):
-                    payoffs[i] += _p[i]
-                    if _p[i] > 0:
-                        winrate[i] += 1
-                counter += 1
-        else:
-            for i, _ in enumerate(payoffs):
-                payoffs[i] += _payoffs[i]
-                if _payoffs[i] > 0:
-                    winrate[i] += 1
-            counter += 1
+    games = _tournament_payoffs(env, num)
+    for _p in games:
+        for i, _ in enumerate(payoffs):
+            payoffs[i] += _p[i]
+            if _p[i] > 0:
+                winrate[i] += 1
 
     for i, _ in enumerate(payoffs):
-        payoffs[i] /= counter
-        winrate[i] /= counter
+        payoffs[i] /= len(games)
+        winrate[i] /= len(games)
 
     return payoffs, winrate
 
+def confidence_interval(samples, z=1.96):
+    ''' Normal approximation confidence interval of the mean
+
+    Args:
+        samples (numpy.array): (N,) or (N, K) samples, one row per game
+        z (float): The standard normal quantile, 1.96 for 95%
+
+    Returns:
+        (list): The (low, high) interval of the mean of each column
+    '''
+    samples = np.asarray(samples, dtype=float).reshape(len(samples), -1)
+    mean = samples.mean(axis=0)
+    if len(samples) > 1:
+        half = z * samples.std(axis=0, ddof=1) / np.sqrt(len(samples))
+    else:
+        half = np.full(mean.shape, np.inf)
+    return [(low, high) for low, high in zip(mean - half, mean + half)]
+
+def _duplicate_payoffs(env, num):
+    ''' Play num deals, each once in every seat rotation of the agents
+
+    The deal is replayed by restoring the random state of the game before every
+    rotation, so the cards, blinds and first player stay the same while the agents
+    take turns in the seats.
+
+    Args:
+        env (Env class): The environment to be evaluated.
+        num (int): The number of deals to play.
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (numpy.array): (num, num_players) payoffs of each agent averaged over the rotations
+            (numpy.array): (num, num_players) fraction of the rotations won by each agent
+    '''
+    agents = list(env.agents)
+    num_players = env.num_players
+    payoffs = np.zeros((num, num_players))
+    wins = np.zeros((num, num_players))
+    try:
+        for deal in range(num):
+            random_state = env.np_random.get_state()
+            for shift in range(num_players):
+                env.np_random.set_state(random_state)
+                # Agent i sits in seat (i + shift) % num_players
+                env.set_agents(agents[-shift:] + agents[:-shift] if shift else agents)
+                _, _payoffs = env.run(is_training=False)
+                for i in range(num_players):
+                    payoff = _payoffs[(i + shift) % num_players]
+                    payoffs[deal, i] += payoff
+                    wins[deal, i] += payoff > 0
+    finally:
+        env.set_agents(agents)
+    return payoffs / num_players, wins / num_players
+
+def duplicate_tournament(env, num, z=1.96):
+    ''' Evaluate the performance of the agents with duplicate deals
+
+    Every deal is played once for each seat rotation of the agents, so luck of the
+    cards and of the seat cancels out in the paired payoffs and far fewer deals are
+    needed than with tournament for the same confidence interval.
+
+    Args:
+        env (Env class): The environment to be evaluated.
+        num (int): The number of deals to play, each played num_players times.
+        z (float): The standard normal quantile of the confidence intervals, 1.96 for 95%
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (list): The average paired payoffs of each agent
+            (list): The winrate of each agent over all the games
+            (dict): 'payoffs' and 'winrate', the (low, high) confidence intervals of each agent
+    '''
+    payoffs, wins = _duplicate_payoffs(env, num)
+    return _summarize_tournament(payoffs, wins, z)
+
+def sequential_tournament(env, max_games, target_width=None, significance=None,
+                          player=0, min_games=100, duplicate=False, z=1.96):
+    ''' Evaluate the agents game by game and stop once the confidence bound is met
+
+    Stops when the confidence interval of the average payoff of `player` is narrower
+    than target_width, or when it excludes zero at the z quantile of the two-sided
+    significance level, whichever is given and comes first, or after max_games.
+
+    Args:
+        env (Env class): The environment to be evaluated.
+        max_games (int): The largest number of games (deals if duplicate) to play.
+        target_width (float): The full width of the payoff interval to reach
+        significance (float): The two-sided significance level of a win or a loss, e.g. 0.05
+        player (int): The player whose payoff is tracked
+        min_games (int): The number of games played before stopping is considered
+        duplicate (boolean): True to play duplicate deals as duplicate_tournament does
+        z (float): The standard normal quantile of the reported intervals, 1.96 for 95%
+
+    Returns:
+        (dict): 'games' played, 'payoff' mean and 'stderr' of the tracked player, 'payoff_interval'
+            and 'winrate_interval' (low, high), 'winrate' and 'stopped' ('width', 'significance'
+            or 'max_games')
+    '''
+    if target_width is None and significance is None:
+        raise ValueError('Either target_width or significance must be given')
+    if significance is not None:
+        from statistics import NormalDist
+        test_z = NormalDist().inv_cdf(1 - significance / 2)
+
+    total, total_sq, wins, games = 0.0, 0.0, 0.0, 0
+    stopped = 'max_games'
+    while games < max_games:
+        if duplicate:
+            payoffs, won = _duplicate_payoffs(env, 1)
+            samples = [(payoffs[0, player], won[0, player])]
+        else:
+            samples = [(p[player], float(p[player] > 0)) for p in _tournament_payoffs(env, 1)]
+        for payoff, won in samples:
+            total += payoff
+            total_sq += payoff * payoff
+            wins += won
+            games += 1
+
+        if games < max(min_games, 2):
+            continue
+        mean = total / games
+        stderr = np.sqrt(max(total_sq - games * mean * mean, 0.0) / (games - 1) / games)
+        if target_width is not None and 2 * z * stderr <= target_width:
+            stopped = 'width'
+            break
+        if significance is not None and abs(mean) > test_z * stderr:
+            stopped = 'significance'
+            break
+
+    mean = total / games
+    stderr = np.sqrt(max(total_sq - games * mean * mean, 0.0) / (games - 1) / games) if games > 1 else np.inf
+    winrate = wins / games
+    win_stderr = np.sqrt(winrate * (1 - winrate) / games)
+    return {
+        'games': games,
+        'payoff': mean,
+        'stderr': stderr,
+        'payoff_interval': (mean - z * stderr, mean + z * stderr),
+        'winrate': winrate,
+        'winrate_interval': (max(winrate - z * win_stderr, 0.0), min(winrate + z * win_stderr, 1.0)),
+        'stopped': stopped,
+    }
+
+def _summarize_tournament(payoffs, wins, z):
+    intervals = {
+        'payoffs': confidence_interval(payoffs, z),
+        'winrate': confidence_interval(wins, z),
+    }
+    return list(payoffs.mean(axis=0)), list(wins.mean(axis=0)), intervals
+
+def _seed_worker(env, seed):
+    ''' Seed the environment and the global generators used by the agents
+    '''
+    import sys
+    import random
+    env.seed(seed)
+    np.random.seed(seed)
+    random.seed(seed)
+    if 'torch' in sys.modules:
+        sys.modules['torch'].manual_seed(seed)
+
+_tournament_env = None
+
+def _init_tournament_worker(env):
+    global _tournament_env
+    _tournament_env = env
+
+def _play_tournament_shard(args):
+    seed, num, duplicate = args
+    _seed_worker(_tournament_env, seed)
+    if duplicate:
+        return _duplicate_payoffs(_tournament_env, num)
+    games = np.array(_tournament_payoffs(_tournament_env, num), dtype=float)
+    return games, (games > 0).astype(float)
+
+def parallel_tournament(env, num, num_workers=None, seed=0, z=1.96, duplicate=False):
+    ''' Evaluate the performance of the agents with the games shared out to a process pool
+
+    Every worker gets a copy of the environment with its agents and plays its share of
+    the games with its own seed derived from `seed`, so the results only depend on
+    `seed` and `num_workers`.
+
+    Args:
+        env (Env class): The environment to be evaluated, with the agents set.
+        num (int): The number of games to play.
+        num_workers (int): The number of processes, the number of CPUs if None
+        seed (int): The seed the worker seeds are derived from
+        z (float): The standard normal quantile of the confidence intervals, 1.96 for 95%
+        duplicate (boolean): True to play num duplicate deals as duplicate_tournament does
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (list): The average payoffs of each player
+            (list): The winrate of each player
+            (dict): 'payoffs' and 'winrate', the (low, high) confidence intervals of each player
+    '''
+    import multiprocessing as mp
+    if num_workers is None:
+        num_workers = mp.cpu_count()
+    num_workers = max(1, min(num_workers, num))
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(num_workers)]
+    shards = [(seeds[i], num // num_workers + (i < num % num_workers), duplicate) for i in range(num_workers)]
+
+    with mp.Pool(num_workers, initializer=_init_tournament_worker, initargs=(env,)) as pool:
+        results = pool.map(_play_tournament_shard, shards)
+
+    payoffs = np.concatenate([result[0] for result in results])
+    wins = np.concatenate([result[1] for result in results])
+    return _summarize_tournament(payoffs, wins, z)
+
 def plot_curve(csv_path, save_path, algorithm):
     ''' Read data from csv file and plot the results
     '''
@@ -35,3 +35,120 @@ class TestNFSP(unittest.TestCase):
         self.assertEqual(len(agent.regrets), len(new_agent.regrets))
         self.assertEqual(agent.iteration, new_agent.iteration)
 
+    def test_regret_matching(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = CFRAgent(env, model_path='experiments/cfr_model')
+        regrets = np.array([[1., -1., 3., 0.], [-2., 0., -1., 0.]])
+        np.testing.assert_allclose(agent.regret_matching(regrets), [[0.25, 0., 0.75, 0.], [0.25, 0.25, 0.25, 0.25]])
+
+    def test_infoset_table(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = CFRAgent(env, model_path='experiments/cfr_model')
+        agent.table = agent.new_table(capacity=1)
+        for _ in range(10):
+            agent.train()
+        self.assertGreater(len(agent.table), 1)
+        self.assertEqual(agent.table['regrets'].shape, (len(agent.table), env.num_actions))
+        for obs, regret in agent.regrets.items():
+            np.testing.assert_array_equal(agent.table['regrets'][agent.table.find(obs)], regret)
+        np.testing.assert_allclose(agent.table['policy'].sum(axis=1), 1)
+
+    def test_sampled_cfr(self):
+        for sampling in ['external', 'outcome']:
+            env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+            agent = CFRAgent(env, model_path='experiments/cfr_model', sampling=sampling)
+            for _ in range(50):
+                agent.train()
+            self.assertGreater(len(agent.table), 0)
+            self.assertTrue(np.any(agent.table['regrets'] != 0))
+            state, _ = env.reset()
+            action, _ = agent.eval_step(state)
+            self.assertIn(action, state['legal_actions'])
+
+        # limit-holdem has no obs and needs the recorded actions to follow step_back
+        env = rlcard.make('limit-holdem', config={'allow_step_back':True})
+        agent = CFRAgent(env, model_path='experiments/cfr_model', sampling='external')
+        agent.train()
+        self.assertGreater(len(agent.table), 0)
+
+        # Chance sampling steps the env the same way, only the river is walked to keep it short
+        agent = CFRAgent(env, model_path='experiments/cfr_model')
+        env.reset()
+        while env.game.round_counter < 3:
+            _, legal_actions = agent.get_state(env.get_player_id())
+            agent.step_env(0 if 0 in legal_actions else 3, legal_actions)
+        num_actions = len(env.action_recorder)
+        agent.traverse_tree(np.ones(env.num_players), env.get_player_id())
+        self.assertEqual(len(env.action_recorder), num_actions)
+        self.assertTrue(np.any(agent.table['regrets'] != 0))
+
+        with self.assertRaises(ValueError):
+            CFRAgent(env, sampling='full')
+
+    def test_parallel_sampled_cfr(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agents = [CFRAgent(env, model_path='experiments/cfr_model', sampling='outcome') for _ in range(2)]
+        for agent in agents:
+            agent.train_parallel(40, num_workers=2, seed=3)
+            agent.train_parallel(40, num_workers=2, seed=4)
+            agent.close_workers()
+        self.assertEqual(agents[0].iteration, 2)
+        self.assertEqual(agents[0].table.keys, agents[1].table.keys)
+        np.testing.assert_array_equal(agents[0].table['regrets'], agents[1].table['regrets'])
+
+        # Collecting deltas leaves the table as it is
+        regrets = agents[0].table['regrets'].copy()
+        deltas = agents[0].collect_deltas(range(5))
+        np.testing.assert_array_equal(agents[0].table['regrets'][:len(regrets)], regrets)
+        self.assertGreater(len(deltas), 0)
+
+    def test_parallel_cfr_matches_train(self):
+        # One chance sampled traversal per iteration is train on the deal of its seed
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        serial = CFRAgent(env, model_path='experiments/cfr_model')
+        parallel = CFRAgent(env, model_path='experiments/cfr_model')
+        for seed in range(10):
+            deal_seed = int(np.random.SeedSequence(seed).generate_state(1)[0])
+            np.random.seed(deal_seed)
+            env.seed(deal_seed)
+            serial.train()
+            parallel.train_parallel(1, num_workers=0, seed=seed)
+        self.assertEqual(parallel.iteration, serial.iteration)
+        self.assertEqual(parallel.table.keys, serial.table.keys)
+        for field in ('regrets', 'average_policy', 'policy'):
+            np.testing.assert_allclose(parallel.table[field], serial.table[field], atol=1e-9)
+
+    def test_collect_deltas_keeps_rngs(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+        agent = CFRAgent(env, model_path='experiments/cfr_model')
+        np.random.seed(1)
+        expected = (np.random.rand(), env.np_random.rand())
+        np.random.seed(1)
+        env.seed(0)
+        agent.collect_deltas(range(3))
+        self.assertEqual((np.random.rand(), env.np_random.rand()), expected)
+
+    def test_parallel_cfr_matches_serial(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        serial = CFRAgent(env, model_path='experiments/cfr_model')
+        parallel = CFRAgent(env, model_path='experiments/cfr_model')
+        for seed in range(3):
+            serial.train_parallel(6, num_workers=0, seed=seed)
+            parallel.train_parallel(6, num_workers=3, seed=seed)
+        self.assertEqual(len(parallel.workers), 3)
+
+        # Training serially in between restarts the workers with the new table
+        for agent in (serial, parallel):
+            np.random.seed(5)
+            env.seed(5)
+            agent.train()
+        parallel.train_parallel(6, num_workers=3, seed=7)
+        serial.train_parallel(6, num_workers=0, seed=7)
+        parallel.close_workers()
+        self.assertEqual(parallel.workers, [])
+
+        self.assertEqual(sorted(serial.table.keys), sorted(parallel.table.keys))
+        for field in ('regrets', 'average_policy', 'policy'):
+            expected, actual = getattr(serial, field), getattr(parallel, field)
+            for key in expected:
+                np.testing.assert_allclose(actual[key], expected[key], atol=1e-9)
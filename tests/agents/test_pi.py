@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.pi_agent import PIAgent
+from rlcard.agents.threshold_agent import ThresholdAgent
+
+class TestPI(unittest.TestCase):
+
+    def make_agent(self, num_workers, cache_size=0):
+        np.random.seed(0)
+        env = rlcard.make('new-limit-holdem', config={'seed': 0, 'allow_step_back':True})
+        agent = PIAgent(env, model_path='experiments/pi_model', num_workers=num_workers, cache_size=cache_size)
+        agent.rank_list = ['A', 'T', 'J']
+        env.set_agents([ThresholdAgent(num_actions=env.num_actions), agent])
+        return agent
+
+    def test_parallel_evaluate_policy(self):
+        serial = self.make_agent(0)
+        serial.evaluate_policy()
+
+        values, policies = [], []
+        for num_workers in (1, 3):
+            agent = self.make_agent(num_workers)
+            values.append([agent.evaluate_policy() for _ in range(2)])
+            policies.append(agent.policy)
+
+        # One group per opponent card and pair of our card and first public card
+        groups = self.make_agent(1).deal_groups()
+        self.assertEqual(sum(len(group) for group in groups), 2 * 3 ** 4)
+        self.assertEqual(len(groups), 3 * 6)
+
+        self.assertEqual(values[0], values[1])
+        self.assertEqual(set(policies[0]), set(serial.policy))
+        self.assertEqual(policies[0].keys(), policies[1].keys())
+        for key in policies[0]:
+            np.testing.assert_array_equal(policies[0][key], policies[1][key])
+
+    def test_transposition_cache(self):
+        agents, values = [], []
+        for cache_size in (0, 100000):
+            agents.append(self.make_agent(0, cache_size=cache_size))
+            values.append([agents[-1].evaluate_policy() for _ in range(3)])
+
+        # Cached subtrees are only reused while their policy is unchanged
+        self.assertEqual(values[0], values[1])
+        self.assertEqual(agents[0].policy.keys(), agents[1].policy.keys())
+        for key in agents[0].policy:
+            np.testing.assert_array_equal(agents[0].policy[key], agents[1].policy[key])
+        stats = agents[1].cache.stats()
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['stale'], 0)
+        self.assertEqual(stats['hit_rate'], stats['hits'] / (stats['hits'] + stats['misses']))
+
+        # The LRU bound evicts the oldest entries
+        agent = self.make_agent(0, cache_size=10)
+        agent.evaluate_policy()
+        self.assertEqual(len(agent.cache), 10)
+        self.assertGreater(agent.cache.evictions, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.agents.policy_eval_agent import PolicyEvalAgent
+from rlcard.utils.utils import parallel_tournament
+
+class TestPolicyEvalAgent(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_cfr_policy(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back': True})
+        agent = CFRAgent(env, model_path=os.path.join(self.path, 'cfr_model'))
+        for _ in range(20):
+            agent.train()
+        agent.save()
+
+        eval_agent = PolicyEvalAgent.from_cfr(agent.model_path)
+        self.assertIsInstance(eval_agent.policy.rows, np.memmap)
+        self.assertEqual(eval_agent.num_actions, env.num_actions)
+
+        # The same probabilities as the agent for the states of random games
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        for _ in range(20):
+            trajectories, _ = env.run()
+            for trajectory in trajectories:
+                for state in trajectory[::2]:
+                    if not state['legal_actions']:
+                        continue
+                    _, info = agent.eval_step(state)
+                    action, eval_info = eval_agent.eval_step(state)
+                    self.assertIn(action, state['legal_actions'])
+                    self.assertEqual(info['probs'].keys(), eval_info['probs'].keys())
+                    for name, prob in info['probs'].items():
+                        self.assertAlmostEqual(eval_info['probs'][name], prob, places=6)
+
+        # Pickled copies map the file again instead of copying it
+        copy = pickle.loads(pickle.dumps(eval_agent))
+        self.assertIsInstance(copy.policy.rows, np.memmap)
+        self.assertLess(len(pickle.dumps(eval_agent)), 1000)
+
+        eval_env = rlcard.make('leduc-holdem', config={'seed': 0})
+        eval_env.set_agents([eval_agent, RandomAgent(env.num_actions)])
+        payoffs, _, _ = parallel_tournament(eval_env, 20, num_workers=2)
+        self.assertEqual(len(payoffs), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.ql_agent import QLAgent
+from rlcard.agents.sarsa_agent import SARSAAgent
+from rlcard.agents.threshold_agent import ThresholdAgent
+
+class TestQL(unittest.TestCase):
+
+    def make_agent(self, agent_class):
+        np.random.seed(0)
+        env = rlcard.make('new-limit-holdem', config={'seed': 0, 'allow_step_back':True})
+        agent = agent_class(env, model_path='experiments/ql_model')
+        env.set_agents([ThresholdAgent(num_actions=env.num_actions), agent])
+        return agent
+
+    def test_train_batch(self):
+        for agent_class in (QLAgent, SARSAAgent):
+            agent = self.make_agent(agent_class)
+            for _ in range(20):
+                agent.train()
+            batch = self.make_agent(agent_class)
+            batch.train_batch(20)
+            self.assertEqual(batch.iteration, agent.iteration)
+            self.assertEqual(batch.table.keys, agent.table.keys)
+            np.testing.assert_array_equal(batch.table['qualities'], agent.table['qualities'])
+
+    def test_parallel_train_batch(self):
+        for agent_class in (QLAgent, SARSAAgent):
+            agent = self.make_agent(agent_class)
+            agent.train_batch(30, num_workers=2, merge_every=10)
+            self.assertEqual(agent.iteration, 30)
+            qualities = agent.table['qualities']
+            self.assertEqual(len(qualities), len(agent.table))
+            # Every state has a legal action with a finite quality
+            self.assertTrue(np.all(np.isfinite(qualities).any(axis=1)))
+            self.assertFalse(np.isnan(qualities).any())
+
+    def test_no_transposition_cache(self):
+        # The subtree values are sampled, the opponent moves and the explored actions are
+        # drawn on every visit, so they cannot be cached like the expectations of PIAgent
+        env = rlcard.make('new-limit-holdem', config={'seed': 0, 'allow_step_back':True})
+        for agent_class in (QLAgent, SARSAAgent):
+            with self.assertRaises(TypeError):
+                agent_class(env, cache_size=1000)
+
+    def test_merge_tables(self):
+        agent = self.make_agent(QLAgent)
+        agent.train_batch(5)
+        rows = agent.table['qualities']
+        row = np.where(np.isinf(rows[0]), -np.inf, 1.0)
+        agent.merge_tables([
+            (np.array([0]), [b'new'], np.stack([row, np.zeros(4)])),
+            (np.array([0]), [], (row * 3)[np.newaxis]),
+        ])
+        np.testing.assert_array_equal(agent.table['qualities'][0], row * 2)
+        np.testing.assert_array_equal(agent.qualities[b'new'], np.zeros(4))
+
+if __name__ == '__main__':
+    unittest.main()
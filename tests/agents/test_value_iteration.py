@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.threshold_agent2 import ThresholdAgent2
+from rlcard.agents.value_iteration_agent import ValueIterAgent
+
+class TestValueIteration(unittest.TestCase):
+
+    def make_agent(self):
+        np.random.seed(0)
+        env = rlcard.make('new-limit-holdem', config={'seed': 0, 'allow_step_back': True})
+        agent = ValueIterAgent(env)
+        env.set_agents([agent, ThresholdAgent2(num_actions=env.num_actions)])
+        return agent
+
+    def test_transition_model(self):
+        agent = self.make_agent()
+        for _ in range(100):
+            agent.learn_env()
+        self.assertGreater(len(agent.model), 0)
+
+        # Every edge is listed under its next state, and the probabilities of an action sum to one
+        edges = set()
+        for state, actions in agent.P.items():
+            for action, (next_states, ctr) in actions.items():
+                for next_state, (prob, _, count) in next_states.items():
+                    edges.add((next_state, state, action))
+                    self.assertAlmostEqual(prob, count / ctr)
+                if ctr:
+                    self.assertAlmostEqual(sum(edge[0] for edge in next_states.values()), 1)
+        predecessors = {(next_state, state, action) for next_state, sources in agent.model.predecessors.items()
+                        for state, action in sources}
+        self.assertEqual(edges, predecessors)
+
+        agent.value_iteration_algo()
+        self.assertEqual(agent.V.keys(), agent.P.keys())
+
+    def test_value_iteration_methods(self):
+        agent = self.make_agent()
+        for _ in range(100):
+            agent.learn_env()
+
+        values = {}
+        for method in ('jacobi', 'gauss-seidel', 'prioritized'):
+            stats = agent.value_iteration_algo(method)
+            self.assertEqual(stats['method'], method)
+            self.assertEqual(stats['states'], len(agent.P))
+            self.assertGreater(stats['backups'], 0)
+            values[method] = {state: value for state, (value, _) in agent.V.items()}
+        for method in ('gauss-seidel', 'prioritized'):
+            for state, value in values['jacobi'].items():
+                self.assertAlmostEqual(values[method][state], value, places=8)
+
+        with self.assertRaises(ValueError):
+            agent.value_iteration_algo('newton')
+
+    def test_state_encoder(self):
+        agent = self.make_agent()
+        env = agent.env
+        keys = {}
+        for _ in range(50):
+            state, _ = env.reset()
+            while not env.is_over():
+                raw_obs = state['raw_obs']
+                state_id = agent.encoder.intern(raw_obs)
+                # The ids tell apart the same observations as str(raw_obs)
+                self.assertEqual(keys.setdefault(str(raw_obs), state_id), state_id)
+                self.assertEqual(agent.encoder.find(raw_obs), state_id)
+                state, _ = env.step(np.random.choice(list(state['legal_actions'].keys())))
+        self.assertEqual(len(set(keys.values())), len(keys))
+        self.assertEqual(len(agent.encoder), len(keys))
+
+        # Evaluation does not intern unseen states
+        raw_obs = dict(state['raw_obs'], my_chips=99)
+        self.assertEqual(agent.encoder.find(raw_obs), -1)
+        self.assertEqual(len(agent.encoder), len(keys))
+
+if __name__ == '__main__':
+    unittest.main()
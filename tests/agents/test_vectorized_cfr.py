@@ -0,0 +1,70 @@
+import itertools
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.vectorized_cfr_agent import VectorizedCFRAgent
+
+
+class TestVectorizedCFR(unittest.TestCase):
+
+    def test_values_match_game(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back': True})
+        agent = VectorizedCFRAgent(env, variant='cfr+')
+        for _ in range(5):
+            agent.train()
+
+        def expect():
+            if env.is_over():
+                return np.array(env.get_payoffs())
+            state = env.get_state(env.get_player_id())
+            legal_actions = list(state['legal_actions'].keys())
+            probs = agent.action_probs(state['obs'].tostring(), legal_actions, 'policy')
+            value = 0
+            for action in legal_actions:
+                env.step(action)
+                value = value + probs[action] * expect()
+                env.step_back()
+            return value
+
+        # Play every deal of the first opening through the env
+        game = env.game
+        total = np.zeros(2)
+        deals = list(itertools.permutations(range(agent.num_cards), 3))
+        for first, second, board in deals:
+            game.np_random = np.random.RandomState(agent._find_openings()[0])
+            env.reset()
+            game.players[0].hand = agent.deck[first]
+            game.players[1].hand = agent.deck[second]
+            game.dealer.deck = [agent.deck[board]]
+            total += expect()
+        for player_id in range(2):
+            reaches = [np.ones(agent.num_cards), np.ones(agent.num_cards)]
+            value = agent.traverse(agent.roots[0], reaches, player_id).sum() * len(agent.roots)
+            self.assertAlmostEqual(value, total[player_id] / len(deals))
+
+    def test_train_and_export(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back': True})
+        for variant in ['cfr', 'cfr+', 'linear']:
+            agent = VectorizedCFRAgent(env, model_path='experiments/vectorized_cfr_model', variant=variant)
+            agent.train()
+            exploitability = agent.get_exploitability()
+            for _ in range(30):
+                agent.train()
+            self.assertLess(agent.get_exploitability(), exploitability)
+
+        agent.save()
+        loaded = CFRAgent(env, model_path='experiments/vectorized_cfr_model')
+        loaded.load()
+        self.assertEqual(len(loaded.table), len(agent.table))
+        state, _ = env.reset()
+        self.assertEqual(loaded.eval_step(state)[1], agent.eval_step(state)[1])
+
+    def test_unsupported_env(self):
+        env = rlcard.make('limit-holdem', config={'allow_step_back': True})
+        with self.assertRaises(ValueError):
+            VectorizedCFRAgent(env)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+import numpy as np
 
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.envs.batch_limitholdem import BatchLimitholdemEnv
+from rlcard.games.limitholdem.batch_game import BatchLimitHoldemGame
 from .determism_util import is_deterministic
 
 
@@ -79,5 +82,69 @@ class TestLimitholdemEnv(unittest.TestCase):
         num_players = env.game.get_num_players()
         self.assertEqual(num_players, 5)
 
+    def test_int_card_encoding(self):
+        envs = [rlcard.make('limit-holdem', config={'seed': 0, 'game_card_encoding': encoding})
+                for encoding in ('str', 'int')]
+        np_random = np.random.RandomState(0)
+        for _ in range(20):
+            states = [env._extract_state(env.game.init_game()[0]) for env in envs]
+            while True:
+                self.assertTrue(np.array_equal(states[0]['card_tensor'], states[1]['card_tensor']))
+                self.assertEqual(envs[0].get_perfect_information(), envs[1].get_perfect_information())
+                if envs[0].game.is_over():
+                    break
+                action = np_random.choice(list(states[0]['raw_legal_actions']))
+                states = [env._extract_state(env.game.step(action)[0]) for env in envs]
+            self.assertEqual(list(envs[0].get_payoffs()), list(envs[1].get_payoffs()))
+
+    def test_batch_env_matches_env(self):
+        batch_size = 100
+        envs = [rlcard.make('limit-holdem', config={'seed': i, 'game_card_encoding': 'int'}) for i in range(batch_size)]
+        hands, public_cards, small_blind = [], [], []
+        states = []
+        for env in envs:
+            state, player_id = env.reset()
+            states.append(state)
+            hands.append([player.hand for player in env.game.players])
+            # The public cards are drawn from the end of the deck
+            public_cards.append(env.game.dealer.deck[-1:-6:-1])
+            small_blind.append(player_id)
+        batch_env = BatchLimitholdemEnv(batch_size, seed=0)
+        batch_state, _ = batch_env.reset(hands=hands, public_cards=public_cards, small_blind=small_blind)
+
+        np_random = np.random.RandomState(0)
+        while not batch_env.is_over().all():
+            # Fold rarely so that most games reach the later rounds
+            weights = np_random.rand(batch_size, 4) * [1, 1, 0.1, 1]
+            actions = (weights * batch_state['legal_actions']).argmax(axis=1)
+            for i, env in enumerate(envs):
+                self.assertEqual(batch_env.is_over()[i], env.is_over())
+                if env.is_over():
+                    continue
+                legal_actions = list(states[i]['legal_actions'].keys())
+                self.assertEqual(list(np.nonzero(batch_state['legal_actions'][i])[0]), legal_actions)
+                self.assertTrue(np.array_equal(batch_state['card_tensor'][i], states[i]['card_tensor']))
+                self.assertTrue(np.array_equal(batch_state['action_tensor'][i], states[i]['action_tensor']))
+                states[i], _ = env.step2(actions[i], legal_actions)
+            batch_state, _ = batch_env.step(actions)
+
+        payoffs = batch_env.get_payoffs()
+        for i, env in enumerate(envs):
+            self.assertEqual(list(payoffs[i]), list(env.get_payoffs()))
+
+    def test_batch_game_partial_deal(self):
+        batch_size = 500
+        game = BatchLimitHoldemGame(batch_size)
+        game.np_random = np.random.RandomState(0)
+        hands = np.random.RandomState(1).rand(batch_size, 52).argsort(axis=1)[:, :4].reshape(-1, 2, 2)
+        game.init_game(hands=hands)
+        self.assertTrue(np.array_equal(game.hands, hands))
+        public_cards = game.board.copy()
+        game.init_game(public_cards=public_cards)
+        self.assertTrue(np.array_equal(game.board, public_cards))
+        for cards in ([hands, public_cards], [game.hands, game.board]):
+            dealt = np.concatenate([cards[0].reshape(batch_size, -1), cards[1]], axis=1)
+            self.assertTrue(all(len(set(row)) == 9 for row in dealt))
+
 if __name__ == '__main__':
     unittest.main()
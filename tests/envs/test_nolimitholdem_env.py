@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
@@ -87,5 +88,20 @@ class TestNolimitholdemEnv(unittest.TestCase):
             chips.append(players[i].remained_chips + players[i].in_chips)
         self.assertEqual(chips, [100, 100, 100, 100, 100])
 
+    def test_int_card_encoding(self):
+        envs = [rlcard.make('no-limit-holdem', config={'seed': 0, 'game_card_encoding': encoding})
+                for encoding in ('str', 'int')]
+        np_random = np.random.RandomState(0)
+        for _ in range(20):
+            states = [env._extract_state(env.game.init_game()[0]) for env in envs]
+            while True:
+                self.assertTrue(np.array_equal(states[0]['obs'], states[1]['obs']))
+                self.assertEqual(envs[0].get_perfect_information(), envs[1].get_perfect_information())
+                if envs[0].game.is_over():
+                    break
+                action = np_random.choice(list(states[0]['raw_legal_actions']))
+                states = [env._extract_state(env.game.step(action)[0]) for env in envs]
+            self.assertEqual(list(envs[0].get_payoffs()), list(envs[1].get_payoffs()))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.envs.vec import VecEnv
+
+
+class TestVecEnv(unittest.TestCase):
+
+    def test_matches_single_envs(self):
+        num_envs = 3
+        with VecEnv('new-limit-holdem', num_envs, config={'seed': 7}) as vec_env:
+            envs = [rlcard.make('new-limit-holdem', config={'seed': 7 + i}) for i in range(num_envs)]
+            states = [env.reset()[0] for env in envs]
+            vec_states, player_ids = vec_env.reset()
+            self.assertEqual(vec_states['obs'].shape, (num_envs, 32))
+            self.assertEqual(vec_states['legal_actions'].shape, (num_envs, vec_env.num_actions))
+
+            np_random = np.random.RandomState(0)
+            num_done = 0
+            for _ in range(50):
+                actions = [np_random.choice(np.nonzero(legal)[0]) for legal in vec_states['legal_actions']]
+                vec_states, player_ids, payoffs, dones = vec_env.step(actions)
+                for i, env in enumerate(envs):
+                    states[i], player_id = env.step2(actions[i], list(states[i]['legal_actions'].keys()))
+                    self.assertEqual(env.is_over(), dones[i])
+                    if env.is_over():
+                        np.testing.assert_array_equal(payoffs[i], env.get_payoffs())
+                        states[i], player_id = env.reset()
+                        num_done += 1
+                    else:
+                        np.testing.assert_array_equal(payoffs[i], 0)
+                    self.assertEqual(player_ids[i], player_id)
+                    np.testing.assert_array_equal(vec_states['obs'][i], states[i]['obs'])
+                    self.assertEqual(list(np.nonzero(vec_states['legal_actions'][i])[0]),
+                                     list(states[i]['legal_actions'].keys()))
+            self.assertGreater(num_done, 0)
+
+    def test_raw_states_and_envs_without_round(self):
+        with VecEnv('blackjack', 2, config={'seed': 1}) as vec_env:
+            vec_states, _ = vec_env.reset()
+            raw_states = vec_env.get_raw_states()
+            self.assertEqual(len(raw_states), 2)
+            np.testing.assert_array_equal(vec_states['obs'][1], raw_states[1]['obs'])
+            _, _, payoffs, dones = vec_env.step(['stand', 'stand'], raw_action=True)
+            self.assertTrue(dones.all())
+            self.assertEqual(payoffs.shape, (2, 1))
+
+    def test_worker_error(self):
+        vec_env = VecEnv('new-limit-holdem', 2)
+        vec_env.reset()
+        with self.assertRaises(RuntimeError):
+            vec_env.step([10, 10])
+        vec_env.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from copy import deepcopy
 import numpy as np
 
 from rlcard.games.limitholdem.game import LimitHoldemGame as Game
@@ -114,10 +115,65 @@ class TestLimitHoldemMethods(unittest.TestCase):
                 total += payoff
             self.assertEqual(total, 0)
 
+    def test_table_hand_evaluator(self):
+        games = []
+        for card_encoding, hand_evaluator in [('str', 'hand'), ('str', 'table'), ('int', 'table'), ('int', 'hand')]:
+            game = Game()
+            game.card_encoding = card_encoding
+            game.hand_evaluator = hand_evaluator
+            game.np_random = np.random.RandomState(0)
+            games.append(game)
+        for _ in range(50):
+            for game in games:
+                game.init_game()
+            while not games[0].is_over():
+                # Always call or check so that most games reach the showdown
+                action = 'call' if 'call' in games[0].get_legal_actions() else 'check'
+                for game in games:
+                    game.step(action)
+            payoffs = [list(game.get_payoffs()) for game in games]
+            self.assertEqual(payoffs[1], payoffs[0])
+            self.assertEqual(payoffs[2], payoffs[0])
+            self.assertEqual(payoffs[3], payoffs[0])
+
     def test_get_player_id(self):
         player = Player(3, np.random.RandomState())
         self.assertEqual(player.get_player_id(), 3)
 
+    def test_undo_matches_snapshot(self):
+        for seed in range(3):
+            games = []
+            for mode in ['undo', 'snapshot']:
+                game = Game(allow_step_back=True)
+                game.step_back_mode = mode
+                game.np_random = np.random.RandomState(seed)
+                game.init_game()
+                games.append(game)
+            self._walk_tree(games, 7)
+            self.assertEqual(len(games[0].history), 0)
+
+    def _walk_tree(self, games, depth):
+        snapshots = [self._snapshot(game) for game in games]
+        self.assertEqual(snapshots[0], snapshots[1])
+        if games[0].is_over():
+            self.assertEqual(list(games[0].get_payoffs()), list(games[1].get_payoffs()))
+            return
+        if depth == 0:
+            return
+        for action in games[0].get_legal_actions():
+            for game in games:
+                game.step(action)
+            self._walk_tree(games, depth - 1)
+            for game in games:
+                game.step_back()
+                self.assertEqual(self._snapshot(game), snapshots[0])
+
+    @staticmethod
+    def _snapshot(game):
+        states = deepcopy([game.get_state(i) for i in range(game.get_num_players())])
+        deck = [card.get_index() for card in game.dealer.deck]
+        return states, deck, game.get_player_id(), game.round_counter, game.round.raise_amount, game.is_over()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,188 @@
+import unittest
+from itertools import combinations
+from copy import deepcopy
+import numpy as np
+
+import rlcard
+from rlcard.games.base import Card
+from rlcard.games.newlimitholdem.game import NewLimitHoldemGame as Game
+from rlcard.games.newlimitholdem import showdown
+from rlcard.games.newlimitholdem.batch_game import BatchNewLimitHoldemGame, ACTIONS, DECK_IDS
+from rlcard.games.newlimitholdem.utils import compare_hands
+from rlcard.games.limitholdem.cards import card_strings, card_to_id, id_to_card
+
+
+def make_game(step_back_mode, seed=0):
+    game = Game(allow_step_back=True)
+    game.step_back_mode = step_back_mode
+    game.np_random = np.random.RandomState(seed)
+    return game
+
+
+def snapshot(game):
+    states = deepcopy([game.get_state(i) for i in range(game.get_num_players())])
+    deck = [c.get_index() for c in game.dealer.deck]
+    return states, deck, game.get_player_id(), game.round_counter, game.is_over()
+
+
+class TestNewLimitHoldemMethods(unittest.TestCase):
+
+    def test_init_game(self):
+        game = Game()
+        state, player_id = game.init_game()
+        self.assertEqual(game.get_player_id(), player_id)
+        self.assertEqual(len(state['hand']), 1)
+        self.assertEqual(len(game.dealer.deck), 18)
+
+    def test_step_back(self):
+        game = make_game('undo')
+        game.init_game()
+        self.assertFalse(game.step_back())
+        before = snapshot(game)
+        game.step(game.get_legal_actions()[0])
+        self.assertTrue(game.step_back())
+        self.assertEqual(snapshot(game), before)
+
+    def test_undo_matches_snapshot(self):
+        for seed in range(5):
+            undo_game = make_game('undo', seed)
+            snapshot_game = make_game('snapshot', seed)
+            undo_game.init_game()
+            snapshot_game.init_game()
+            self._walk_tree(undo_game, snapshot_game)
+            self.assertEqual(len(undo_game.history), 0)
+
+    def test_undo_matches_snapshot_with_given_cards(self):
+        undo_game = make_game('undo')
+        snapshot_game = make_game('snapshot')
+        for game in (undo_game, snapshot_game):
+            game.init_game(1, 0, Card('S', 'A'), Card('H', 'K'), Card('D', 'K'), Card('C', 'T'))
+        self._walk_tree(undo_game, snapshot_game)
+
+    def test_payoffs(self):
+        game = make_game('undo')
+        for _ in range(5):
+            game.init_game()
+            while not game.is_over():
+                game.step(game.np_random.choice(game.get_legal_actions()))
+            self.assertEqual(sum(game.get_payoffs()), 0)
+
+    def test_int_card_encoding(self):
+        str_game = make_game('undo')
+        int_game = make_game('undo')
+        int_game.card_encoding = 'int'
+        given_cards = (1, 0, Card('S', 'A'), Card('H', 'K'), Card('D', 'K'), Card('C', 'T'))
+        for i in range(20):
+            args = given_cards if i == 0 else ()
+            states = [str_game.init_game(*args)[0], int_game.init_game(*args)[0]]
+            while True:
+                self.assertEqual(states[0]['hand'], card_strings(states[1]['hand']))
+                self.assertEqual(states[0]['public_cards'], card_strings(states[1]['public_cards']))
+                if str_game.is_over():
+                    break
+                action = str_game.np_random.choice(str_game.get_legal_actions())
+                int_game.np_random.choice(int_game.get_legal_actions())
+                states = [str_game.step(action)[0], int_game.step(action)[0]]
+            self.assertEqual(list(str_game.get_payoffs()), list(int_game.get_payoffs()))
+
+    def test_card_ids(self):
+        card_ids = [card_to_id(Card(suit, rank)) for suit in 'SHDC' for rank in 'A23456789TJQK']
+        self.assertEqual(card_ids, list(range(52)))
+        self.assertEqual(id_to_card(51).get_index(), 'CK')
+
+    def test_showdown_table(self):
+        table = showdown.get_showdown_table()
+        self.assertEqual(table.shape, (20, 20, 20))
+        self.assertTrue((showdown.build_showdown_table() == table).all())
+        cards = showdown.DECK_STRINGS
+        for public_cards in combinations(cards, 2):
+            rest = [card for card in cards if card not in public_cards]
+            for hand_1, hand_2 in combinations(rest, 2):
+                hands = [[hand_1] + list(public_cards), [hand_2] + list(public_cards)]
+                self.assertEqual(showdown.compare_hands(hands), compare_hands(deepcopy(hands)))
+
+    def test_hand_evaluators_agree(self):
+        games = []
+        for hand_evaluator in ['hand', 'table']:
+            game = make_game('undo')
+            game.hand_evaluator = hand_evaluator
+            games.append(game)
+        for _ in range(50):
+            for game in games:
+                game.init_game()
+            while not games[0].is_over():
+                action = 'call' if 'call' in games[0].get_legal_actions() else 'check'
+                for game in games:
+                    game.step(action)
+            self.assertEqual(list(games[0].get_payoffs()), list(games[1].get_payoffs()))
+
+    def test_batch_game_matches_round(self):
+        batch_size = 200
+        batch = BatchNewLimitHoldemGame(batch_size)
+        batch.np_random = np.random.RandomState(0)
+        batch.init_game()
+        env = rlcard.make('new-limit-holdem')
+        games = []
+        for i in range(batch_size):
+            game = Game()
+            hands = [id_to_card(card) for card in batch.hands[i]]
+            board = [id_to_card(card) for card in batch.board[i]]
+            game.init_game(batch.game_pointer[i], 0, hands[0], board[0], board[1], hands[1])
+            games.append(game)
+
+        np_random = np.random.RandomState(1)
+        while not batch.is_over().all():
+            legal = batch.get_legal_actions()
+            obs = batch.get_obs()
+            actions = (np_random.rand(batch_size, len(ACTIONS)) * legal).argmax(axis=1)
+            for i, game in enumerate(games):
+                self.assertEqual(batch.is_over()[i], game.is_over())
+                if game.is_over():
+                    continue
+                legal_actions = game.get_legal_actions()
+                self.assertEqual([a for a, ok in zip(ACTIONS, legal[i]) if ok], legal_actions)
+                self.assertEqual(batch.game_pointer[i], game.get_player_id())
+                self.assertEqual(list(batch.in_chips[i]), [p.in_chips for p in game.players])
+                state = env._extract_state(game.get_state(game.get_player_id()))
+                self.assertTrue(np.array_equal(obs[i], state['obs']))
+                game.step(ACTIONS[actions[i]])
+            batch.step(actions)
+
+        payoffs = batch.get_payoffs()
+        for i, game in enumerate(games):
+            self.assertTrue(game.is_over())
+            self.assertEqual(list(payoffs[i]), list(game.get_payoffs()))
+
+    def test_batch_game_partial_deal(self):
+        batch_size = 500
+        batch = BatchNewLimitHoldemGame(batch_size)
+        batch.np_random = np.random.RandomState(0)
+        hands = DECK_IDS[np.random.RandomState(1).rand(batch_size, len(DECK_IDS)).argsort(axis=1)[:, :2]]
+        batch.init_game(hands=hands)
+        self.assertTrue(np.array_equal(batch.hands, hands))
+        public_cards = batch.board.copy()
+        batch.init_game(public_cards=public_cards)
+        self.assertTrue(np.array_equal(batch.board, public_cards))
+        for cards in ([hands, public_cards], [batch.hands, batch.board]):
+            dealt = np.concatenate(cards, axis=1)
+            self.assertTrue(all(len(set(row)) == 4 for row in dealt))
+            self.assertTrue(np.isin(dealt, DECK_IDS).all())
+
+    def _walk_tree(self, undo_game, snapshot_game):
+        self.assertEqual(snapshot(undo_game), snapshot(snapshot_game))
+        if undo_game.is_over():
+            self.assertEqual(list(undo_game.get_payoffs()), list(snapshot_game.get_payoffs()))
+            return
+        before = snapshot(undo_game)
+        for action in undo_game.get_legal_actions():
+            undo_game.step(action)
+            snapshot_game.step(action)
+            self._walk_tree(undo_game, snapshot_game)
+            undo_game.step_back()
+            snapshot_game.step_back()
+            self.assertEqual(snapshot(undo_game), before)
+            self.assertEqual(snapshot(snapshot_game), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from copy import deepcopy
 
 from rlcard.games.limitholdem.player import PlayerStatus
 from rlcard.games.nolimitholdem.game import NolimitholdemGame as Game, Stage
@@ -205,5 +206,40 @@ class TestNolimitholdemMethods(unittest.TestCase):
         self.assertTrue(game.is_over())
 
 
+    def test_undo_matches_snapshot(self):
+        for seed in range(3):
+            games = []
+            for mode in ['undo', 'snapshot']:
+                game = Game(allow_step_back=True)
+                game.step_back_mode = mode
+                game.np_random = np.random.RandomState(seed)
+                game.init_game()
+                games.append(game)
+            self._walk_tree(games, 4)
+            self.assertEqual(len(games[0].history), 0)
+
+    def _walk_tree(self, games, depth):
+        snapshots = [self._snapshot(game) for game in games]
+        self.assertEqual(snapshots[0], snapshots[1])
+        if games[0].is_over():
+            self.assertEqual(list(games[0].get_payoffs()), list(games[1].get_payoffs()))
+            return
+        if depth == 0:
+            return
+        for action in games[0].get_legal_actions():
+            for game in games:
+                game.step(action)
+            self._walk_tree(games, depth - 1)
+            for game in games:
+                game.step_back()
+                self.assertEqual(self._snapshot(game), snapshots[0])
+
+    @staticmethod
+    def _snapshot(game):
+        states = deepcopy([game.get_state(i) for i in range(game.get_num_players())])
+        deck = [card.get_index() for card in game.dealer.deck]
+        return states, deck, game.get_player_id(), game.round_counter, game.round.dealer.pot, game.is_over()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,8 @@ import unittest
 from rlcard.games.limitholdem.judger import LimitHoldemJudger
 from rlcard.games.limitholdem.utils import compare_hands
 from rlcard.games.limitholdem.utils import Hand as Hand
+from rlcard.games.limitholdem import evaluator
+from rlcard.games.limitholdem.cards import CARD_STRINGS, card_to_id
 import numpy as np
 ''' Combinations selected for testing compare_hands function
 Royal straight flush ['CJ', 'CT', 'CQ', 'CK', 'C9', 'C8', 'CA']
@@ -354,5 +356,41 @@ class TestHoldemUtils(unittest.TestCase):
         self.assertEqual(nb_cases, 34954)  # to check that correct number of cases have been tested
 
 
+    def test_table_backend_matches_hand(self):
+        randstate = np.random.RandomState(0)
+        for _ in range(2000):
+            nb_players = randstate.randint(2, 5)
+            cards = [CARD_STRINGS[c] for c in randstate.permutation(52)[:5 + 2 * nb_players]]
+            hands = [cards[5 + 2 * i:7 + 2 * i] + cards[:5] for i in range(nb_players)]
+            if randstate.rand() < 0.2:
+                hands[0] = None
+            expected = compare_hands([list(hand) if hand else None for hand in hands])
+            self.assertEqual(compare_hands(hands, backend='table'), expected)
+            card_ids = [[card_to_id(card) for card in hand] if hand else None for hand in hands]
+            self.assertEqual(compare_hands(card_ids, backend='table'), expected)
+
+    def test_evaluate_hands(self):
+        randstate = np.random.RandomState(1)
+        for num_cards in (5, 6, 7):
+            hands = np.array([randstate.permutation(52)[:num_cards] for _ in range(2000)])
+            expected = [evaluator.evaluate_hand(list(hand)) for hand in hands]
+            self.assertEqual(list(evaluator.evaluate_hands(hands)), expected)
+
+    def test_evaluate_hand(self):
+        def strength(cards):
+            return evaluator.evaluate_hand([card_to_id(card) for card in cards])
+        wheel = strength(['SA', 'H2', 'D3', 'C4', 'S5', 'HK', 'DK'])
+        six_high = strength(['S6', 'H2', 'D3', 'C4', 'S5', 'HK', 'DK'])
+        self.assertEqual(evaluator.get_category(wheel), evaluator.STRAIGHT)
+        self.assertLess(wheel, six_high)
+        flush = strength(['H9', 'H2', 'H5', 'HJ', 'HK', 'S9', 'D9'])
+        self.assertEqual(evaluator.get_category(flush), evaluator.FLUSH)
+        quads = strength(['H9', 'C9', 'S9', 'D9', 'HK', 'S2', 'D2'])
+        self.assertEqual(evaluator.get_category(quads), evaluator.FOUR_OF_A_KIND)
+        self.assertEqual(evaluator.get_category(strength(['HA', 'HK', 'HQ', 'HJ', 'HT'])), evaluator.STRAIGHT_FLUSH)
+        self.assertEqual(strength(['SA', 'SK', 'D7', 'H5', 'C2', 'C3', 'S8']),
+                         strength(['HA', 'HK', 'C7', 'D5', 'S2', 'S4', 'D8']))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.ql_agent import QLAgent
+from rlcard.agents.threshold_agent import ThresholdAgent
+from rlcard.utils.policy_file import save_policy, load_policy, is_policy_file, PolicyFile
+
+class TestPolicyFile(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_save_and_load(self):
+        np_random = np.random.RandomState(0)
+        policy = {np_random.rand(8).tostring(): np_random.dirichlet(np.ones(4)) for _ in range(100)}
+        # Keys that end with zero bytes, and tuple keys like the ones of PIAgent
+        policy[np.zeros(8).tostring()] = np.array([1., 0., 0., 0.])
+        policy[(np.ones(8).tostring(), 0.2, 'A')] = np.array([0., 0.5, 0.5, -np.inf])
+
+        path = os.path.join(self.path, 'policy')
+        save_policy(path, policy)
+        self.assertTrue(is_policy_file(path))
+        self.assertFalse(is_policy_file(self.path))
+
+        lazy = load_policy(path)
+        self.assertIsInstance(lazy, PolicyFile)
+        self.assertEqual(len(lazy), len(policy))
+        self.assertEqual(set(lazy), set(policy))
+        for key, probs in policy.items():
+            self.assertIn(key, lazy)
+            np.testing.assert_allclose(lazy[key], probs, rtol=1e-6)
+        self.assertNotIn(np.ones(8).tostring(), lazy)
+        with self.assertRaises(KeyError):
+            lazy[b'unknown']
+
+        # Assigned keys stay in memory on top of the file
+        lazy[b'new'] = np.ones(4)
+        lazy[np.zeros(8).tostring()] = np.ones(4)
+        self.assertEqual(len(lazy), len(policy) + 1)
+        np.testing.assert_array_equal(lazy[np.zeros(8).tostring()], np.ones(4))
+        np.testing.assert_array_equal(load_policy(path)[np.zeros(8).tostring()], [1., 0., 0., 0.])
+
+        loaded = load_policy(path, lazy=False)
+        self.assertEqual(loaded.keys(), policy.keys())
+
+        save_policy(os.path.join(self.path, 'empty'), {})
+        self.assertEqual(len(load_policy(os.path.join(self.path, 'empty'))), 0)
+
+    def test_agent_save_and_load(self):
+        env = rlcard.make('new-limit-holdem', config={'seed': 0, 'allow_step_back': True})
+        agent = QLAgent(env, model_path=os.path.join(self.path, 'ql_model'))
+        env.set_agents([ThresholdAgent(num_actions=env.num_actions), agent])
+        for _ in range(50):
+            agent.train()
+        agent.save()
+
+        self.assertTrue(os.path.exists(os.path.join(agent.model_path, 'qualities.npz')))
+        loaded = QLAgent(env, model_path=agent.model_path)
+        loaded.load()
+        self.assertEqual(loaded.iteration, agent.iteration)
+        self.assertEqual(loaded.table['qualities'].dtype, np.float32)
+        self.assertEqual(set(loaded.qualities.keys()), set(agent.qualities.keys()))
+        for key, qualities in agent.qualities.items():
+            np.testing.assert_array_equal(loaded.qualities[key], qualities)
+        loaded.train()
+
+        # Models saved before the Q-table still load from their policy files
+        os.remove(os.path.join(agent.model_path, 'qualities.npz'))
+        save_policy(os.path.join(agent.model_path, 'qualities'), agent.qualities, dtype=np.float64)
+        loaded = QLAgent(env, model_path=agent.model_path)
+        loaded.load()
+        for key, qualities in agent.qualities.items():
+            np.testing.assert_array_equal(loaded.qualities[key], qualities)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament
+from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament, parallel_tournament, duplicate_tournament, sequential_tournament, marginalize_policy
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
 
@@ -43,5 +43,79 @@ class TestUtils(unittest.TestCase):
         payoffs = tournament(env,1000)
         self.assertEqual(len(payoffs), 2)
 
+    def test_parallel_tournament(self):
+        env = rlcard.make('leduc-holdem')
+        env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        payoffs, winrate, intervals = parallel_tournament(env, 200, num_workers=2, seed=3)
+        self.assertEqual(len(payoffs), 2)
+        self.assertEqual(len(winrate), 2)
+        for i in range(2):
+            low, high = intervals['payoffs'][i]
+            self.assertLessEqual(low, payoffs[i])
+            self.assertGreaterEqual(high, payoffs[i])
+            low, high = intervals['winrate'][i]
+            self.assertLessEqual(low, winrate[i])
+            self.assertGreaterEqual(high, winrate[i])
+        self.assertEqual(parallel_tournament(env, 200, num_workers=2, seed=3)[0], payoffs)
+
+    def test_duplicate_tournament(self):
+        class FirstActionAgent(object):
+            use_raw = False
+
+            def eval_step(self, state):
+                return list(state['legal_actions'].keys())[0], {}
+
+        # The same deterministic policy in both seats wins exactly what it loses
+        env = rlcard.make('new-limit-holdem', config={'seed': 5})
+        env.set_agents([FirstActionAgent(), FirstActionAgent()])
+        payoffs, winrate, intervals = duplicate_tournament(env, 50)
+        self.assertEqual(payoffs, [0, 0])
+
+        env = rlcard.make('leduc-holdem', config={'seed': 5})
+        agents = [RandomAgent(env.num_actions), FirstActionAgent()]
+        env.set_agents(agents)
+        payoffs, winrate, intervals = duplicate_tournament(env, 50)
+        self.assertEqual(env.agents, agents)
+        self.assertAlmostEqual(payoffs[0], -payoffs[1])
+        self.assertEqual(len(intervals['payoffs']), 2)
+        payoffs, _, _ = parallel_tournament(env, 40, num_workers=2, seed=1, duplicate=True)
+        self.assertAlmostEqual(payoffs[0], -payoffs[1])
+
+    def test_sequential_tournament(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 2})
+        env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        result = sequential_tournament(env, 5000, target_width=1.0, min_games=50)
+        self.assertEqual(result['stopped'], 'width')
+        self.assertLess(result['games'], 5000)
+        low, high = result['payoff_interval']
+        self.assertLessEqual(high - low, 1.0)
+        low, high = result['winrate_interval']
+        self.assertTrue(low <= result['winrate'] <= high)
+
+        result = sequential_tournament(env, 100, significance=1e-9, min_games=10, duplicate=True)
+        self.assertEqual(result['stopped'], 'max_games')
+        self.assertEqual(result['games'], 100)
+        with self.assertRaises(ValueError):
+            sequential_tournament(env, 100)
+
+    def test_marginalize_policy(self):
+        np_random = np.random.RandomState(0)
+        policy = {}
+        for obs in range(6):
+            for rank in range(np_random.randint(1, 5)):
+                policy[(str(obs), np_random.rand(), rank)] = np_random.dirichlet(np.ones(4))
+        policy['legacy'] = np.ones(4) / 4
+
+        marginal = marginalize_policy(policy, weight=lambda key: key[1])
+        self.assertEqual(list(marginal), [str(obs) for obs in range(6)])
+        for obs, probs in marginal.items():
+            keys = [key for key in policy if isinstance(key, tuple) and key[0] == obs]
+            expected = np.average([policy[key] for key in keys], axis=0, weights=[key[1] for key in keys])
+            np.testing.assert_allclose(probs, expected)
+
+        marginal = marginalize_policy(policy, group=lambda key: 'all')
+        np.testing.assert_allclose(marginal['all'], np.mean(list(policy.values()), axis=0))
+        self.assertEqual(marginalize_policy({}), {})
+
 if __name__ == '__main__':
     unittest.main()